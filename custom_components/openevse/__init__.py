@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-import contextlib
 import functools
 import inspect
 import logging
+import random
 import time
-from datetime import timedelta
+from collections import Counter, deque
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -19,59 +22,85 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
     EVENT_HOMEASSISTANT_STARTED,
-    UnitOfPower,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     CoreState,
     Event,
-    EventStateChangedData,
     HomeAssistant,
     callback,
 )
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+)
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util.unit_conversion import PowerConverter
+from homeassistant.util import dt as dt_util
 from openevsehttp.__main__ import OpenEVSE
 from openevsehttp.exceptions import (
     AuthenticationError,
     MissingSerial,
     UnsupportedFeature,
 )
+from openevsehttp.websocket import STATE_CONNECTED
 
+from .allocator import SiteMember, async_join_site
 from .const import (
     BINARY_SENSORS,
     CONF_GRID,
-    CONF_HOME_BATTERY_POWER,
-    CONF_HOME_BATTERY_SOC,
     CONF_INVERT,
+    CONF_MAX_PUSH_INTERVAL,
     CONF_NAME,
-    CONF_SHAPER,
-    CONF_SOLAR,
-    CONF_VEHICLE_ETA,
-    CONF_VEHICLE_RANGE,
-    CONF_VEHICLE_SOC,
-    CONF_VOLTAGE,
+    CONF_SITE_ALLOCATION,
+    CONF_SITE_MAX_IMPORT,
+    CONF_TELEMETRY_FILE,
+    CONF_TELEMETRY_SAMPLES,
     CONNECTION_ERROR,
     CONNECTION_ERRORS,
     COORDINATOR,
+    COORDINATOR_FIELDS,
+    DEFAULT_MAX_PUSH_INTERVAL,
     DOMAIN,
     FW_COORDINATOR,
+    IDENTITY_FIRMWARE_FIELDS,
     ISSUE_URL,
     LIGHT_TYPES,
     MANAGER,
     NUMBER_TYPES,
     PLATFORMS,
+    POLL_JITTER,
     SELECT_TYPES,
     SENSOR_FIELDS,
     SENSOR_TYPES,
+    SWITCH_TYPES,
+    TELEMETRY_FIELDS,
     UNSUB_LISTENERS,
     VERSION,
+    WS_FRAME_HISTORY,
+    WS_MIN_FRAMES,
+    WS_STALE_FRAMES,
+    WS_STALE_MIN_AGE,
+    WS_WATCHDOG_INTERVAL,
+)
+from .firmware import async_setup_firmware_cache
+from .linked_sensors import (
+    LinkedSensor,
+    async_track_linked_sensors,
+    build_state_handlers,
 )
 from .logger import OpenEVSELoggerAdapter
-from .services import OpenEVSEServices
+from .reconnect import async_get_reconnect_limiter
+from .scheduler import (
+    ScheduledRefresh,
+    async_get_scheduler,
+    async_shutdown_scheduler,
+)
+from .services import OpenEVSEServices, async_invalidate_device_index
+from .snapshot import OpenEVSESnapshotStore, async_remove_snapshot
+from .telemetry import TelemetryBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -88,243 +117,45 @@ divert_mode = {
 }
 
 
-def _parse_power_state(state) -> int | None:
-    """Parse power sensor state and convert to Watts if necessary."""
-    if not state or state.state in [None, "unavailable", "unknown", ""]:
-        return None
-    try:
-        val = float(state.state)
-    except (ValueError, TypeError):
-        return None
-
-    unit = state.attributes.get("unit_of_measurement")
-    if unit and unit != UnitOfPower.WATT:
-        with contextlib.suppress(Exception):
-            val = PowerConverter.convert(val, unit, UnitOfPower.WATT)
-
-    return round(val)
-
-
-@callback
-async def handle_state_change(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    event: Event[EventStateChangedData] | None = None,
-) -> None:
-    """Track state changes to sensor entities."""
-    logger = OpenEVSELoggerAdapter(
-        _LOGGER, {"device_name": config_entry.data.get(CONF_NAME, "OpenEVSE")}
-    )
-    manager = hass.data[DOMAIN][config_entry.entry_id][MANAGER]
-    options = config_entry.options
-    invert = options.get(CONF_INVERT)
-    grid_sensor = options.get(CONF_GRID)
-    solar_sensor = options.get(CONF_SOLAR)
-    voltage_sensor = options.get(CONF_VOLTAGE)
-    shaper_sensor = options.get(CONF_SHAPER)
-    vehicle_soc_sensor = options.get(CONF_VEHICLE_SOC)
-    vehicle_range_sensor = options.get(CONF_VEHICLE_RANGE)
-    vehicle_eta_sensor = options.get(CONF_VEHICLE_ETA)
-    home_battery_soc_sensor = options.get(CONF_HOME_BATTERY_SOC)
-    home_battery_power_sensor = options.get(CONF_HOME_BATTERY_POWER)
-    changed_entity = event.data["entity_id"]
-
-    if grid_sensor is not None and changed_entity == grid_sensor:
-        state = hass.states.get(grid_sensor)
-        grid = _parse_power_state(state)
-        if (
-            state
-            and state.state not in [None, "unavailable", "unknown", ""]
-            and grid is None
-        ):
-            logger.warning("Non-numeric state for grid sensor: %s", state.state)
-
-        logger.debug("Sending sensor data to OpenEVSE: (grid: %s)", grid)
-        try:
-            await manager.self_production(grid=grid, solar=None, invert=invert)
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    elif solar_sensor is not None and changed_entity == solar_sensor:
-        state = hass.states.get(solar_sensor)
-        solar = _parse_power_state(state)
-        if (
-            state
-            and state.state not in [None, "unavailable", "unknown", ""]
-            and solar is None
-        ):
-            logger.warning("Non-numeric state for solar sensor: %s", state.state)
-
-        logger.debug("Sending sensor data to OpenEVSE: (solar: %s)", solar)
-        try:
-            await manager.self_production(grid=None, solar=solar, invert=False)
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if voltage_sensor is not None and changed_entity == voltage_sensor:
-        state = hass.states.get(voltage_sensor)
-        voltage = state.state if state else None
-        if voltage in [None, "unavailable", "unknown"]:
-            voltage = None
-        else:
-            try:
-                voltage = round(float(voltage))
-            except (ValueError, TypeError):
-                logger.warning("Non-numeric state for voltage sensor: %s", voltage)
-                voltage = None
-
-        logger.debug("Sending sensor data to OpenEVSE: (voltage: %s)", voltage)
-        try:
-            await manager.grid_voltage(voltage=voltage)
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if shaper_sensor is not None and changed_entity == shaper_sensor:
-        state = hass.states.get(shaper_sensor)
-        power = _parse_power_state(state)
-        if (
-            state
-            and state.state not in [None, "unavailable", "unknown", ""]
-            and power is None
-        ):
-            logger.warning("Non-numeric state for shaper sensor: %s", state.state)
-
-        logger.debug("Sending sensor data to OpenEVSE: (shaper: %s)", power)
-        try:
-            await manager.set_shaper_live_pwr(power=power)
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if vehicle_soc_sensor is not None and changed_entity == vehicle_soc_sensor:
-        state = hass.states.get(vehicle_soc_sensor)
-        soc = state.state if state else None
-        if soc in [None, "unavailable", "unknown", ""]:
-            soc = None
-        else:
-            try:
-                soc = round(float(soc))
-            except (ValueError, TypeError):
-                logger.warning("Non-numeric state for vehicle SoC sensor: %s", soc)
-                soc = None
-
-        logger.debug("Sending sensor data to OpenEVSE: (vehicle_soc: %s)", soc)
-        try:
-            await manager.soc(battery_level=soc)
-        except UnsupportedFeature:
-            logger.debug("Vehicle SoC push not supported by firmware.")
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if vehicle_range_sensor is not None and changed_entity == vehicle_range_sensor:
-        state = hass.states.get(vehicle_range_sensor)
-        vrange = state.state if state else None
-        if vrange in [None, "unavailable", "unknown", ""]:
-            vrange = None
-        else:
-            try:
-                vrange = round(float(vrange))
-            except (ValueError, TypeError):
-                logger.warning("Non-numeric state for vehicle range sensor: %s", vrange)
-                vrange = None
-
-        logger.debug("Sending sensor data to OpenEVSE: (vehicle_range: %s)", vrange)
-        try:
-            await manager.soc(battery_range=vrange)
-        except UnsupportedFeature:
-            logger.debug("Vehicle range push not supported by firmware.")
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if vehicle_eta_sensor is not None and changed_entity == vehicle_eta_sensor:
-        state = hass.states.get(vehicle_eta_sensor)
-        eta = state.state if state else None
-        if eta in [None, "unavailable", "unknown", ""]:
-            eta = None
-        else:
-            try:
-                eta = round(float(eta))
-            except (ValueError, TypeError):
-                logger.warning("Non-numeric state for vehicle ETA sensor: %s", eta)
-                eta = None
-
-        logger.debug("Sending sensor data to OpenEVSE: (vehicle_eta: %s)", eta)
-        try:
-            await manager.soc(time_to_full=eta)
-        except UnsupportedFeature:
-            logger.debug("Vehicle ETA push not supported by firmware.")
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if (
-        home_battery_soc_sensor is not None
-        and changed_entity == home_battery_soc_sensor
-    ):
-        state = hass.states.get(home_battery_soc_sensor)
-        hb_soc = state.state if state else None
-        if hb_soc in [None, "unavailable", "unknown", ""]:
-            hb_soc = None
-        else:
-            try:
-                hb_soc = round(float(hb_soc))
-            except (ValueError, TypeError):
-                logger.warning(
-                    "Non-numeric state for home battery SoC sensor: %s", hb_soc
-                )
-                hb_soc = None
-
-        logger.debug("Sending sensor data to OpenEVSE: (home_battery_soc: %s)", hb_soc)
-        try:
-            await manager.home_battery(soc=hb_soc)
-        except UnsupportedFeature:
-            logger.debug("Home battery push not supported by firmware.")
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-    if (
-        home_battery_power_sensor is not None
-        and changed_entity == home_battery_power_sensor
-    ):
-        state = hass.states.get(home_battery_power_sensor)
-        hb_power = _parse_power_state(state)
-        if (
-            state
-            and state.state not in [None, "unavailable", "unknown", ""]
-            and hb_power is None
-        ):
-            logger.warning(
-                "Non-numeric state for home battery power sensor: %s", state.state
-            )
-
-        logger.debug(
-            "Sending sensor data to OpenEVSE: (home_battery_power: %s)", hb_power
-        )
-        try:
-            await manager.home_battery(power=hb_power)
-        except UnsupportedFeature:
-            logger.debug("Home battery push not supported by firmware.")
-        except CONNECTION_ERRORS as err:
-            logger.warning(CONNECTION_ERROR, err)
-
-
 async def homeassistant_started_listener(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
-    sensors: list,
+    handlers: Mapping[str, tuple[LinkedSensor, ...]],
     event: Event = None,
 ):
     """Start tracking state changes after HomeAssistant has started."""
-    # Listen to sensor state changes so we can fire an event
-    hass.data[DOMAIN][config_entry.entry_id][UNSUB_LISTENERS].append(
-        async_track_state_change_event(
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    options = config_entry.options
+    entry_data[UNSUB_LISTENERS].extend(
+        async_track_linked_sensors(
             hass,
-            sensors,
-            functools.partial(handle_state_change, hass, config_entry),
+            entry_data[MANAGER],
+            entry_data[COORDINATOR].logger,
+            handlers,
+            options.get(CONF_MAX_PUSH_INTERVAL, DEFAULT_MAX_PUSH_INTERVAL),
         )
     )
+    if options.get(CONF_SITE_ALLOCATION) and options.get(CONF_GRID):
+        entry_data[UNSUB_LISTENERS].append(
+            async_join_site(
+                hass,
+                options[CONF_GRID],
+                SiteMember(
+                    config_entry.entry_id,
+                    entry_data[MANAGER],
+                    entry_data[COORDINATOR],
+                    entry_data[COORDINATOR].logger,
+                    options.get(CONF_SITE_MAX_IMPORT) or 0,
+                    bool(options.get(CONF_INVERT)),
+                ),
+            )
+        )
 
 
 async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Disallow configuration via YAML."""
+    # Services are shared by all chargers and routed per device
+    OpenEVSEServices(hass).async_register()
     return True
 
 
@@ -345,22 +176,88 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     coordinator = OpenEVSEUpdateCoordinator(hass, interval, config_entry, manager)
     fw_coordinator = OpenEVSEFirmwareCheck(hass, 86400, config_entry, manager)
 
+    async_setup_firmware_cache(hass, config_entry)
+
     hass.data[DOMAIN][config_entry.entry_id] = {
         COORDINATOR: coordinator,
         MANAGER: manager,
         FW_COORDINATOR: fw_coordinator,
         UNSUB_LISTENERS: [],
     }
+    async_invalidate_device_index(hass, config_entry.entry_id)
+    async_assign_poll_slots(hass)
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
-    await fw_coordinator.async_refresh()
+    snapshots = coordinator.snapshots = OpenEVSESnapshotStore(
+        hass, config_entry.entry_id, coordinator
+    )
+    if (cached := await snapshots.async_load()) is None:
+        # Fetch initial data so we have data when entities subscribe
+        await coordinator.async_refresh()
+        await fw_coordinator.async_refresh()
 
-    if not coordinator.last_update_success:
-        if isinstance(coordinator.last_exception, ConfigEntryAuthFailed):
-            raise coordinator.last_exception
-        raise ConfigEntryNotReady
+        if not coordinator.last_update_success:
+            if isinstance(coordinator.last_exception, ConfigEntryAuthFailed):
+                raise coordinator.last_exception
+            raise ConfigEntryNotReady
+
+        snapshots.device = await get_device_identity(manager, config_entry, logger)
+    else:
+        # Start from the last known state, the charger may not be online yet
+        logger.debug("Starting from the last known state, refreshing in background")
+        coordinator.async_restore(cached)
+        config_entry.async_create_background_task(
+            hass,
+            async_refresh_restored(hass, config_entry, logger),
+            f"{DOMAIN}_refresh_{config_entry.entry_id}",
+        )
+
+    if samples := int(config_entry.options.get(CONF_TELEMETRY_SAMPLES) or 0):
+        path = None
+        if config_entry.options.get(CONF_TELEMETRY_FILE):
+            path = Path(
+                hass.config.path(
+                    STORAGE_DIR, f"{DOMAIN}_telemetry", f"{config_entry.entry_id}.bin"
+                )
+            )
+        coordinator.telemetry = await hass.async_add_executor_job(
+            TelemetryBuffer, samples, TELEMETRY_FIELDS, path
+        )
+
+    async_register_device(hass, config_entry, manager, snapshots.device)
+
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    coordinator.async_start_fetch_plan()
+
+    options = config_entry.options
+    handlers = build_state_handlers(options)
+    if options.get(CONF_SITE_ALLOCATION) and not options.get(CONF_GRID):
+        logger.warning("Site allocation requires a grid sensor")
+    if handlers or options.get(CONF_SITE_ALLOCATION):
+        if hass.state == CoreState.running:
+            await homeassistant_started_listener(hass, config_entry, handlers)
+        else:
+            hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED,
+                functools.partial(
+                    homeassistant_started_listener, hass, config_entry, handlers
+                ),
+            )
+
+    config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
+
+    return True
 
+
+async def get_device_identity(
+    manager: OpenEVSE,
+    config_entry: ConfigEntry,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+) -> dict[str, str]:
+    """Get the model, firmware version and serial number of a charger.
+
+    The firmware versions it was read with are kept, so it is only read
+    again once the charger reports another firmware.
+    """
     model_info, sw_version = await get_firmware(manager, logger)
 
     try:
@@ -370,65 +267,72 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         logger.info("Unable to find serial number.")
         serial = config_entry.entry_id
 
+    return {
+        "model": model_info,
+        "sw_version": sw_version,
+        "serial": serial,
+        **{key: getattr(manager, key, None) for key in IDENTITY_FIRMWARE_FIELDS},
+    }
+
+
+@callback
+def async_assign_poll_slots(hass: HomeAssistant) -> int:
+    """Give every loaded charger its poll slot, returning how many are loaded.
+
+    Only done when a charger is set up or unloaded, not on every poll.
+    """
+    coordinators = [
+        (entry_id, entry_data[COORDINATOR])
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(entry_data, dict) and COORDINATOR in entry_data
+    ]
+    coordinators.sort(key=lambda item: item[0])
+    for index, (_, coordinator) in enumerate(coordinators):
+        coordinator.poll_slot = (index, len(coordinators))
+    return len(coordinators)
+
+
+@callback
+def async_register_device(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    manager: OpenEVSE,
+    device: Mapping[str, str],
+) -> None:
+    """Create or update the device of a charger."""
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
         config_entry_id=config_entry.entry_id,
         connections={(DOMAIN, config_entry.entry_id)},
-        identifiers={(DOMAIN, serial)},
+        identifiers={(DOMAIN, device.get("serial") or config_entry.entry_id)},
         name=config_entry.data[CONF_NAME],
         manufacturer="OpenEVSE",
-        model=model_info,
-        sw_version=sw_version,
+        model=device.get("model"),
+        sw_version=device.get("sw_version"),
         configuration_url=getattr(manager, "url", None),
     )
 
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
-    # Only register services if supported by firmware
-    if manager.version_check("4.1.0"):
-        services = OpenEVSEServices(hass, config_entry)
-        services.async_register()
-    else:
-        logger.debug(
-            "Skipping service registration: firmware version does not meet "
-            "minimum requirement (4.1.0)"
-        )
+async def async_refresh_restored(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+) -> None:
+    """Refresh a charger set up from its last known state.
 
-    sensors = []
-    options = config_entry.options
-    if options.get(CONF_GRID):
-        sensors.append(options.get(CONF_GRID))
-    if options.get(CONF_SOLAR):
-        sensors.append(options.get(CONF_SOLAR))
-    if options.get(CONF_VOLTAGE):
-        sensors.append(options.get(CONF_VOLTAGE))
-    if options.get(CONF_SHAPER):
-        sensors.append(options.get(CONF_SHAPER))
-    if options.get(CONF_VEHICLE_SOC):
-        sensors.append(options.get(CONF_VEHICLE_SOC))
-    if options.get(CONF_VEHICLE_RANGE):
-        sensors.append(options.get(CONF_VEHICLE_RANGE))
-    if options.get(CONF_VEHICLE_ETA):
-        sensors.append(options.get(CONF_VEHICLE_ETA))
-    if options.get(CONF_HOME_BATTERY_SOC):
-        sensors.append(options.get(CONF_HOME_BATTERY_SOC))
-    if options.get(CONF_HOME_BATTERY_POWER):
-        sensors.append(options.get(CONF_HOME_BATTERY_POWER))
-
-    if len(sensors) > 0:
-        if hass.state == CoreState.running:
-            await homeassistant_started_listener(hass, config_entry, sensors)
-        else:
-            hass.bus.async_listen_once(
-                EVENT_HOMEASSISTANT_STARTED,
-                functools.partial(
-                    homeassistant_started_listener, hass, config_entry, sensors
-                ),
-            )
+    The identity of the charger is only read again if the refreshed data
+    shows another firmware.
+    """
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    await entry_data[COORDINATOR].async_refresh()
+    await entry_data[FW_COORDINATOR].async_refresh()
+    if entry_data[COORDINATOR].stale:
+        logger.debug("Charger is not answering, keeping the last known state")
 
-    config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
 
-    return True
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the stored state of a deleted charger."""
+    await async_remove_snapshot(hass, config_entry.entry_id)
 
 
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
@@ -520,6 +424,11 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         await manager.ws_disconnect()
 
     if unload_ok:
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+        if coordinator.telemetry is not None:
+            await hass.async_add_executor_job(coordinator.telemetry.close)
+            coordinator.telemetry = None
+
         # Unsubscribe to any listeners
         for unsub_listener in hass.data[DOMAIN][config_entry.entry_id].get(
             UNSUB_LISTENERS, []
@@ -528,11 +437,14 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         hass.data[DOMAIN][config_entry.entry_id].get(UNSUB_LISTENERS, []).clear()
         logger.debug("Successfully removed entities from the %s integration", DOMAIN)
         hass.data[DOMAIN].pop(config_entry.entry_id)
+        async_invalidate_device_index(hass, config_entry.entry_id)
+        if not async_assign_poll_slots(hass):
+            async_shutdown_scheduler(hass)
 
     return unload_ok
 
 
-class OpenEVSEFirmwareCheck(DataUpdateCoordinator):
+class OpenEVSEFirmwareCheck(ScheduledRefresh, DataUpdateCoordinator):
     """Class to fetch OpenEVSE firmware update data."""
 
     def __init__(self, hass, interval, config, manager):
@@ -565,7 +477,7 @@ class OpenEVSEFirmwareCheck(DataUpdateCoordinator):
         return self._data
 
 
-class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
+class OpenEVSEUpdateCoordinator(ScheduledRefresh, DataUpdateCoordinator):
     """Class to manage fetching OpenEVSE data."""
 
     def __init__(self, hass, interval, config, manager):
@@ -579,6 +491,28 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
         self._update_lock = asyncio.Lock()
         self._manager.callback = self.websocket_update
         self._last_async_update = 0.0
+        # Percentage of a local firmware file sent to the charger, if uploading
+        self.upload_progress: int | None = None
+        self.telemetry: TelemetryBuffer | None = None
+        self.snapshots: OpenEVSESnapshotStore | None = None
+        # Set while the data is the last known state restored at startup
+        self.stale = False
+        self._identity_check: asyncio.Task | None = None
+        self._session_start: datetime | None = None
+        self._session_elapsed = 0
+        # Data keys read by enabled entities, the others are skipped once
+        # all the platforms are set up
+        self._consumers: Counter[str] = Counter()
+        self._fetch_plan_started = False
+        self._skipped_keys: frozenset[str] = frozenset()
+        # Monotonic times of the first check that found the websocket
+        # connected and of its last frame, and the recent gaps between frames
+        self._ws_connected_at: float | None = None
+        self._last_frame: float | None = None
+        self._frame_gaps: deque[float] = deque(maxlen=WS_FRAME_HISTORY)
+        self._unsub_watchdog: CALLBACK_TYPE | None = None
+        # Index of the poll slot of this charger and number of slots
+        self.poll_slot: tuple[int, int] = (0, 1)
 
         self.logger = OpenEVSELoggerAdapter(
             _LOGGER, {"device_name": config.data.get(CONF_NAME, "OpenEVSE")}
@@ -594,11 +528,152 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
             update_interval=self.interval,
         )
 
+    def _refresh_delay(self) -> float:
+        """Return the seconds until the poll in the slot of this charger."""
+        return self._poll_delay(self.hass.loop.time())
+
+    def _poll_delay(self, now: float) -> float:
+        """Return the seconds until the next poll of this charger.
+
+        The interval is split in one slot per loaded charger, in entry
+        order, so polls are spread evenly and keep their slot across
+        reloads. The poll lands in the slot closest to one interval from
+        now, with some jitter inside the slot.
+        """
+        interval = self.interval.total_seconds()
+        index, count = self.poll_slot
+        slot = interval / count
+        phase = index * slot + random.uniform(0, slot * POLL_JITTER)
+        target = now + interval
+        target += (phase - target + interval / 2) % interval - interval / 2
+        return max(target - now, 1.0)
+
+    @callback
+    def async_restore(self, data: dict[str, Any]) -> None:
+        """Start from the last known state until the charger answers."""
+        self.stale = True
+        self._data = data
+        self.async_set_updated_data(data)
+
+    def version_check(self, min_version: str) -> bool:
+        """Return whether the charger firmware is at least a version.
+
+        Answered from the snapshot until the charger reported its firmware.
+        """
+        if self._manager.wifi_firmware is None:
+            if self.snapshots is None:
+                return False
+            return self.snapshots.capabilities.get(min_version, False)
+        supported = self._manager.version_check(min_version)
+        if self.snapshots is not None:
+            self.snapshots.capabilities[min_version] = supported
+        return supported
+
+    @callback
+    def _async_check_identity(self) -> None:
+        """Read the identity of the charger again if its firmware changed."""
+        device = self.snapshots.device
+        if not device or self._identity_check is not None:
+            return
+        if all(
+            self._data.get(key) in (None, device.get(key))
+            for key in IDENTITY_FIRMWARE_FIELDS
+        ):
+            return
+        self.logger.debug("Firmware changed, reading the charger identity again")
+        async_invalidate_device_index(self.hass, self.config.entry_id)
+        self._identity_check = self.config.async_create_background_task(
+            self.hass,
+            self._async_update_identity(),
+            f"{DOMAIN}_identity_{self.config.entry_id}",
+        )
+
+    async def _async_update_identity(self) -> None:
+        """Store and register the current identity of the charger.
+
+        Values the charger did not report keep their previous value, and so
+        does the whole identity if it could not be read.
+        """
+        try:
+            device = await get_device_identity(self._manager, self.config, self.logger)
+        except CONNECTION_ERRORS as err:
+            self.logger.debug(CONNECTION_ERROR, err)
+            return
+        except (AuthenticationError, ConfigEntryAuthFailed) as err:
+            self.logger.debug("Unable to read the charger identity: %s", err)
+            return
+        except (KeyError, TypeError, ValueError, RuntimeError) as err:
+            self.logger.warning(
+                "Invalid charger identity [%s]: %s", type(err).__name__, err
+            )
+            return
+        finally:
+            self._identity_check = None
+        previous = self.snapshots.device
+        if device.get("serial") == self.config.entry_id:
+            # Fallback used when the charger does not report a serial
+            device["serial"] = previous.get("serial") or device["serial"]
+        device = {
+            **previous,
+            **{key: value for key, value in device.items() if value},
+        }
+        self.snapshots.device = device
+        self.snapshots.async_schedule_save()
+        async_register_device(self.hass, self.config, self._manager, device)
+
+    @callback
+    def async_add_consumer(self, key: str) -> CALLBACK_TYPE:
+        """Mark a data key as read by an entity, returning the release callback."""
+        self._consumers[key] += 1
+        self._async_reset_fetch_plan()
+
+        @callback
+        def _async_release() -> None:
+            self._consumers[key] -= 1
+            if self._consumers[key] <= 0:
+                del self._consumers[key]
+            self._async_reset_fetch_plan()
+
+        return _async_release
+
+    @callback
+    def async_start_fetch_plan(self) -> None:
+        """Skip the data keys no enabled entity reads from now on.
+
+        Entities disabled in the entity registry are never added, so once
+        the platforms are set up the consumers are known. Enabling an entity
+        reloads the entry and disabling one removes it, either way the plan
+        is rebuilt.
+        """
+        self._fetch_plan_started = True
+        self._async_reset_fetch_plan()
+
+    @callback
+    def _async_reset_fetch_plan(self) -> None:
+        """Rebuild the set of entity keys nothing reads."""
+        if not self._fetch_plan_started:
+            return
+        self._skipped_keys = frozenset(
+            description.key
+            for descriptions in (
+                SENSOR_TYPES,
+                BINARY_SENSORS,
+                SELECT_TYPES,
+                NUMBER_TYPES,
+                LIGHT_TYPES,
+                SWITCH_TYPES,
+            )
+            for description in descriptions
+            if description.key not in self._consumers
+            and description.key not in COORDINATOR_FIELDS
+        )
+        self.logger.debug("Skipping unused data keys: %s", sorted(self._skipped_keys))
+
     @property
-    def async_update_cooldown(self) -> float:
-        """Return the cooldown period based on connection type and hardware firmware."""
+    def hardware(self) -> str:
+        """Return how the charger is connected: ethernet, esp32 or esp8266."""
         if getattr(self._manager, "using_ethernet", False):
-            return 2.0
+            return "ethernet"
 
         # Check if ESP32 firmware (v5.x or newer) is running
         fw = getattr(self._manager, "wifi_firmware", "") or ""
@@ -607,13 +682,119 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
             if parts and parts[0].isdigit():
                 major_version = int(parts[0])
                 if major_version >= 5:
-                    return 5.0  # ESP32 on Wi-Fi
+                    return "esp32"
+
+        return "esp8266"  # ESP8266 or fallback on Wi-Fi
+
+    @property
+    def async_update_cooldown(self) -> float:
+        """Return the cooldown period based on connection type and hardware firmware."""
+        return {"ethernet": 2.0, "esp32": 5.0}.get(self.hardware, 15.0)
+
+    @property
+    def ws_frame_age(self) -> float | None:
+        """Return the seconds since the last websocket frame, if connected."""
+        if self._manager.ws_state != STATE_CONNECTED:
+            return None
+        # A new connection gets the same time to send its first frame
+        since = self._last_frame or self._ws_connected_at
+        if since is None:
+            return None
+        return time.monotonic() - since
 
-        return 15.0  # ESP8266 or fallback on Wi-Fi
+    @property
+    def ws_stale_after(self) -> float | None:
+        """Return the seconds of websocket silence considered stale.
+
+        Worked out from the frame rate of the charger itself, so only known
+        once a few frames were seen.
+        """
+        if len(self._frame_gaps) < WS_MIN_FRAMES:
+            return None
+        return max(max(self._frame_gaps) * WS_STALE_FRAMES, WS_STALE_MIN_AGE)
+
+    @property
+    def ws_stale(self) -> bool:
+        """Return whether the websocket is connected but silent for too long."""
+        age = self.ws_frame_age
+        stale_after = self.ws_stale_after
+        return age is not None and stale_after is not None and age > stale_after
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, and websocket check if none is pending."""
+        super()._schedule_refresh()
+        if self._unsub_watchdog is None:
+            self._schedule_watchdog()
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Stop polling and checking the websocket once no entity listens."""
+        self._async_stop_watchdog()
+        super()._unschedule_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and checking the websocket."""
+        self._async_stop_watchdog()
+        async_get_reconnect_limiter(self.hass).async_reset(self.config.entry_id)
+        await super().async_shutdown()
+
+    @callback
+    def _async_stop_watchdog(self) -> None:
+        """Cancel the next websocket check."""
+        if self._unsub_watchdog is not None:
+            self._unsub_watchdog()
+            # Also keeps a check still running from scheduling the next one
+            self._unsub_watchdog = None
+
+    @callback
+    def _schedule_watchdog(self) -> None:
+        """Schedule the next websocket check."""
+        if self._unsub_watchdog is not None:
+            self._unsub_watchdog()
+        self._unsub_watchdog = async_get_scheduler(self.hass).async_schedule(
+            WS_WATCHDOG_INTERVAL,
+            self._async_watchdog,
+            f"{self.name} - websocket watchdog",
+            self.config,
+        )
+
+    async def _async_watchdog(self) -> None:
+        """Reconnect a websocket that stopped sending frames.
+
+        A half-open connection, after a WiFi roam or an access point reboot,
+        still reports as connected. Polls then only read the configuration
+        and the entities would keep showing the last streamed values.
+        """
+        try:
+            if self._manager.ws_state != STATE_CONNECTED:
+                self._ws_connected_at = self._last_frame = None
+                return
+            async_get_reconnect_limiter(self.hass).async_reset(self.config.entry_id)
+            if self._ws_connected_at is None:
+                self._ws_connected_at = time.monotonic()
+            elif self.ws_stale:
+                self.logger.warning(
+                    "No websocket data for %d seconds, reconnecting",
+                    self.ws_frame_age,
+                )
+                self._ws_connected_at = self._last_frame = None
+                await self._manager.ws_disconnect()
+                # Reads the status over HTTP and starts a new websocket
+                await self.async_refresh()
+        finally:
+            if self._unsub_watchdog is not None:
+                self._schedule_watchdog()
 
     async def _async_update_data(self):
         """Return data."""
-        await self.update_sensors()
+        try:
+            await self.update_sensors()
+        except UpdateFailed:
+            if not self.stale:
+                raise
+            # Entities keep the restored state until the charger answers
+            self.logger.debug("Charger is not answering, keeping the restored state")
         return self._data
 
     async def update_sensors(self) -> dict:
@@ -633,22 +814,29 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
             raise UpdateFailed(error) from error
 
         ws_state = self._manager.ws_state
-        if ws_state == "stopped" or (
+        reconnects = async_get_reconnect_limiter(self.hass)
+        if ws_state == STATE_CONNECTED:
+            reconnects.async_reset(self.config.entry_id)
+        elif ws_state == "stopped" or (
             ws_state == "disconnected"
             and not getattr(self._manager, "_ws_listening", False)
         ):
-            self.logger.debug("Connecting to websocket...")
-            try:
-                await self._manager.ws_start()
-            except RuntimeError as err:
-                self.logger.debug("Websocket connection issue: %s", err)
-            except Exception as error:
-                self.logger.warning(
-                    "Error connecting to websocket [%s]: %s",
-                    type(error).__name__,
-                    error,
-                )
-                raise UpdateFailed(error) from error
+            if not reconnects.async_try_acquire(self.config.entry_id):
+                # Retried on a later poll
+                self.logger.debug("Websocket reconnect postponed")
+            else:
+                self.logger.debug("Connecting to websocket...")
+                try:
+                    await self._manager.ws_start()
+                except RuntimeError as err:
+                    self.logger.debug("Websocket connection issue: %s", err)
+                except Exception as error:
+                    self.logger.warning(
+                        "Error connecting to websocket [%s]: %s",
+                        type(error).__name__,
+                        error,
+                    )
+                    raise UpdateFailed(error) from error
 
         try:
             async with self._update_lock:
@@ -666,6 +854,19 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
     async def websocket_update(self):
         """Trigger processing updated websocket data."""
         self.logger.debug("Websocket update!")
+        now = time.monotonic()
+        # Only gaps between two frames tell the frame rate
+        if self._last_frame is not None:
+            self._frame_gaps.append(now - self._last_frame)
+        self._last_frame = now
+        await self.async_process_status()
+
+    async def async_process_status(self):
+        """Process the status last received from the charger.
+
+        Also called after the status was read over HTTP, which says nothing
+        about the websocket.
+        """
         try:
             async with self._update_lock:
                 await self._update_data_snapshot(skip_async=True)
@@ -711,10 +912,40 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
         else:
             # Retain existing async values from the previous snapshot
             for key, value in self._data.items():
-                if key not in new_data:
+                if key not in new_data and key not in self._skipped_keys:
                     new_data[key] = value
 
+        new_data["charging_session_start"] = self._charging_session_start(
+            new_data.get("charge_time_elapsed")
+        )
         self._data = new_data
+        if self.telemetry is not None:
+            self.telemetry.append(time.time(), new_data)
+        if self.stale:
+            # The firmware, and so the service capabilities, are known now
+            async_invalidate_device_index(self.hass, self.config.entry_id)
+        self.stale = False
+        if self.snapshots is not None:
+            self.snapshots.async_schedule_save()
+            self._async_check_identity()
+
+    def _charging_session_start(self, elapsed: Any) -> datetime | None:
+        """Return when the charging session started.
+
+        The start is worked out once from the elapsed time and kept while
+        the charger is paused. It is only worked out again when the elapsed
+        time goes back, meaning a new session started.
+        """
+        if not isinstance(elapsed, int | float) or elapsed <= 0:
+            self._session_start = None
+            self._session_elapsed = 0
+            return None
+        if self._session_start is None or elapsed < self._session_elapsed:
+            self._session_start = (
+                dt_util.utcnow() - timedelta(seconds=elapsed)
+            ).replace(microsecond=0)
+        self._session_elapsed = elapsed
+        return self._session_start
 
     def _normalize_descriptors(self, descriptors) -> list[tuple[str, Any]]:
         """Normalize descriptors to a list of (key, descriptor) tuples."""
@@ -729,6 +960,8 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
         data = {}
         manager_dir = dir(self._manager)
         for key, descriptor in self._normalize_descriptors(descriptors):
+            if key in self._skipped_keys:
+                continue
             if skip_async and getattr(descriptor, "is_async_value", False):
                 continue
             sensor_property = descriptor.key
@@ -764,6 +997,8 @@ class OpenEVSEUpdateCoordinator(DataUpdateCoordinator):
             seen_results = {}
         manager_dir = dir(self._manager)
         for key, descriptor in self._normalize_descriptors(descriptors):
+            if key in self._skipped_keys:
+                continue
             if not getattr(descriptor, "is_async_value", False):
                 continue
             sensor_property = descriptor.key
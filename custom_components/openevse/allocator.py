@@ -0,0 +1,227 @@
+"""Site level current allocation across chargers sharing a grid meter."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from openevsehttp.__main__ import OpenEVSE
+from openevsehttp.const import MAX_AMPS, MIN_AMPS
+from openevsehttp.exceptions import UnsupportedFeature
+
+from .const import (
+    CONNECTION_ERROR,
+    CONNECTION_ERRORS,
+    DEFAULT_SITE_VOLTAGE,
+    DOMAIN,
+    SITE_ALLOCATORS,
+)
+from .linked_sensors import LinkedValue, async_get_linked_sensor_registry
+from .logger import OpenEVSELoggerAdapter
+
+
+@dataclass(frozen=True)
+class SiteCharger:
+    """Snapshot of a charger taking part in the allocation."""
+
+    key: str
+    connected: bool
+    current: float
+    min_amps: int
+    max_amps: int
+
+    @classmethod
+    def from_data(cls, key: str, data: dict[str, Any] | None) -> SiteCharger:
+        """Build the snapshot from the coordinator data."""
+        data = data or {}
+        return cls(
+            key,
+            bool(data.get("vehicle")),
+            # The charger reports its current in milliamps
+            float(data.get("charging_current") or 0) / 1000,
+            int(data.get("min_amps") or MIN_AMPS),
+            int(data.get("max_amps") or MAX_AMPS),
+        )
+
+
+def allocate_current(
+    chargers: Sequence[SiteCharger], available: float
+) -> dict[str, int]:
+    """Split the available current between the connected chargers.
+
+    Chargers that are already charging are served first so a car is not
+    paused for a newcomer. Each charger gets at least its minimum or
+    nothing, and the rest is shared equally up to each maximum.
+    """
+    allocation = dict.fromkeys((charger.key for charger in chargers), 0.0)
+    funded: list[SiteCharger] = []
+    for charger in sorted(
+        (charger for charger in chargers if charger.connected),
+        key=lambda charger: charger.current <= 0,
+    ):
+        if available >= charger.min_amps:
+            allocation[charger.key] = charger.min_amps
+            available -= charger.min_amps
+            funded.append(charger)
+
+    while available > 0:
+        open_chargers = [
+            charger for charger in funded if allocation[charger.key] < charger.max_amps
+        ]
+        if not open_chargers:
+            break
+        share = available / len(open_chargers)
+        for charger in open_chargers:
+            added = min(share, charger.max_amps - allocation[charger.key])
+            allocation[charger.key] += added
+            available -= added
+
+    return {key: int(amps) for key, amps in allocation.items()}
+
+
+class SiteMember:
+    """A charger whose current is set by the site allocator."""
+
+    def __init__(
+        self,
+        key: str,
+        manager: OpenEVSE,
+        coordinator: DataUpdateCoordinator,
+        logger: OpenEVSELoggerAdapter,
+        max_import: float,
+        invert: bool,
+    ) -> None:
+        """Initialize."""
+        self.key = key
+        self.manager = manager
+        self.coordinator = coordinator
+        self.logger = logger
+        self.max_import = max_import
+        self.invert = invert
+        self.claim: int | None = None
+
+    async def async_apply(self, amps: int) -> None:
+        """Claim the allocated current unless it is already applied."""
+        if amps == self.claim:
+            return
+        self.logger.debug("Site allocation: %s A", amps)
+        try:
+            if amps:
+                await self.manager.make_claim(state="active", charge_current=amps)
+            else:
+                await self.manager.make_claim(state="disabled")
+        except UnsupportedFeature:
+            self.logger.warning("Site allocation requires firmware 4.1.0 or newer")
+        except CONNECTION_ERRORS as err:
+            self.logger.warning(CONNECTION_ERROR, err)
+        else:
+            self.claim = amps
+
+    async def async_release(self) -> None:
+        """Release the claim made by the allocator."""
+        if self.claim is None:
+            return
+        self.claim = None
+        try:
+            await self.manager.release_claim()
+        except (UnsupportedFeature, *CONNECTION_ERRORS) as err:
+            self.logger.debug("Unable to release site allocation claim: %s", err)
+
+
+class SiteAllocator:
+    """Share the current of a site between the chargers on its grid meter.
+
+    One pass reads every member's coordinator snapshot, computes all the
+    limits and only sends a claim to the chargers whose limit changed.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.members: dict[str, SiteMember] = {}
+        self._lock = asyncio.Lock()
+        self._unsub = async_get_linked_sensor_registry(hass).async_subscribe(
+            entity_id, True, self.async_allocate
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop following the grid meter."""
+        self._unsub()
+
+    async def async_allocate(self, linked_value: LinkedValue) -> None:
+        """Allocate the site current for a new grid reading."""
+        if linked_value.watts is None or not self.members:
+            return
+        if self._lock.locked():
+            # A pass is still running, it will be followed by the next reading
+            return
+        async with self._lock:
+            members = list(self.members.values())
+            # A charger only known from its last saved state is left alone
+            snapshots = [
+                SiteCharger.from_data(
+                    member.key,
+                    None if member.coordinator.stale else member.coordinator.data,
+                )
+                for member in members
+            ]
+            voltage = next(
+                (
+                    float(member.coordinator.data["charging_voltage"])
+                    for member in members
+                    if (member.coordinator.data or {}).get("charging_voltage")
+                ),
+                DEFAULT_SITE_VOLTAGE,
+            )
+            grid = -linked_value.watts if members[0].invert else linked_value.watts
+            available = (
+                sum(snapshot.current for snapshot in snapshots if snapshot.connected)
+                + min(member.max_import for member in members)
+                - grid / voltage
+            )
+            allocation = allocate_current(snapshots, available)
+
+            for member, snapshot in zip(members, snapshots, strict=True):
+                if not snapshot.connected:
+                    # The claim is released by the charger when unplugged
+                    member.claim = None
+            await asyncio.gather(
+                *(
+                    member.async_apply(allocation[member.key])
+                    for member, snapshot in zip(members, snapshots, strict=True)
+                    if snapshot.connected
+                )
+            )
+
+
+@callback
+def async_join_site(
+    hass: HomeAssistant,
+    entity_id: str,
+    member: SiteMember,
+) -> CALLBACK_TYPE:
+    """Add a charger to the site of a grid meter, returning the leave callback."""
+    allocators: dict[str, SiteAllocator] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        SITE_ALLOCATORS, {}
+    )
+    if (allocator := allocators.get(entity_id)) is None:
+        allocator = allocators[entity_id] = SiteAllocator(hass, entity_id)
+    allocator.members[member.key] = member
+
+    @callback
+    def _async_leave() -> None:
+        allocator.members.pop(member.key, None)
+        hass.async_create_background_task(
+            member.async_release(), "openevse_site_release_claim"
+        )
+        if not allocator.members:
+            allocator.async_shutdown()
+            allocators.pop(entity_id, None)
+
+    return _async_leave
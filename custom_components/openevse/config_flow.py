@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
 import logging
+import re
+import time
 from collections.abc import Mapping
+from functools import partial
+from pathlib import Path
 from typing import Any, Final
 
 import voluptuous as vol
@@ -15,36 +21,67 @@ from homeassistant.const import (
     CONF_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    PERCENTAGE,
+    UnitOfElectricCurrent,
+    UnitOfPower,
+    UnitOfTime,
 )
-from homeassistant.data_entry_flow import AbortFlow, FlowResult
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import AbortFlow, FlowResult, FlowResultType
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
     EntitySelector,
     EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
 )
 from openevsehttp.__main__ import OpenEVSE
 from openevsehttp.exceptions import AuthenticationError
 
 from .const import (
+    BULK_IMPORT_CONCURRENCY,
     CONF_GRID,
+    CONF_GRID_DEADBAND,
+    CONF_GRID_DEADBAND_PERCENT,
     CONF_HOME_BATTERY_POWER,
     CONF_HOME_BATTERY_SOC,
+    CONF_HOSTS,
+    CONF_HOSTS_FILE,
     CONF_INVERT,
+    CONF_LOCAL_FIRMWARE,
+    CONF_MAX_PUSH_INTERVAL,
     CONF_NAME,
     CONF_SERIAL,
     CONF_SHAPER,
+    CONF_SHAPER_DEADBAND,
+    CONF_SHAPER_DEADBAND_PERCENT,
+    CONF_SITE_ALLOCATION,
+    CONF_SITE_MAX_IMPORT,
     CONF_SOLAR,
+    CONF_SOLAR_DEADBAND,
+    CONF_SOLAR_DEADBAND_PERCENT,
+    CONF_TELEMETRY_FILE,
+    CONF_TELEMETRY_SAMPLES,
     CONF_VEHICLE_ETA,
     CONF_VEHICLE_RANGE,
     CONF_VEHICLE_SOC,
     CONF_VOLTAGE,
     DEFAULT_HOST,
+    DEFAULT_MAX_PUSH_INTERVAL,
     DEFAULT_NAME,
     DOMAIN,
+    MAX_TELEMETRY_SAMPLES,
+    PROBE_CACHE,
+    ZEROCONF_PROBE_TTL,
 )
 
 _LOGGER = logging.getLogger(__name__)
+# One label of a host name, letters, digits and inner hyphens
+HOST_LABEL_RE = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$", re.IGNORECASE)
 
 
 @config_entries.HANDLERS.register(DOMAIN)
@@ -88,10 +125,8 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Make connection with device
         # This is to test the connection and to get info for unique_id
-        charger = OpenEVSE(ip_address, session=async_get_clientsession(self.hass))
-
         try:
-            await charger.update()
+            return await async_probe_charger(self.hass, ip_address)
 
         except Exception as ex:
             _LOGGER.exception(
@@ -100,8 +135,6 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             )
             raise AbortFlow("unknown_error") from ex
 
-        await charger.ws_disconnect()
-
     async def async_step_zeroconf(
         self, discovery_info: zeroconf.ZeroconfServiceInfo
     ) -> FlowResult:
@@ -129,9 +162,7 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         self.context.update({"title_placeholders": {"name": name}})
 
-        # Test connection to device
-        await self._async_try_connect_and_fetch(host)
-
+        # Chargers re-announce often, only probe ones that are not configured
         unique_id = f"{name}_{serial}"
 
         await self.async_set_unique_id(unique_id)
@@ -142,12 +173,21 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+        # Test connection to device
+        await self._async_try_connect_and_fetch(host)
+
         return await self.async_step_discovery_confirm()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "bulk"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a single charger."""
         self._errors = {}
 
         if user_input is not None:
@@ -183,11 +223,132 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     async def _show_config_form(self, user_input):
         """Show the configuration form."""
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=_get_schema(user_input, self.DEFAULTS),
             errors=self._errors,
         )
 
+    async def async_step_bulk(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a list of chargers at once."""
+        self._errors = {}
+        report = ""
+        placeholders: dict[str, str] = {}
+
+        if user_input is not None:
+            hosts, invalid = _parse_hosts(user_input.get(CONF_HOSTS, ""))
+            if hosts_file := user_input.get(CONF_HOSTS_FILE):
+                try:
+                    contents = await self.hass.async_add_executor_job(
+                        _read_hosts_file, self.hass.config.config_dir, hosts_file
+                    )
+                except (OSError, ValueError) as ex:
+                    _LOGGER.error("Unable to read %s: %s", hosts_file, ex)
+                    self._errors[CONF_HOSTS_FILE] = "invalid_hosts_file"
+                else:
+                    file_hosts, file_invalid = _parse_hosts(contents)
+                    hosts.update(
+                        (host, name)
+                        for host, name in file_hosts.items()
+                        if host not in hosts
+                    )
+                    invalid.extend(file_invalid)
+
+            if not self._errors and invalid:
+                # Nothing is imported until every entry is a host or address
+                self._errors[CONF_HOSTS] = "invalid_hosts"
+                placeholders["invalid"] = ", ".join(invalid)
+            if not self._errors and not hosts:
+                self._errors[CONF_HOSTS] = "no_hosts"
+
+            if not self._errors:
+                created, failures = await self._async_bulk_import(hosts, user_input)
+                report = "\n".join(
+                    f"- {host}: {reason}" for host, reason in failures.items()
+                )
+                if created:
+                    return self.async_abort(
+                        reason="bulk_import_complete",
+                        description_placeholders={
+                            "created": str(created),
+                            "failed": report or "-",
+                        },
+                    )
+                self._errors["base"] = "bulk_no_chargers"
+
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=_get_bulk_schema(user_input),
+            errors=self._errors,
+            description_placeholders={"failed": report or "-", **placeholders},
+        )
+
+    async def _async_bulk_import(
+        self, hosts: dict[str, str], user_input: dict[str, Any]
+    ) -> tuple[int, dict[str, str]]:
+        """Validate chargers concurrently and create entries for the good ones.
+
+        Returns the number of entries created and the failure reason per host.
+        """
+        configured = {
+            entry.data.get(CONF_HOST) for entry in self._async_current_entries()
+        }
+        failures = {host: "already configured" for host in hosts if host in configured}
+        semaphore = asyncio.Semaphore(BULK_IMPORT_CONCURRENCY)
+
+        async def _validate(host: str) -> None:
+            async with semaphore:
+                charger = OpenEVSE(
+                    host,
+                    user=user_input.get(CONF_USERNAME, ""),
+                    pwd=user_input.get(CONF_PASSWORD, ""),
+                    ssl=user_input.get(CONF_SSL, False),
+                    ssl_verify=user_input.get(CONF_VERIFY_SSL, True),
+                    session=async_get_clientsession(self.hass),
+                )
+                try:
+                    await charger.update()
+                    await charger.ws_disconnect()
+                except AuthenticationError:
+                    failures[host] = "invalid credentials"
+                except Exception as ex:
+                    _LOGGER.error("[%s] Error connecting with OpenEVSE: %s", host, ex)
+                    failures[host] = "unable to connect"
+
+        await asyncio.gather(
+            *(_validate(host) for host in hosts if host not in failures)
+        )
+
+        valid = [host for host in hosts if host not in failures]
+        flows = [
+            self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_IMPORT},
+                data={
+                    CONF_NAME: hosts[host],
+                    CONF_HOST: host,
+                    CONF_USERNAME: user_input.get(CONF_USERNAME, ""),
+                    CONF_PASSWORD: user_input.get(CONF_PASSWORD, ""),
+                    CONF_SSL: user_input.get(CONF_SSL, False),
+                    CONF_VERIFY_SSL: user_input.get(CONF_VERIFY_SSL, True),
+                },
+            )
+            for host in valid
+        ]
+        created = 0
+        for host, result in zip(valid, await asyncio.gather(*flows), strict=True):
+            if result["type"] == FlowResultType.CREATE_ENTRY:
+                created += 1
+            else:
+                failures[host] = result.get("reason", "not created").replace("_", " ")
+        return created, failures
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a charger validated by the bulk step."""
+        self._async_abort_entries_match({CONF_HOST: import_data[CONF_HOST]})
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
+
     async def async_step_reconfigure(self, user_input: dict[str, Any] | None = None):
         """Add reconfigure step to allow to reconfigure a config entry."""
         self._entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
@@ -321,6 +482,18 @@ class OptionalEntitySelector(EntitySelector):
         return super().__call__(v)
 
 
+def _deadband_selector(unit: str) -> NumberSelector:
+    """Return a selector for a deadband option."""
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            max=100 if unit == PERCENTAGE else 10000,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement=unit,
+        )
+    )
+
+
 class OpenEVSEOptionsFlowHandler(config_entries.OptionsFlow):
     """Handle OpenEVSE options."""
 
@@ -366,6 +539,50 @@ class OpenEVSEOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_HOME_BATTERY_POWER, default=""
                 ): OptionalEntitySelector(EntitySelectorConfig(domain="sensor")),
                 vol.Optional(CONF_INVERT, default=False): bool,
+                vol.Optional(CONF_LOCAL_FIRMWARE, default=False): bool,
+                vol.Optional(CONF_GRID_DEADBAND, default=0): _deadband_selector(
+                    UnitOfPower.WATT
+                ),
+                vol.Optional(CONF_GRID_DEADBAND_PERCENT, default=0): _deadband_selector(
+                    PERCENTAGE
+                ),
+                vol.Optional(CONF_SOLAR_DEADBAND, default=0): _deadband_selector(
+                    UnitOfPower.WATT
+                ),
+                vol.Optional(
+                    CONF_SOLAR_DEADBAND_PERCENT, default=0
+                ): _deadband_selector(PERCENTAGE),
+                vol.Optional(CONF_SHAPER_DEADBAND, default=0): _deadband_selector(
+                    UnitOfPower.WATT
+                ),
+                vol.Optional(
+                    CONF_SHAPER_DEADBAND_PERCENT, default=0
+                ): _deadband_selector(PERCENTAGE),
+                vol.Optional(
+                    CONF_MAX_PUSH_INTERVAL, default=DEFAULT_MAX_PUSH_INTERVAL
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=1,
+                        max=3600,
+                        mode=NumberSelectorMode.BOX,
+                        unit_of_measurement=UnitOfTime.SECONDS,
+                    )
+                ),
+                vol.Optional(CONF_TELEMETRY_SAMPLES, default=0): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0, max=MAX_TELEMETRY_SAMPLES, mode=NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Optional(CONF_TELEMETRY_FILE, default=False): bool,
+                vol.Optional(CONF_SITE_ALLOCATION, default=False): bool,
+                vol.Optional(CONF_SITE_MAX_IMPORT, default=0): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0,
+                        max=400,
+                        mode=NumberSelectorMode.BOX,
+                        unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+                    )
+                ),
             }
         )
 
@@ -375,6 +592,127 @@ class OpenEVSEOptionsFlowHandler(config_entries.OptionsFlow):
         )
 
 
+async def _async_fetch_identity(hass: HomeAssistant, host: str) -> dict[str, Any]:
+    """Fetch only the serial and firmware version of a charger."""
+    charger = OpenEVSE(host, session=async_get_clientsession(hass))
+    response = await charger.process_request(f"{charger.url}config", method="get")
+    if not isinstance(response, Mapping):
+        raise ValueError(f"Invalid response from config: {response}")
+    return {
+        "serial": response.get("wifi_serial"),
+        "firmware": response.get("version"),
+    }
+
+
+@callback
+def _async_discard_failed_probe(
+    cache: dict[str, tuple[float, asyncio.Task]], host: str, task: asyncio.Task
+) -> None:
+    """Drop a failed probe so the next announcement retries it."""
+    if not task.cancelled() and task.exception() is None:
+        return
+    if host in cache and cache[host][1] is task:
+        cache.pop(host)
+
+
+async def async_probe_charger(hass: HomeAssistant, host: str) -> dict[str, Any]:
+    """Return a charger's identity, sharing recent and in-flight probes per host."""
+    cache: dict[str, tuple[float, asyncio.Task]] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(PROBE_CACHE, {})
+    now = time.monotonic()
+    for cached_host, (expires, task) in list(cache.items()):
+        if task.done() and expires <= now:
+            cache.pop(cached_host)
+
+    if host not in cache:
+        _LOGGER.debug("[%s] Probing charger", host)
+        task = hass.async_create_background_task(
+            _async_fetch_identity(hass, host), f"openevse_probe_{host}"
+        )
+        task.add_done_callback(partial(_async_discard_failed_probe, cache, host))
+        cache[host] = (now + ZEROCONF_PROBE_TTL, task)
+    else:
+        _LOGGER.debug("[%s] Reusing recent probe", host)
+
+    return await asyncio.shield(cache[host][1])
+
+
+def _is_valid_host(host: str) -> bool:
+    """Return True if the host is an IP address or host name, with any port."""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        pass
+    else:
+        return True
+    host, _, port = host.partition(":")
+    if port and not (port.isdigit() and 0 < int(port) < 65536):
+        return False
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return len(host) <= 253 and all(
+            HOST_LABEL_RE.match(label) for label in host.split(".")
+        )
+    return True
+
+
+def _parse_hosts(text: str) -> tuple[dict[str, str], list[str]]:
+    """Parse one charger per line as ``host`` or ``host name``.
+
+    Returns the name to use per host, keeping the first occurrence, and the
+    entries that are not a host name or IP address.
+    """
+    hosts: dict[str, str] = {}
+    invalid: list[str] = []
+    for line in text.replace(",", "\n").splitlines():
+        host, _, name = line.strip().partition(" ")
+        if not host or host.startswith("#") or host in hosts:
+            continue
+        if not _is_valid_host(host):
+            invalid.append(host)
+            continue
+        hosts[host] = name.strip() or f"{DEFAULT_NAME} {host}"
+    return hosts, invalid
+
+
+def _read_hosts_file(config_dir: str, filename: str) -> str:
+    """Read a list of hosts from a file inside the config directory."""
+    root = Path(config_dir).resolve()
+    path = (root / filename).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"{filename} is outside the config directory")
+    return path.read_text(encoding="utf-8")
+
+
+def _get_bulk_schema(user_input: dict[str, Any] | None) -> vol.Schema:
+    """Get the schema for the bulk onboarding step."""
+    if user_input is None:
+        user_input = {}
+
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_HOSTS, default=user_input.get(CONF_HOSTS, "")
+            ): TextSelector(TextSelectorConfig(multiline=True)),
+            vol.Optional(
+                CONF_HOSTS_FILE, default=user_input.get(CONF_HOSTS_FILE, "")
+            ): cv.string,
+            vol.Optional(
+                CONF_USERNAME, default=user_input.get(CONF_USERNAME, "")
+            ): cv.string,
+            vol.Optional(
+                CONF_PASSWORD, default=user_input.get(CONF_PASSWORD, "")
+            ): cv.string,
+            vol.Optional(CONF_SSL, default=user_input.get(CONF_SSL, False)): bool,
+            vol.Optional(
+                CONF_VERIFY_SSL, default=user_input.get(CONF_VERIFY_SSL, True)
+            ): bool,
+        }
+    )
+
+
 def _get_schema(
     user_input: dict[str, Any] | None,
     default_dict: dict[str, Any],
@@ -45,6 +45,8 @@ CONNECTION_ERRORS: Final = (asyncio.TimeoutError, aiohttp.ClientError)
 # config flow
 CONF_NAME = "name"
 CONF_SERIAL = "id"
+CONF_HOSTS = "hosts"
+CONF_HOSTS_FILE = "hosts_file"
 CONF_TYPE = "type"
 CONF_GRID = "grid"
 CONF_SOLAR = "solar"
@@ -56,6 +58,20 @@ CONF_VEHICLE_RANGE = "vehicle_range"
 CONF_VEHICLE_ETA = "vehicle_eta"
 CONF_HOME_BATTERY_SOC = "home_battery_soc"
 CONF_HOME_BATTERY_POWER = "home_battery_power"
+CONF_LOCAL_FIRMWARE = "local_firmware"
+CONF_GRID_DEADBAND = "grid_deadband"
+CONF_GRID_DEADBAND_PERCENT = "grid_deadband_percent"
+CONF_SOLAR_DEADBAND = "solar_deadband"
+CONF_SOLAR_DEADBAND_PERCENT = "solar_deadband_percent"
+CONF_SHAPER_DEADBAND = "shaper_deadband"
+CONF_SHAPER_DEADBAND_PERCENT = "shaper_deadband_percent"
+CONF_MAX_PUSH_INTERVAL = "max_push_interval"
+CONF_SITE_ALLOCATION = "site_allocation"
+CONF_SITE_MAX_IMPORT = "site_max_import"
+CONF_TELEMETRY_SAMPLES = "telemetry_samples"
+CONF_TELEMETRY_FILE = "telemetry_file"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_PUBLISH_THRESHOLD = "publish_threshold"
 DEFAULT_HOST = "openevse.local"
 DEFAULT_NAME = "OpenEVSE"
 
@@ -72,8 +88,24 @@ SENSOR_FIELDS = [
     CONF_HOME_BATTERY_POWER,
 ]
 
+# Absolute (W) and relative (%) deadband options per pushed channel
+DEADBAND_OPTIONS: Final = {
+    CONF_GRID: (CONF_GRID_DEADBAND, CONF_GRID_DEADBAND_PERCENT),
+    CONF_SOLAR: (CONF_SOLAR_DEADBAND, CONF_SOLAR_DEADBAND_PERCENT),
+    CONF_SHAPER: (CONF_SHAPER_DEADBAND, CONF_SHAPER_DEADBAND_PERCENT),
+}
+DEFAULT_MAX_PUSH_INTERVAL = 60
+DEFAULT_SITE_VOLTAGE = 240
+
 # hass.data attributes
 UNSUB_LISTENERS = "unsub_listeners"
+FIRMWARE_CACHE = "firmware_cache"
+PROBE_CACHE = "probe_cache"
+DEVICE_INDEX = "device_index"
+LINKED_SENSOR_REGISTRY = "linked_sensor_registry"
+SITE_ALLOCATORS = "site_allocators"
+SCHEDULER = "scheduler"
+RECONNECT_LIMITER = "reconnect_limiter"
 
 DOMAIN = "openevse"
 COORDINATOR = "coordinator"
@@ -93,6 +125,77 @@ PLATFORMS = [
 USER_AGENT = "Home Assistant"
 MANAGER = "manager"
 
+# Snapshot fields kept in the telemetry buffer
+TELEMETRY_FIELDS: Final = ("charging_power", "charging_current", "charging_voltage")
+
+# Share of its poll slot a charger is randomly delayed by
+POLL_JITTER = 0.25
+
+# Charger requests the scheduler runs at the same time
+MAX_CONCURRENT_JOBS = 8
+
+# Gaps between websocket frames the expected frame rate is taken from, and
+# how many must be seen before a silent websocket is considered stale
+WS_FRAME_HISTORY = 20
+WS_MIN_FRAMES = 3
+
+# Longest recent frame gaps missed before a connected websocket is stale,
+# and the least seconds of silence that is, covering the slower frames of
+# a charger going idle after a busy period
+WS_STALE_FRAMES = 3
+WS_STALE_MIN_AGE = 120
+
+# Seconds between checks of the websocket of a charger
+WS_WATCHDOG_INTERVAL = 15
+
+# Websocket reconnects allowed per second across all chargers, and at once
+WS_RECONNECT_RATE = 1
+WS_RECONNECT_BURST = 4
+
+# Seconds a charger waits after its first reconnect attempt, doubling with
+# each further attempt up to the maximum
+WS_RECONNECT_BACKOFF = 30
+WS_RECONNECT_MAX_BACKOFF = 900
+
+# Seconds between saves of the last known snapshot of a charger
+SNAPSHOT_SAVE_DELAY = 300
+
+# Firmware versions the stored identity of a charger was read with
+IDENTITY_FIRMWARE_FIELDS: Final = ("wifi_firmware", "openevse_firmware")
+
+# Snapshot fields read by the integration itself, fetched without any entity
+COORDINATOR_FIELDS: Final = frozenset(
+    {
+        *TELEMETRY_FIELDS,
+        *IDENTITY_FIRMWARE_FIELDS,
+        "charge_time_elapsed",
+        "divert_active",
+        "divertmode",
+        "max_amps",
+        "min_amps",
+        "vehicle",
+    }
+)
+MAX_TELEMETRY_SAMPLES = 1_000_000
+
+# OTA progress tracking (seconds)
+OTA_FALLBACK_POLL_INTERVAL = 10
+OTA_PROGRESS_TIMEOUT = 300
+FLEET_HEALTH_CHECK_TIMEOUT = 180
+DEFAULT_FLEET_CONCURRENCY = 2
+
+# Local firmware mirror
+FIRMWARE_URL_PATH = "/api/openevse/firmware"
+FIRMWARE_DOWNLOAD_TIMEOUT = 300
+FIRMWARE_CACHE_MAX_AGE = 30 * 86400
+FIRMWARE_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Zeroconf discovery probes (seconds)
+ZEROCONF_PROBE_TTL = 300
+
+# Bulk onboarding
+BULK_IMPORT_CONCURRENCY = 8
+
 CONNECTION_ERROR = (
     "Error connecting to device: %s, please check your network connection."
 )
@@ -106,6 +209,9 @@ SERVICE_MAKE_CLAIM = "make_claim"
 SERVICE_LIST_CLAIMS = "list_claims"
 SERVICE_RELEASE_CLAIM = "release_claim"
 SERVICE_LIST_OVERRIDES = "list_overrides"
+SERVICE_FLEET_UPDATE = "fleet_update"
+SERVICE_INSTALL_FIRMWARE_FILE = "install_firmware_file"
+SERVICE_GET_TELEMETRY = "get_telemetry"
 
 # attributes
 ATTR_DEVICE_ID = "device_id"
@@ -117,6 +223,11 @@ ATTR_TIME_LIMIT = "time_limit"
 ATTR_AUTO_RELEASE = "auto_release"
 ATTR_TYPE = "type"
 ATTR_VALUE = "value"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_MAX_FAILURES = "max_failures"
+ATTR_PATH = "path"
+ATTR_START = "start"
+ATTR_END = "end"
 
 SERVICE_LEVELS = ["1", "2", "A"]
 DIVERT_MODE = ["fast", "eco"]
@@ -146,6 +257,15 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         device_class=SensorDeviceClass.DURATION,
         suggested_display_precision=1,
         value_fn=lambda data: data.get("charge_time_elapsed"),
+        min_publish_interval=60,
+        publish_threshold=60,
+    ),
+    OpenEVSESensorEntityDescription(
+        key="charging_session_start",
+        name="Charging Session Started",
+        icon="mdi:clock-start",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda data: data.get("charging_session_start"),
     ),
     OpenEVSESensorEntityDescription(
         key="ambient_temperature",
@@ -191,6 +311,8 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         device_class=SensorDeviceClass.ENERGY,
         suggested_display_precision=1,
         value_fn=lambda data: data.get("usage_session"),
+        min_publish_interval=60,
+        publish_threshold=50,
     ),
     OpenEVSESensorEntityDescription(
         key="usage_total",
@@ -226,6 +348,8 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         device_class=SensorDeviceClass.VOLTAGE,
         suggested_display_precision=1,
         value_fn=lambda data: data.get("charging_voltage"),
+        min_publish_interval=10,
+        publish_threshold=2,
     ),
     OpenEVSESensorEntityDescription(
         key="charging_current",
@@ -237,6 +361,8 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         device_class=SensorDeviceClass.CURRENT,
         suggested_display_precision=1,
         value_fn=lambda data: data.get("charging_current"),
+        min_publish_interval=10,
+        publish_threshold=500,
     ),
     OpenEVSESensorEntityDescription(
         key="service_level",
@@ -289,6 +415,8 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
         value_fn=lambda data: data.get("charging_power"),
+        min_publish_interval=10,
+        publish_threshold=50_000,
     ),
     OpenEVSESensorEntityDescription(
         key="wifi_signal",
@@ -297,6 +425,8 @@ SENSOR_TYPES: Final[tuple[OpenEVSESensorEntityDescription, ...]] = (
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=lambda data: data.get("wifi_signal"),
+        min_publish_interval=300,
+        publish_threshold=3,
     ),
     OpenEVSESensorEntityDescription(
         key="ammeter_scale_factor",
@@ -10,7 +10,8 @@ from homeassistant.const import CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .const import COORDINATOR, DOMAIN
+from .const import COORDINATOR, DOMAIN, MANAGER
+from .scheduler import async_get_scheduler
 
 REDACT_KEYS = {CONF_PASSWORD}
 
@@ -21,6 +22,15 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     diag: dict[str, Any] = {}
     diag["config"] = config_entry.as_dict()
+    diag["scheduler"] = async_get_scheduler(hass).metrics
+    if entry_data := hass.data.get(DOMAIN, {}).get(config_entry.entry_id):
+        coordinator = entry_data[COORDINATOR]
+        diag["websocket"] = {
+            "state": entry_data[MANAGER].ws_state,
+            "frame_age": coordinator.ws_frame_age,
+            "stale_after": coordinator.ws_stale_after,
+            "stale": coordinator.ws_stale,
+        }
     return async_redact_data(diag, REDACT_KEYS)
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntityDescription
@@ -22,7 +23,23 @@ class OpenEVSEEntity:
 
     _config: ConfigEntry
 
+    async def async_added_to_hass(self) -> None:
+        """Tell the coordinator the data key of this entity is read."""
+        await super().async_added_to_hass()
+        coordinator = getattr(self, "coordinator", None)
+        if hasattr(coordinator, "async_add_consumer"):
+            self.async_on_remove(
+                coordinator.async_add_consumer(self.entity_description.key)
+            )
+
     @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag states restored from the last known state of the charger."""
+        if getattr(getattr(self, "coordinator", None), "stale", False):
+            return {"stale": True}
+        return None
+
+    @cached_property
     def device_info(self) -> DeviceInfo:
         """Return a port description for device registry."""
         return DeviceInfo(
@@ -83,6 +100,9 @@ class OpenEVSESensorEntityDescription(SensorEntityDescription):
     value: str | None = None
     min_version: str | None = None
     value_fn: Callable[[dict[str, Any]], Any] | None = None
+    # Seconds between state writes for changes smaller than the threshold
+    min_publish_interval: float | None = None
+    publish_threshold: float | None = None
 
 
 @dataclass
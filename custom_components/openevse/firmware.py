@@ -0,0 +1,408 @@
+"""Local firmware mirror for OpenEVSE OTA updates."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs, payload, web
+from aiohttp.abc import AbstractStreamWriter
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from openevsehttp.__main__ import OpenEVSE
+from openevsehttp.const import SUCCESS_ANSWERS
+
+from .const import (
+    CONF_LOCAL_FIRMWARE,
+    CONNECTION_ERRORS,
+    DOMAIN,
+    FIRMWARE_CACHE,
+    FIRMWARE_CACHE_MAX_AGE,
+    FIRMWARE_CACHE_MAX_SIZE,
+    FIRMWARE_DOWNLOAD_TIMEOUT,
+    FIRMWARE_URL_PATH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.firmware_cache"
+CHUNK_SIZE = 64 * 1024
+# Every ESP8266/ESP32 application image starts with this byte
+ESP_IMAGE_MAGIC = 0xE9
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class FirmwareValidationError(Exception):
+    """Exception for firmware images that fail validation."""
+
+
+class FirmwareUploadError(Exception):
+    """Exception for firmware uploads rejected by the charger."""
+
+
+def _hash_file(path: Path) -> tuple[str, int] | None:
+    """Return the sha256 digest and size of a file, None if it is missing."""
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with path.open("rb") as handle:
+            while chunk := handle.read(CHUNK_SIZE):
+                hasher.update(chunk)
+                size += len(chunk)
+    except FileNotFoundError:
+        return None
+    return hasher.hexdigest(), size
+
+
+def _read_image_header(path: Path) -> tuple[int, int]:
+    """Return the size and first byte of a firmware file."""
+    with path.open("rb") as handle:
+        first = handle.read(1)
+        size = os.fstat(handle.fileno()).st_size
+    return size, first[0] if first else -1
+
+
+def _remove_files(paths: list[Path]) -> None:
+    """Remove files, ignoring the ones already gone."""
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+class OpenEVSEFirmwareCache:
+    """Content-addressed cache of firmware images served to chargers."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_age: float = FIRMWARE_CACHE_MAX_AGE,
+        max_size: int = FIRMWARE_CACHE_MAX_SIZE,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.path = Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}_firmware"))
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._max_age = max_age
+        self._max_size = max_size
+        self._urls: dict[str, str] = {}
+        self._assets: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        # Per URL lock and the number of callers holding or waiting for it
+        self._url_locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cache index from storage."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load() or {}
+            self._urls = dict(data.get("urls", {}))
+            self._assets = dict(data.get("assets", {}))
+            self._loaded = True
+        await self.async_evict()
+
+    @callback
+    def _async_save(self) -> None:
+        """Schedule saving the cache index."""
+        self._store.async_delay_save(
+            lambda: {"urls": self._urls, "assets": self._assets}, 10
+        )
+
+    def path_for(self, digest: str) -> Path | None:
+        """Return the path of a cached image, None if it is not cached."""
+        if not DIGEST_RE.match(digest) or digest not in self._assets:
+            return None
+        return self.path / f"{digest}.bin"
+
+    async def async_get_digest(self, url: str) -> str:
+        """Return the digest of the image at url, downloading it only once."""
+        await self.async_load()
+        lock, users = self._url_locks.get(url, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._url_locks[url] = (lock, users + 1)
+        try:
+            async with lock:
+                digest = self._urls.get(url)
+                if digest is not None and await self._async_validate(digest):
+                    self._assets[digest]["last_used"] = time.time()
+                    self._async_save()
+                    return digest
+
+                digest, size = await self._async_download(url)
+                self._urls[url] = digest
+                self._assets[digest] = {"size": size, "last_used": time.time()}
+                await self.async_evict(keep=digest)
+                return digest
+        finally:
+            lock, users = self._url_locks[url]
+            if users == 1:
+                del self._url_locks[url]
+            else:
+                self._url_locks[url] = (lock, users - 1)
+
+    async def _async_validate(self, digest: str) -> bool:
+        """Return True if the cached image still matches its digest."""
+        path = self.path_for(digest)
+        if path is None:
+            return False
+        result = await self.hass.async_add_executor_job(_hash_file, path)
+        if result == (digest, self._assets[digest]["size"]):
+            return True
+
+        _LOGGER.warning("Cached firmware %s is corrupt, downloading it again", digest)
+        await self._async_remove([digest])
+        return False
+
+    async def _async_download(self, url: str) -> tuple[str, int]:
+        """Download and validate an image, returning its digest and size."""
+        _LOGGER.debug("Downloading firmware from %s", url)
+        await self.hass.async_add_executor_job(
+            partial(self.path.mkdir, parents=True, exist_ok=True)
+        )
+        tmp_path = self.path / f".{uuid.uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        size = 0
+        session = async_get_clientsession(self.hass)
+        try:
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=FIRMWARE_DOWNLOAD_TIMEOUT)
+            ) as resp:
+                resp.raise_for_status()
+                expected = resp.headers.get(hdrs.CONTENT_LENGTH)
+                handle = await self.hass.async_add_executor_job(tmp_path.open, "wb")
+                try:
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        if size == 0 and chunk[0] != ESP_IMAGE_MAGIC:
+                            raise FirmwareValidationError(
+                                f"{url} is not an ESP firmware image"
+                            )
+                        hasher.update(chunk)
+                        size += len(chunk)
+                        await self.hass.async_add_executor_job(handle.write, chunk)
+                finally:
+                    await self.hass.async_add_executor_job(handle.close)
+
+            if size == 0:
+                raise FirmwareValidationError(f"{url} returned an empty image")
+            if expected is not None and size != int(expected):
+                raise FirmwareValidationError(
+                    f"Incomplete download of {url} ({size} of {expected} bytes)"
+                )
+
+            digest = hasher.hexdigest()
+            await self.hass.async_add_executor_job(
+                os.replace, tmp_path, self.path / f"{digest}.bin"
+            )
+        finally:
+            await self.hass.async_add_executor_job(
+                partial(tmp_path.unlink, missing_ok=True)
+            )
+
+        _LOGGER.debug("Cached firmware %s (%s bytes) as %s", url, size, digest)
+        return digest, size
+
+    async def async_evict(self, keep: str | None = None) -> None:
+        """Evict images unused for too long, then the oldest above the size cap."""
+        now = time.time()
+        evict = [
+            digest
+            for digest, asset in self._assets.items()
+            if digest != keep and now - asset["last_used"] > self._max_age
+        ]
+        total = sum(
+            asset["size"]
+            for digest, asset in self._assets.items()
+            if digest not in evict
+        )
+        for digest, asset in sorted(
+            self._assets.items(), key=lambda item: item[1]["last_used"]
+        ):
+            if total <= self._max_size:
+                break
+            if digest == keep or digest in evict:
+                continue
+            evict.append(digest)
+            total -= asset["size"]
+
+        if evict:
+            _LOGGER.debug("Evicting cached firmware: %s", evict)
+            await self._async_remove(evict)
+        else:
+            self._async_save()
+
+    async def _async_remove(self, digests: list[str]) -> None:
+        """Remove images from the cache and disk."""
+        await self.hass.async_add_executor_job(
+            _remove_files, [self.path / f"{digest}.bin" for digest in digests]
+        )
+        for digest in digests:
+            self._assets.pop(digest, None)
+        self._urls = {
+            url: digest for url, digest in self._urls.items() if digest not in digests
+        }
+        self._async_save()
+
+
+class OpenEVSEFirmwareView(HomeAssistantView):
+    """Serve cached firmware images to chargers on the local network."""
+
+    url = f"{FIRMWARE_URL_PATH}/{{filename}}"
+    name = "api:openevse:firmware"
+    # Chargers cannot authenticate, images are public release assets
+    requires_auth = False
+
+    def __init__(self, cache: OpenEVSEFirmwareCache) -> None:
+        """Initialize."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return a cached firmware image."""
+        digest, _, extension = filename.partition(".")
+        path = self._cache.path_for(digest) if extension == "bin" else None
+        if path is None:
+            return web.Response(status=404)
+        return web.FileResponse(
+            path, headers={hdrs.CONTENT_TYPE: "application/octet-stream"}
+        )
+
+
+@callback
+def async_setup_firmware_cache(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Create the firmware cache and register its view.
+
+    Only done once, for the first entry serving firmware locally.
+    """
+    if not config_entry.options.get(CONF_LOCAL_FIRMWARE, False):
+        return
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if FIRMWARE_CACHE in domain_data:
+        return
+    cache = domain_data[FIRMWARE_CACHE] = OpenEVSEFirmwareCache(hass)
+    hass.http.register_view(OpenEVSEFirmwareView(cache))
+
+
+async def async_get_firmware_url(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    firmware_url: str,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+) -> str:
+    """Return the URL the charger should download firmware from.
+
+    Falls back to the original URL if the image cannot be served locally.
+    """
+    if not config_entry.options.get(CONF_LOCAL_FIRMWARE, False):
+        return firmware_url
+
+    try:
+        cache: OpenEVSEFirmwareCache = hass.data[DOMAIN][FIRMWARE_CACHE]
+        digest = await cache.async_get_digest(firmware_url)
+        base_url = get_url(hass, allow_cloud=False, prefer_external=False)
+    except (
+        *CONNECTION_ERRORS,
+        KeyError,
+        OSError,
+        FirmwareValidationError,
+        NoURLAvailableError,
+    ) as err:
+        logger.warning(
+            "Unable to serve firmware locally, falling back to %s: %s",
+            firmware_url,
+            err,
+        )
+        return firmware_url
+
+    return f"{base_url.rstrip('/')}{FIRMWARE_URL_PATH}/{digest}.bin"
+
+
+class FirmwareFilePayload(payload.Payload):
+    """Stream a firmware file from disk, reporting how much has been sent."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        size: int,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            path, content_type="application/octet-stream", filename=path.name
+        )
+        self.hass = hass
+        self._size = size
+        self._progress_callback = progress_callback
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """Firmware images are binary."""
+        raise TypeError("Firmware images cannot be decoded as text")
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        """Write the file in chunks without reading it into memory."""
+        handle = await self.hass.async_add_executor_job(self._value.open, "rb")
+        sent = 0
+        try:
+            while sent < self._size:
+                chunk = await self.hass.async_add_executor_job(
+                    handle.read, min(CHUNK_SIZE, self._size - sent)
+                )
+                if not chunk:
+                    raise FirmwareValidationError(
+                        f"{self._value} shrank while it was being uploaded"
+                    )
+                await writer.write(chunk)
+                sent += len(chunk)
+                if self._progress_callback is not None:
+                    self._progress_callback(sent, self._size)
+        finally:
+            await self.hass.async_add_executor_job(handle.close)
+
+
+async def async_upload_firmware_file(
+    hass: HomeAssistant,
+    manager: OpenEVSE,
+    path: str | Path,
+    progress_callback: Callable[[int, int], None] | None = None,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+) -> None:
+    """Stream a local firmware file to the charger's upload endpoint."""
+    path = Path(path)
+    try:
+        size, magic = await hass.async_add_executor_job(_read_image_header, path)
+    except OSError as err:
+        raise FirmwareValidationError(f"Unable to read {path}: {err}") from err
+    if size == 0:
+        raise FirmwareValidationError(f"{path} is empty")
+    if magic != ESP_IMAGE_MAGIC:
+        raise FirmwareValidationError(f"{path} is not an ESP firmware image")
+
+    with aiohttp.MultipartWriter("form-data") as form:
+        part = form.append_payload(
+            FirmwareFilePayload(hass, path, size, progress_callback)
+        )
+        part.set_content_disposition("form-data", name="file", filename=path.name)
+
+    url = f"{manager.url}update"
+    logger.debug("Uploading firmware %s to %s (%s bytes)", path, url, size)
+    response = await manager.process_request(url=url, method="post", rapi=form)
+    logger.debug("Firmware upload response: %s", response)
+
+    msg = response.get("msg") if isinstance(response, dict) else response
+    if msg != "started" and msg not in SUCCESS_ANSWERS:
+        raise FirmwareUploadError(f"Charger rejected the firmware upload: {response}")
@@ -94,7 +94,7 @@ class OpenEVSELight(CoordinatorEntity, OpenEVSEEntity, LightEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        if self._min_version and not self.manager.version_check(self._min_version):
+        if self._min_version and not self.coordinator.version_check(self._min_version):
             return False
         return self.coordinator.last_update_success
 
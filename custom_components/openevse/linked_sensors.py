@@ -0,0 +1,418 @@
+"""Linked sensors pushed from Home Assistant to the chargers."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any, Final
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util.unit_conversion import PowerConverter
+from openevsehttp.__main__ import OpenEVSE
+from openevsehttp.exceptions import UnsupportedFeature
+
+from .const import (
+    CONF_GRID,
+    CONF_HOME_BATTERY_POWER,
+    CONF_HOME_BATTERY_SOC,
+    CONF_INVERT,
+    CONF_SHAPER,
+    CONF_SITE_ALLOCATION,
+    CONF_SOLAR,
+    CONF_VEHICLE_ETA,
+    CONF_VEHICLE_RANGE,
+    CONF_VEHICLE_SOC,
+    CONF_VOLTAGE,
+    CONNECTION_ERROR,
+    CONNECTION_ERRORS,
+    DEADBAND_OPTIONS,
+    DOMAIN,
+    LINKED_SENSOR_REGISTRY,
+)
+from .logger import OpenEVSELoggerAdapter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_state(state: State | None) -> float | None:
+    """Parse a numeric sensor state."""
+    if not state or state.state in [None, "unavailable", "unknown", ""]:
+        return None
+    try:
+        return float(state.state)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class LinkedValue:
+    """State of a linked sensor, parsed once for all chargers."""
+
+    state: State | None
+    value: float | None
+    watts: float | None = None
+
+    @property
+    def non_numeric(self) -> bool:
+        """Return True if the state is set but not a number."""
+        return (
+            self.value is None
+            and self.state is not None
+            and self.state.state not in [None, "unavailable", "unknown", ""]
+        )
+
+
+class PowerUnits:
+    """Conversion factors to Watts of the linked power sensors.
+
+    The factor is resolved once per entity and only recomputed when the
+    unit of the entity changes.
+    """
+
+    def __init__(self, logger: logging.Logger | logging.LoggerAdapter) -> None:
+        """Initialize."""
+        self._logger = logger
+        self._factors: dict[str, tuple[str | None, float]] = {}
+
+    def factor(self, entity_id: str, unit: str | None) -> float:
+        """Return the factor converting a value of the entity to Watts."""
+        cached = self._factors.get(entity_id)
+        if cached is not None and cached[0] == unit:
+            return cached[1]
+
+        factor = 1.0
+        if unit and unit != UnitOfPower.WATT:
+            try:
+                factor = PowerConverter.convert(1.0, unit, UnitOfPower.WATT)
+            except HomeAssistantError:
+                self._logger.warning(
+                    "Unit %s of %s can not be converted to W, sending values as is",
+                    unit,
+                    entity_id,
+                )
+        self._factors[entity_id] = (unit, factor)
+        return factor
+
+
+class LinkedSensorPushes:
+    """Last values pushed to the charger for the linked sensors."""
+
+    def __init__(self, max_interval: float) -> None:
+        """Initialize."""
+        self._max_interval = max_interval
+        self._last: dict[str, tuple[int | None, float]] = {}
+
+    def should_send(self, linked: LinkedSensor, value: int | None) -> bool:
+        """Return True unless the value is within the deadband of the last push."""
+        if not linked.deadband and not linked.deadband_percent:
+            return True
+        last = self._last.get(linked.key)
+        if last is None or value is None or last[0] is None:
+            return True
+        if time.monotonic() - last[1] >= self._max_interval:
+            return True
+        deadband = max(linked.deadband, abs(last[0]) * linked.deadband_percent / 100)
+        return abs(value - last[0]) > deadband
+
+    def record(self, linked: LinkedSensor, value: int | None) -> None:
+        """Record a value sent to the charger."""
+        self._last[linked.key] = (value, time.monotonic())
+
+
+@dataclass(frozen=True)
+class LinkedSensor:
+    """How the state of a linked sensor is sent to the charger."""
+
+    key: str
+    name: str
+    method: str
+    argument: str
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+    unsupported: str | None = None
+    power: bool = False
+    deadband: float = 0
+    deadband_percent: float = 0
+
+    async def async_send(
+        self,
+        manager: OpenEVSE,
+        logger: OpenEVSELoggerAdapter,
+        pushes: LinkedSensorPushes,
+        linked_value: LinkedValue,
+    ) -> None:
+        """Send the parsed state to the charger."""
+        value = linked_value.watts if self.power else linked_value.value
+        if value is not None:
+            value = round(value)
+        elif linked_value.non_numeric:
+            logger.warning(
+                "Non-numeric state for %s: %s", self.name, linked_value.state.state
+            )
+
+        if not pushes.should_send(self, value):
+            logger.debug(
+                "Skipping sensor data within deadband: (%s: %s)", self.key, value
+            )
+            return
+
+        logger.debug("Sending sensor data to OpenEVSE: (%s: %s)", self.key, value)
+        try:
+            await getattr(manager, self.method)(**self.kwargs, **{self.argument: value})
+        except UnsupportedFeature:
+            if self.unsupported is None:
+                raise
+            logger.debug(self.unsupported)
+        except CONNECTION_ERRORS as err:
+            logger.warning(CONNECTION_ERROR, err)
+        else:
+            pushes.record(self, value)
+
+
+# Option key and how the linked sensor is forwarded
+LINKED_SENSORS: Final = (
+    (
+        CONF_GRID,
+        LinkedSensor(
+            "grid",
+            "grid sensor",
+            "self_production",
+            "grid",
+            power=True,
+        ),
+    ),
+    (
+        CONF_SOLAR,
+        LinkedSensor(
+            "solar",
+            "solar sensor",
+            "self_production",
+            "solar",
+            {"grid": None, "invert": False},
+            power=True,
+        ),
+    ),
+    (
+        CONF_VOLTAGE,
+        LinkedSensor(
+            "voltage",
+            "voltage sensor",
+            "grid_voltage",
+            "voltage",
+        ),
+    ),
+    (
+        CONF_SHAPER,
+        LinkedSensor(
+            "shaper",
+            "shaper sensor",
+            "set_shaper_live_pwr",
+            "power",
+            power=True,
+        ),
+    ),
+    (
+        CONF_VEHICLE_SOC,
+        LinkedSensor(
+            "vehicle_soc",
+            "vehicle SoC sensor",
+            "soc",
+            "battery_level",
+            unsupported="Vehicle SoC push not supported by firmware.",
+        ),
+    ),
+    (
+        CONF_VEHICLE_RANGE,
+        LinkedSensor(
+            "vehicle_range",
+            "vehicle range sensor",
+            "soc",
+            "battery_range",
+            unsupported="Vehicle range push not supported by firmware.",
+        ),
+    ),
+    (
+        CONF_VEHICLE_ETA,
+        LinkedSensor(
+            "vehicle_eta",
+            "vehicle ETA sensor",
+            "soc",
+            "time_to_full",
+            unsupported="Vehicle ETA push not supported by firmware.",
+        ),
+    ),
+    (
+        CONF_HOME_BATTERY_SOC,
+        LinkedSensor(
+            "home_battery_soc",
+            "home battery SoC sensor",
+            "home_battery",
+            "soc",
+            unsupported="Home battery push not supported by firmware.",
+        ),
+    ),
+    (
+        CONF_HOME_BATTERY_POWER,
+        LinkedSensor(
+            "home_battery_power",
+            "home battery power sensor",
+            "home_battery",
+            "power",
+            unsupported="Home battery push not supported by firmware.",
+            power=True,
+        ),
+    ),
+)
+
+
+def build_state_handlers(
+    options: Mapping[str, Any],
+) -> dict[str, tuple[LinkedSensor, ...]]:
+    """Resolve the linked sensor options into handlers per entity_id."""
+    handlers: dict[str, list[LinkedSensor]] = {}
+    for option, linked in LINKED_SENSORS:
+        entity_id = options.get(option)
+        if not entity_id:
+            continue
+        if option in (CONF_GRID, CONF_SOLAR) and options.get(CONF_SITE_ALLOCATION):
+            # The site allocator sets the current instead of PV divert
+            continue
+        if option == CONF_GRID:
+            linked = replace(
+                linked, kwargs={"solar": None, "invert": options.get(CONF_INVERT)}
+            )
+        elif option == CONF_SOLAR and entity_id == options.get(CONF_GRID):
+            # A sensor used for both is only sent as grid
+            continue
+        if option in DEADBAND_OPTIONS:
+            deadband, deadband_percent = DEADBAND_OPTIONS[option]
+            linked = replace(
+                linked,
+                deadband=options.get(deadband) or 0,
+                deadband_percent=options.get(deadband_percent) or 0,
+            )
+        handlers.setdefault(entity_id, []).append(linked)
+    return {entity_id: tuple(linked) for entity_id, linked in handlers.items()}
+
+
+@dataclass(frozen=True)
+class _Subscriber:
+    """A charger interested in a linked sensor."""
+
+    power: bool
+    action: Callable[[LinkedValue], Awaitable[None]]
+
+
+class LinkedSensorRegistry:
+    """Track each linked sensor once and fan its value out to the chargers.
+
+    Chargers sharing a site meter get the state parsed and converted once
+    instead of every config entry listening and parsing on its own.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.units = PowerUnits(_LOGGER)
+        self._subscribers: dict[str, list[_Subscriber]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_subscribe(
+        self,
+        entity_id: str,
+        power: bool,
+        action: Callable[[LinkedValue], Awaitable[None]],
+    ) -> CALLBACK_TYPE:
+        """Call action with every new value of the entity."""
+        subscriber = _Subscriber(power, action)
+        subscribers = self._subscribers.setdefault(entity_id, [])
+        subscribers.append(subscriber)
+        if entity_id not in self._unsubs:
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._async_state_changed
+            )
+        if power and (state := self.hass.states.get(entity_id)):
+            # Resolve the unit now so a bad unit is reported at setup
+            self.units.factor(entity_id, state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
+
+        @callback
+        def _async_unsubscribe() -> None:
+            subscribers.remove(subscriber)
+            if not subscribers:
+                del self._subscribers[entity_id]
+                self._unsubs.pop(entity_id)()
+
+        return _async_unsubscribe
+
+    def parse(self, state: State | None, power: bool) -> LinkedValue:
+        """Parse a state, converting it to Watts for power subscribers."""
+        value = _parse_state(state)
+        if not power or value is None:
+            return LinkedValue(state, value)
+        factor = self.units.factor(
+            state.entity_id, state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        )
+        return LinkedValue(state, value, value * factor)
+
+    async def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Parse the new state once and pass it to every subscriber."""
+        subscribers = list(self._subscribers.get(event.data["entity_id"], ()))
+        if not subscribers:
+            return
+        linked_value = self.parse(
+            event.data["new_state"],
+            any(subscriber.power for subscriber in subscribers),
+        )
+        await asyncio.gather(
+            *(subscriber.action(linked_value) for subscriber in subscribers)
+        )
+
+
+def async_get_linked_sensor_registry(hass: HomeAssistant) -> LinkedSensorRegistry:
+    """Return the shared linked sensor registry, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if LINKED_SENSOR_REGISTRY not in domain_data:
+        domain_data[LINKED_SENSOR_REGISTRY] = LinkedSensorRegistry(hass)
+    return domain_data[LINKED_SENSOR_REGISTRY]
+
+
+@callback
+def async_track_linked_sensors(
+    hass: HomeAssistant,
+    manager: OpenEVSE,
+    logger: OpenEVSELoggerAdapter,
+    handlers: Mapping[str, tuple[LinkedSensor, ...]],
+    max_push_interval: float,
+) -> list[CALLBACK_TYPE]:
+    """Push the linked sensors of a charger, returning the unsubscribers."""
+    registry = async_get_linked_sensor_registry(hass)
+    pushes = LinkedSensorPushes(max_push_interval)
+
+    async def _async_send(
+        linked: tuple[LinkedSensor, ...], linked_value: LinkedValue
+    ) -> None:
+        for sensor in linked:
+            await sensor.async_send(manager, logger, pushes, linked_value)
+
+    return [
+        registry.async_subscribe(
+            entity_id,
+            any(sensor.power for sensor in linked),
+            functools.partial(_async_send, linked),
+        )
+        for entity_id, linked in handlers.items()
+    ]
@@ -0,0 +1,71 @@
+"""Pacing of websocket reconnects across all chargers."""
+
+from __future__ import annotations
+
+import random
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    RECONNECT_LIMITER,
+    WS_RECONNECT_BACKOFF,
+    WS_RECONNECT_BURST,
+    WS_RECONNECT_MAX_BACKOFF,
+    WS_RECONNECT_RATE,
+)
+
+
+class ReconnectLimiter:
+    """Limit how fast the chargers of a fleet open their websockets.
+
+    Reconnects share a token bucket, so after a restart or a network blip
+    the fleet reconnects a few chargers at a time. Each charger also waits
+    an exponentially growing, jittered delay between its own attempts until
+    its websocket is seen connected.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rate: float = WS_RECONNECT_RATE,
+        burst: int = WS_RECONNECT_BURST,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = hass.loop.time()
+        # Attempts since the last connection and loop time of the next one
+        self._backoff: dict[str, tuple[int, float]] = {}
+
+    @callback
+    def async_try_acquire(self, key: str) -> bool:
+        """Return whether a charger may try to reconnect now."""
+        now = self.hass.loop.time()
+        attempts, not_before = self._backoff.get(key, (0, 0.0))
+        if now < not_before:
+            return False
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        delay = min(WS_RECONNECT_BACKOFF * 2**attempts, WS_RECONNECT_MAX_BACKOFF)
+        self._backoff[key] = (attempts + 1, now + random.uniform(delay / 2, delay))
+        return True
+
+    @callback
+    def async_reset(self, key: str) -> None:
+        """Forget the attempts of a charger once connected or unloaded."""
+        self._backoff.pop(key, None)
+
+
+@callback
+def async_get_reconnect_limiter(hass: HomeAssistant) -> ReconnectLimiter:
+    """Return the reconnect limiter shared by all chargers."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (limiter := domain_data.get(RECONNECT_LIMITER)) is None:
+        limiter = domain_data[RECONNECT_LIMITER] = ReconnectLimiter(hass)
+    return limiter
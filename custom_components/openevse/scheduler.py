@@ -0,0 +1,233 @@
+"""Integration wide scheduler for periodic charger work."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, MAX_CONCURRENT_JOBS, SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of recent runs the lateness metrics are computed over
+LATENESS_WINDOW = 100
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A unit of charger work due at a loop time."""
+
+    when: float
+    sequence: int
+    name: str = field(compare=False)
+    action: Callable[[], Awaitable[Any]] = field(compare=False)
+    config_entry: ConfigEntry | None = field(compare=False, default=None)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class OpenEVSEScheduler:
+    """Run the periodic work of every charger from a single timer.
+
+    Jobs are kept in a heap ordered by due time. Only the earliest one arms
+    a loop timer. Due jobs then wait for one of a fixed number of slots, so
+    a large fleet never has more than that many requests in flight.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent: int = MAX_CONCURRENT_JOBS
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self._heap: list[ScheduledJob] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._slots = asyncio.Semaphore(max_concurrent)
+        # Cancelled jobs still in the heap
+        self._cancelled = 0
+        self._waiting = 0
+        self._running = 0
+        self._runs = 0
+        self._lateness: deque[float] = deque(maxlen=LATENESS_WINDOW)
+
+    @callback
+    def async_schedule(
+        self,
+        delay: float,
+        action: Callable[[], Awaitable[Any]],
+        name: str,
+        config_entry: ConfigEntry | None = None,
+    ) -> CALLBACK_TYPE:
+        """Run the action after a delay, returning the cancel callback.
+
+        Due times are rounded up to the second so jobs falling in the same
+        second share a single timer.
+        """
+        job = ScheduledJob(
+            math.ceil(self.hass.loop.time() + delay),
+            next(self._sequence),
+            name,
+            action,
+            config_entry,
+        )
+        heapq.heappush(self._heap, job)
+        if self._heap[0] is job:
+            self._arm()
+
+        @callback
+        def _async_cancel() -> None:
+            if job.cancelled:
+                return
+            job.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > len(self._heap) // 2:
+                self._compact()
+            elif self._heap[0] is job:
+                self._arm()
+
+        return _async_cancel
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return the queue depth and lateness of recent runs."""
+        lateness = self._lateness
+        return {
+            "max_concurrent": self.max_concurrent,
+            "scheduled": len(self._heap) - self._cancelled,
+            "waiting": self._waiting,
+            "running": self._running,
+            "runs": self._runs,
+            "lateness_avg": sum(lateness) / len(lateness) if lateness else 0.0,
+            "lateness_max": max(lateness, default=0.0),
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the timer and drop every scheduled job."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for job in self._heap:
+            job.cancelled = True
+        self._heap.clear()
+        self._cancelled = 0
+
+    @callback
+    def _compact(self) -> None:
+        """Drop the cancelled jobs once they make up most of the heap.
+
+        Polls are rescheduled on every websocket frame, which would
+        otherwise leave a cancelled job behind each time.
+        """
+        self._heap = [job for job in self._heap if not job.cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+        self._arm()
+
+    @callback
+    def _arm(self) -> None:
+        """Set the timer for the earliest job."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        if self._heap:
+            self._timer = self.hass.loop.call_at(self._heap[0].when, self._run_due)
+
+    @callback
+    def _run_due(self) -> None:
+        """Start the jobs that are due."""
+        self._timer = None
+        if not self._heap:
+            return
+        # The timer may fire a little before the time it was set for
+        due = max(self.hass.loop.time(), self._heap[0].when)
+        while self._heap and self._heap[0].when <= due:
+            job = heapq.heappop(self._heap)
+            if job.cancelled:
+                self._cancelled -= 1
+                continue
+            # Makes the cancel callback a no-op once the job left the heap
+            job.cancelled = True
+            if job.config_entry is not None:
+                job.config_entry.async_create_background_task(
+                    self.hass, self._async_run(job), job.name
+                )
+            else:
+                self.hass.async_create_background_task(self._async_run(job), job.name)
+        self._arm()
+
+    async def _async_run(self, job: ScheduledJob) -> None:
+        """Run a job once a slot is free."""
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        self._runs += 1
+        self._lateness.append(max(self.hass.loop.time() - job.when, 0.0))
+        try:
+            await job.action()
+        except Exception:
+            _LOGGER.exception("Error running %s", job.name)
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+
+class ScheduledRefresh:
+    """Coordinator mixin polling through the integration scheduler."""
+
+    hass: HomeAssistant
+    config_entry: ConfigEntry | None
+    name: str
+    update_interval: Any
+    _unsub_refresh: CALLBACK_TYPE | None
+
+    def _refresh_delay(self) -> float:
+        """Return the seconds until the next poll."""
+        return self.update_interval.total_seconds()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Queue the next poll on the integration scheduler."""
+        if self.update_interval is None:
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+        self._unsub_refresh = async_get_scheduler(self.hass).async_schedule(
+            self._refresh_delay(),
+            self._handle_refresh_interval,
+            f"{self.name} - refresh",
+            self.config_entry,
+        )
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> OpenEVSEScheduler:
+    """Return the scheduler shared by all chargers."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(SCHEDULER)) is None:
+        scheduler = domain_data[SCHEDULER] = OpenEVSEScheduler(hass)
+    return scheduler
+
+
+@callback
+def async_shutdown_scheduler(hass: HomeAssistant) -> None:
+    """Stop the shared scheduler, done once the last charger is unloaded."""
+    if (scheduler := hass.data.get(DOMAIN, {}).pop(SCHEDULER, None)) is not None:
+        scheduler.async_shutdown()
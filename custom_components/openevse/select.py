@@ -66,6 +66,10 @@ class OpenEVSESelect(CoordinatorEntity, OpenEVSEEntity, SelectEntity):
         self._command = description.command
         self._manager = manager
         self._default_options = description.options or description.default_options
+        # Charge rate options, rebuilt only when min_amps or max_amps change
+        self._amps: tuple[Any, Any] | None = None
+        self._amps_range: tuple[int, int] | None = None
+        self._amps_options: list[str] = []
         self._attr_options = self.get_options()
         self._min_version = description.min_version
 
@@ -148,7 +152,6 @@ class OpenEVSESelect(CoordinatorEntity, OpenEVSEEntity, SelectEntity):
         if not data or not isinstance(data, dict):
             return False
 
-        manager = self.hass.data[DOMAIN][self._config.entry_id][MANAGER]
         attributes = ("divertmode", "divert_active")
         if (
             set(attributes).issubset(data.keys())
@@ -160,7 +163,7 @@ class OpenEVSESelect(CoordinatorEntity, OpenEVSEEntity, SelectEntity):
                 "Disabling %s due to PV Divert being active.", self._attr_name
             )
             return False
-        if self._min_version and not manager.version_check(self._min_version):
+        if self._min_version and not self.coordinator.version_check(self._min_version):
             return False
         return self.coordinator.last_update_success
 
@@ -174,18 +177,24 @@ class OpenEVSESelect(CoordinatorEntity, OpenEVSEEntity, SelectEntity):
                 if self._default_options:
                     return self._default_options
                 return [str(item) for item in range(6, 49)]
+            amps = (data.get("min_amps"), data.get("max_amps"))
+            if amps == self._amps:
+                return self._amps_options
+            raw_min, raw_max = amps
             try:
-                raw_min = data.get("min_amps")
                 amps_min = round(float(raw_min)) if raw_min is not None else 6
             except (ValueError, TypeError):
                 amps_min = 6
             try:
-                raw_max = data.get("max_amps")
                 amps_max = round(float(raw_max)) if raw_max is not None else 48
             except (ValueError, TypeError):
                 amps_max = 48
-            amps_max += 1
-            options = [str(item) for item in range(amps_min, amps_max)]
-            self.coordinator.logger.debug("Max Amps: %s", options)
-            return options
+            self._amps = amps
+            if (amps_min, amps_max) != self._amps_range:
+                self._amps_range = (amps_min, amps_max)
+                self._amps_options = [
+                    str(item) for item in range(amps_min, amps_max + 1)
+                ]
+                self.coordinator.logger.debug("Max Amps: %s", self._amps_options)
+            return self._amps_options
         return self._default_options or []
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import time
+from functools import cached_property
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -11,9 +13,20 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfLength
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import CONF_NAME, COORDINATOR, DOMAIN, MANAGER, SENSOR_TYPES
+from openevsehttp.__main__ import OpenEVSE
+
+from .const import (
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_NAME,
+    CONF_PUBLISH_THRESHOLD,
+    COORDINATOR,
+    DOMAIN,
+    MANAGER,
+    SENSOR_TYPES,
+)
 from .entity import OpenEVSEEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -62,10 +75,107 @@ class OpenEVSESensor(CoordinatorEntity, OpenEVSEEntity, SensorEntity):
         self._state = None
         self._icon = sensor_description.icon
         self._min_version = sensor_description.min_version
+        self._min_publish_interval = getattr(
+            sensor_description, "min_publish_interval", None
+        )
+        self._publish_threshold = getattr(sensor_description, "publish_threshold", None)
+        self._published: tuple[bool, Any] | None = None
+        self._published_at = 0.0
+        self._unsub_publish: CALLBACK_TYPE | None = None
 
         self._attr_name = f"{self._config.data[CONF_NAME]} {self._name}"
         self._attr_unique_id = f"{self._name}_{self._unique_id}"
 
+    async def async_added_to_hass(self) -> None:
+        """Cancel a pending state write when removed."""
+        await super().async_added_to_hass()
+        self._async_read_publish_options()
+        self.async_on_remove(self._async_cancel_publish)
+
+    @callback
+    def async_registry_entry_updated(self) -> None:
+        """Apply changed publish settings."""
+        super().async_registry_entry_updated()
+        self._async_read_publish_options()
+
+    @callback
+    def _async_read_publish_options(self) -> None:
+        """Read the publish settings, overridable in the entity options.
+
+        The entity registry keeps them per entity under the integration
+        domain, falling back to the defaults of the description.
+        """
+        options = (
+            self.registry_entry.options.get(DOMAIN, {}) if self.registry_entry else {}
+        )
+        self._min_publish_interval = options.get(
+            CONF_MIN_PUBLISH_INTERVAL,
+            getattr(self.entity_description, "min_publish_interval", None),
+        )
+        self._publish_threshold = options.get(
+            CONF_PUBLISH_THRESHOLD,
+            getattr(self.entity_description, "publish_threshold", None),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, holding back small changes of high churn sensors.
+
+        The coordinator keeps every value, only the state machine and the
+        recorder see fewer of them. A held back change is written once the
+        publish interval is over.
+        """
+        if not self._min_publish_interval:
+            super()._handle_coordinator_update()
+            return
+        state = (self.available, self.native_value)
+        if state == self._published:
+            return
+        delay = self._published_at + self._min_publish_interval - time.monotonic()
+        if delay > 0 and not self._significant_change(state):
+            if self._unsub_publish is None:
+                self._unsub_publish = async_call_later(
+                    self.hass, delay, self._async_publish_pending
+                )
+            return
+        self._async_publish(state)
+
+    def _significant_change(self, state: tuple[bool, Any]) -> bool:
+        """Return if the state moved enough since it was last written."""
+        if self._published is None or state[0] != self._published[0]:
+            return True
+        if self._publish_threshold is None:
+            return True
+        try:
+            return abs(float(state[1]) - float(self._published[1])) >= (
+                self._publish_threshold
+            )
+        except (TypeError, ValueError):
+            return True
+
+    @callback
+    def _async_publish(self, state: tuple[bool, Any]) -> None:
+        """Write the state now."""
+        self._async_cancel_publish()
+        self._published = state
+        self._published_at = time.monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_publish_pending(self, _now: Any) -> None:
+        """Write a change held back during the publish interval."""
+        self._unsub_publish = None
+        state = (self.available, self.native_value)
+        if state != self._published:
+            self._async_publish(state)
+
+    @callback
+    def _async_cancel_publish(self) -> None:
+        """Cancel the pending state write."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
@@ -74,12 +184,16 @@ class OpenEVSESensor(CoordinatorEntity, OpenEVSEEntity, SensorEntity):
             return self.entity_description.value_fn(data)
         return data.get(self._type)
 
+    @cached_property
+    def _manager(self) -> OpenEVSE:
+        """Return the manager of the charger."""
+        return self.hass.data[DOMAIN][self._unique_id][MANAGER]
+
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
         if self._type == "vehicle_range":
-            manager = self.hass.data[DOMAIN][self._unique_id][MANAGER]
-            range_data = getattr(manager, "vehicle_range_with_unit", None)
+            range_data = getattr(self._manager, "vehicle_range_with_unit", None)
             if range_data is not None:
                 unit = range_data[1]
                 if unit == "miles":
@@ -109,7 +223,6 @@ class OpenEVSESensor(CoordinatorEntity, OpenEVSEEntity, SensorEntity):
             return False
 
         # Check firmware version requirement
-        manager = self.hass.data[DOMAIN][self._unique_id][MANAGER]
         if not self._min_version:
             return True
-        return manager.version_check(self._min_version)
+        return self.coordinator.version_check(self._min_version)
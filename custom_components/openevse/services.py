@@ -1,10 +1,14 @@
 """OpenEVSE services."""
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     ServiceCall,
     ServiceResponse,
@@ -14,25 +18,40 @@ from homeassistant.core import (
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from openevsehttp.__main__ import OpenEVSE
+from openevsehttp.exceptions import UnsupportedFeature
 
 from .const import (
     ATTR_AUTO_RELEASE,
     ATTR_CHARGE_CURRENT,
+    ATTR_CONCURRENCY,
     ATTR_DEVICE_ID,
+    ATTR_END,
     ATTR_ENERGY_LIMIT,
     ATTR_MAX_CURRENT,
+    ATTR_MAX_FAILURES,
+    ATTR_PATH,
+    ATTR_START,
     ATTR_STATE,
     ATTR_TIME_LIMIT,
     ATTR_TYPE,
     ATTR_VALUE,
-    CONF_NAME,
     CONNECTION_ERROR,
     CONNECTION_ERRORS,
+    COORDINATOR,
+    DEFAULT_FLEET_CONCURRENCY,
+    DEVICE_INDEX,
     DOMAIN,
+    FLEET_HEALTH_CHECK_TIMEOUT,
+    FW_COORDINATOR,
     MANAGER,
     SERVICE_CLEAR_LIMIT,
     SERVICE_CLEAR_OVERRIDE,
+    SERVICE_FLEET_UPDATE,
     SERVICE_GET_LIMIT,
+    SERVICE_GET_TELEMETRY,
+    SERVICE_INSTALL_FIRMWARE_FILE,
     SERVICE_LIST_CLAIMS,
     SERVICE_LIST_OVERRIDES,
     SERVICE_MAKE_CLAIM,
@@ -40,7 +59,13 @@ from .const import (
     SERVICE_SET_LIMIT,
     SERVICE_SET_OVERRIDE,
 )
+from .firmware import async_get_firmware_url, async_upload_firmware_file
 from .logger import OpenEVSELoggerAdapter
+from .update import (
+    async_track_update_progress,
+    async_wait_until_healthy,
+    update_available,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,21 +75,115 @@ _LOGGER = logging.getLogger(__name__)
 # device name context [device_name] is prepended to all logged statements.
 
 
+CAPABILITY_CHARGE_CONTROL = "charge_control"
+CAPABILITY_FIRMWARE_UPDATE = "firmware_update"
+
+# Minimum firmware version per optional capability
+CAPABILITY_VERSIONS = {
+    CAPABILITY_CHARGE_CONTROL: "4.1.0",
+    CAPABILITY_FIRMWARE_UPDATE: "4.1.7",
+}
+
+
+@dataclass(frozen=True)
+class ServiceTarget:
+    """Charger a service call acts on."""
+
+    config_id: str
+    manager: OpenEVSE
+    logger: OpenEVSELoggerAdapter
+    capabilities: frozenset[str]
+
+
+class OpenEVSEDeviceIndex:
+    """Resolve device IDs to chargers without repeated registry lookups."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._targets: dict[str, ServiceTarget] = {}
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+        )
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        """Drop devices that were renamed, reassigned or removed."""
+        self._targets.pop(event.data["device_id"], None)
+
+    @callback
+    def async_invalidate_entry(self, config_id: str) -> None:
+        """Drop the devices of a config entry.
+
+        Done when the entry is loaded or unloaded and when the firmware of
+        its charger may have changed.
+        """
+        self._targets = {
+            device_id: target
+            for device_id, target in self._targets.items()
+            if target.config_id != config_id
+        }
+
+    @callback
+    def async_get(self, device_id: str) -> ServiceTarget:
+        """Return the charger for a device ID.
+
+        Raises ValueError for unknown devices and KeyError if the charger's
+        config entry is not loaded.
+        """
+        if (target := self._targets.get(device_id)) is not None:
+            return target
+
+        device_entry = dr.async_get(self.hass).async_get(device_id)
+        if not device_entry:
+            raise ValueError(f"Device ID {device_id} is not valid")
+        if not device_entry.connections:
+            raise ValueError(f"Device ID {device_id} has no connections")
+
+        config_id = next(iter(device_entry.connections))[1]
+        entry_data = self.hass.data[DOMAIN][config_id]
+        manager = entry_data[MANAGER]
+        target = ServiceTarget(
+            config_id=config_id,
+            manager=manager,
+            logger=OpenEVSELoggerAdapter(_LOGGER, {"device_name": device_entry.name}),
+            capabilities=frozenset(
+                capability
+                for capability, version in CAPABILITY_VERSIONS.items()
+                if entry_data[COORDINATOR].version_check(version)
+            ),
+        )
+        # Capabilities are only known once the charger reported its firmware
+        if manager.wifi_firmware:
+            self._targets[device_id] = target
+        return target
+
+
+@callback
+def async_get_device_index(hass: HomeAssistant) -> OpenEVSEDeviceIndex:
+    """Return the shared device index, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DEVICE_INDEX not in domain_data:
+        domain_data[DEVICE_INDEX] = OpenEVSEDeviceIndex(hass)
+    return domain_data[DEVICE_INDEX]
+
+
+@callback
+def async_invalidate_device_index(hass: HomeAssistant, config_id: str) -> None:
+    """Drop cached devices of a config entry if the index exists."""
+    if (index := hass.data.get(DOMAIN, {}).get(DEVICE_INDEX)) is not None:
+        index.async_invalidate_entry(config_id)
+
+
 class OpenEVSEServices:
     """Class that holds our services."""
 
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        config: ConfigEntry,
-    ) -> None:
+    def __init__(self, hass: HomeAssistant) -> None:
         """Initialize with hass object."""
         self.hass = hass
-        self._config = config
 
-        self.logger = OpenEVSELoggerAdapter(
-            _LOGGER, {"device_name": config.data.get(CONF_NAME, "OpenEVSE")}
-        )
+        self.logger = OpenEVSELoggerAdapter(_LOGGER, {"device_name": "OpenEVSE"})
+        self._devices = async_get_device_index(hass)
 
     @callback
     def async_register(self) -> None:
@@ -196,6 +315,57 @@ class OpenEVSEServices:
             supports_response=SupportsResponse.ONLY,
         )
 
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_FLEET_UPDATE,
+            self._fleet_update,
+            schema=vol.Schema(
+                {
+                    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+                    vol.Optional(
+                        ATTR_CONCURRENCY, default=DEFAULT_FLEET_CONCURRENCY
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(ATTR_MAX_FAILURES): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_INSTALL_FIRMWARE_FILE,
+            self._install_firmware_file,
+            schema=vol.Schema(
+                {
+                    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+                    vol.Required(ATTR_PATH): cv.string,
+                    vol.Optional(
+                        ATTR_CONCURRENCY, default=DEFAULT_FLEET_CONCURRENCY
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(ATTR_MAX_FAILURES): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_TELEMETRY,
+            self._get_telemetry,
+            schema=vol.Schema(
+                {
+                    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+                    vol.Optional(ATTR_START): cv.datetime,
+                    vol.Optional(ATTR_END): cv.datetime,
+                }
+            ),
+            supports_response=SupportsResponse.ONLY,
+        )
+
     def _get_logger(self, device_id: str | None = None) -> OpenEVSELoggerAdapter:
         """Get a contextual logger for a specific device ID."""
         if device_id is not None:
@@ -207,263 +377,443 @@ class OpenEVSEServices:
                 )
         return self.logger
 
-    def _resolve_device_config(self, device_id: str) -> str:
-        """Resolve a device ID to a configuration ID."""
-        dev_reg = dr.async_get(self.hass)
-        device_entry = dev_reg.async_get(device_id)
-        logger = self._get_logger(device_id)
-        logger.debug("Device_entry: %s", device_entry)
-
-        if not device_entry:
-            raise ValueError(f"Device ID {device_id} is not valid")
-
-        if not device_entry.connections:
-            raise ValueError(f"Device ID {device_id} has no connections")
+    def _get_targets(self, device_ids: list[str]) -> dict[str, ServiceTarget]:
+        """Return the chargers of the devices, checking them all before any acts.
 
-        config_id = next(iter(device_entry.connections))[1]
-        return config_id
+        Devices without a loaded configuration are logged and skipped, while
+        an unsupported firmware rejects the whole call.
+        """
+        targets: dict[str, ServiceTarget] = {}
+        for device_id in device_ids:
+            try:
+                targets[device_id] = self._devices.async_get(device_id)
+            except KeyError as err:
+                self._get_logger(device_id).error(
+                    "Error locating configuration: %s", err
+                )
+        if unsupported := [
+            device_id
+            for device_id, target in targets.items()
+            if CAPABILITY_CHARGE_CONTROL not in target.capabilities
+        ]:
+            raise HomeAssistantError(
+                f"Firmware of device {', '.join(unsupported)} does not support this "
+                f"action, version {CAPABILITY_VERSIONS[CAPABILITY_CHARGE_CONTROL]} "
+                "or newer is required"
+            )
+        return targets
 
     # Setup services
     async def _set_override(self, service: ServiceCall) -> None:
         """Set the override."""
         data = service.data
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
+            state = data.get(ATTR_STATE)
+            charge_current = data.get(ATTR_CHARGE_CURRENT)
+            max_current = data.get(ATTR_MAX_CURRENT)
+            energy_limit = data.get(ATTR_ENERGY_LIMIT)
+            time_limit = data.get(ATTR_TIME_LIMIT)
+            auto_release = data.get(ATTR_AUTO_RELEASE)
 
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s", config_id)
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                state = data.get(ATTR_STATE)
-                charge_current = data.get(ATTR_CHARGE_CURRENT)
-                max_current = data.get(ATTR_MAX_CURRENT)
-                energy_limit = data.get(ATTR_ENERGY_LIMIT)
-                time_limit = data.get(ATTR_TIME_LIMIT)
-                auto_release = data.get(ATTR_AUTO_RELEASE)
-
-                try:
-                    response = await manager.set_override(
-                        state=state,
-                        charge_current=charge_current,
-                        max_current=max_current,
-                        energy_limit=energy_limit,
-                        time_limit=time_limit,
-                        auto_release=auto_release,
-                    )
-                    logger.debug("Set Override response: %s", response)
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                response = await manager.set_override(
+                    state=state,
+                    charge_current=charge_current,
+                    max_current=max_current,
+                    energy_limit=energy_limit,
+                    time_limit=time_limit,
+                    auto_release=auto_release,
+                )
+                logger.debug("Set Override response: %s", response)
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
 
     async def _clear_override(self, service: ServiceCall) -> None:
         """Clear the manual override."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
-
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    await manager.clear_override()
-                    logger.debug("Override clear command sent.")
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-                except RuntimeError as err:
-                    if "Failed to release manual override" in str(err):
-                        logger.debug("No active override to clear.")
-                    else:
-                        raise HomeAssistantError(
-                            f"Error communicating with device: {err}"
-                        ) from err
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                await manager.clear_override()
+                logger.debug("Override clear command sent.")
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
+            except RuntimeError as err:
+                if "Failed to release manual override" in str(err):
+                    logger.debug("No active override to clear.")
+                else:
+                    raise HomeAssistantError(
+                        f"Error communicating with device: {err}"
+                    ) from err
 
     async def _set_limit(self, service: ServiceCall) -> None:
         """Set the limit."""
         data = service.data
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
+            limit_type = data[ATTR_TYPE]
+            value = data[ATTR_VALUE]
+
+            if ATTR_AUTO_RELEASE in data:
+                auto_release = data[ATTR_AUTO_RELEASE]
+            else:
+                auto_release = None
 
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s", config_id)
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                limit_type = data[ATTR_TYPE]
-                value = data[ATTR_VALUE]
-
-                if ATTR_AUTO_RELEASE in data:
-                    auto_release = data[ATTR_AUTO_RELEASE]
-                else:
-                    auto_release = None
-
-                try:
-                    response = await manager.set_limit(
-                        limit_type=limit_type,
-                        value=value,
-                        release=auto_release,
-                    )
-                    logger.debug("Set Limit response: %s", response)
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                response = await manager.set_limit(
+                    limit_type=limit_type,
+                    value=value,
+                    release=auto_release,
+                )
+                logger.debug("Set Limit response: %s", response)
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
 
     async def _clear_limit(self, service: ServiceCall) -> None:
         """Clear the limit."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
-
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    await manager.clear_limit()
-                    logger.debug("Limit clear command sent.")
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                await manager.clear_limit()
+                logger.debug("Limit clear command sent.")
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
 
     async def _get_limit(self, service: ServiceCall) -> ServiceResponse:
         """Get the limit."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
-
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    response = await manager.get_limit()
-                    logger.debug("Get limit response %s.", response)
-                    return response
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-                    return {}
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                response = await manager.get_limit()
+                logger.debug("Get limit response %s.", response)
+                return response
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
                 return {}
+        return {}
 
     async def _make_claim(self, service: ServiceCall) -> None:
         """Make a claim."""
         data = service.data
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
+            state = data.get(ATTR_STATE)
+            charge_current = data.get(ATTR_CHARGE_CURRENT)
+            max_current = data.get(ATTR_MAX_CURRENT)
+            auto_release = data.get(ATTR_AUTO_RELEASE)
 
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s", config_id)
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                state = data.get(ATTR_STATE)
-                charge_current = data.get(ATTR_CHARGE_CURRENT)
-                max_current = data.get(ATTR_MAX_CURRENT)
-                auto_release = data.get(ATTR_AUTO_RELEASE)
-
-                try:
-                    response = await manager.make_claim(
-                        state=state,
-                        charge_current=charge_current,
-                        max_current=max_current,
-                        auto_release=auto_release,
-                    )
-                    logger.debug("Make claim response: %s", response)
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                response = await manager.make_claim(
+                    state=state,
+                    charge_current=charge_current,
+                    max_current=max_current,
+                    auto_release=auto_release,
+                )
+                logger.debug("Make claim response: %s", response)
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
 
     async def _release_claim(self, service: ServiceCall) -> None:
         """Release a claim."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
-
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    await manager.release_claim()
-                    logger.debug("Release claim command sent.")
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                await manager.release_claim()
+                logger.debug("Release claim command sent.")
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
 
     async def _list_claims(self, service: ServiceCall) -> ServiceResponse:
         """Get the claims."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
-
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    response = await manager.list_claims()
-                    logger.debug("List claims response %s.", response)
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-                    return {}
-                claims = {}
-                for x, claim in enumerate(response):
-                    claims[x] = claim
-                logger.debug("Processed response %s.", claims)
-                return claims
-            except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
+                response = await manager.list_claims()
+                logger.debug("List claims response %s.", response)
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
                 return {}
+            claims = {}
+            for x, claim in enumerate(response):
+                claims[x] = claim
+            logger.debug("Processed response %s.", claims)
+            return claims
+        return {}
 
     async def _list_overrides(self, service: ServiceCall) -> ServiceResponse:
         """Get the overrides."""
         data = service.data
         self.logger.debug("Data: %s", data)
-        for device in data[ATTR_DEVICE_ID]:
-            device_id = device
-            logger = self._get_logger(device_id)
-            logger.debug("Device ID: %s", device_id)
+        for device_id, target in self._get_targets(data[ATTR_DEVICE_ID]).items():
+            logger = target.logger
+            logger.debug("Device ID: %s Config ID: %s", device_id, target.config_id)
+            manager = target.manager
+            try:
+                response = await manager.get_override()
+                logger.debug("List overrides response %s.", response)
+                return response
+            except CONNECTION_ERRORS as err:
+                logger.error(CONNECTION_ERROR, err)
+                return {}
+        return {}
+
+    async def _fleet_update(self, service: ServiceCall) -> ServiceResponse:
+        """Roll out the latest firmware to several chargers."""
+        data = service.data
+        self.logger.debug("Data: %s", data)
+        return await self._async_rollout(data, self._update_device_firmware)
+
+    async def _install_firmware_file(self, service: ServiceCall) -> ServiceResponse:
+        """Upload a local firmware file to several chargers."""
+        data = service.data
+        self.logger.debug("Data: %s", data)
+        path = data[ATTR_PATH]
+        if not self.hass.config.is_allowed_path(path):
+            raise HomeAssistantError(
+                f"Access to {path} is not allowed, add it to allowlist_external_dirs"
+            )
+
+        async def _upload(device_id: str) -> dict[str, Any]:
+            return await self._upload_device_firmware(device_id, path)
+
+        return await self._async_rollout(data, _upload)
 
-            config_id = self._resolve_device_config(device_id)
-            logger.debug("Config ID: %s Type: %s", config_id, type(config_id))
+    async def _get_telemetry(self, service: ServiceCall) -> ServiceResponse:
+        """Return the buffered telemetry of chargers for a time range."""
+        data = service.data
+        self.logger.debug("Data: %s", data)
+        start = data.get(ATTR_START)
+        end = data.get(ATTR_END)
+        response: dict[str, Any] = {}
+        for device_id in data[ATTR_DEVICE_ID]:
             try:
-                manager = self.hass.data[DOMAIN][config_id][MANAGER]
-                try:
-                    response = await manager.get_override()
-                    logger.debug("List overrides response %s.", response)
-                    return response
-                except CONNECTION_ERRORS as err:
-                    logger.error(CONNECTION_ERROR, err)
-                    return {}
+                target = self._devices.async_get(device_id)
+            except ValueError as err:
+                raise HomeAssistantError(
+                    f"Device {device_id} is not an OpenEVSE charger: {err}"
+                ) from err
             except KeyError as err:
-                logger.error("Error locating configuration: %s", err)
-                return {}
+                self._get_logger(device_id).error(
+                    "Error locating configuration: %s", err
+                )
+                continue
+            coordinator = self.hass.data[DOMAIN][target.config_id][COORDINATOR]
+            if coordinator.telemetry is None:
+                raise HomeAssistantError(
+                    f"Telemetry is not enabled for device {device_id}"
+                )
+            response[device_id] = {
+                "fields": ["timestamp", *coordinator.telemetry.fields],
+                "samples": coordinator.telemetry.samples(
+                    dt_util.as_utc(start).timestamp() if start else None,
+                    dt_util.as_utc(end).timestamp() if end else None,
+                ),
+            }
+        return response
+
+    async def _async_rollout(
+        self,
+        data: dict[str, Any],
+        worker: Callable[[str], Awaitable[dict[str, Any]]],
+    ) -> ServiceResponse:
+        """Run a firmware worker over several chargers with a concurrency cap."""
+        max_failures = data.get(ATTR_MAX_FAILURES)
+        semaphore = asyncio.Semaphore(data[ATTR_CONCURRENCY])
+        results: dict[str, dict[str, Any]] = {}
+        # A charger listed twice must not be updated twice at the same time
+        device_ids = list(dict.fromkeys(data[ATTR_DEVICE_ID]))
+
+        async def _run(device_id: str) -> None:
+            async with semaphore:
+                failures = sum(
+                    1 for result in results.values() if result["status"] == "failed"
+                )
+                if max_failures is not None and failures >= max_failures:
+                    results[device_id] = {
+                        "status": "skipped",
+                        "error": "Rollout halted after too many failures",
+                    }
+                    return
+                results[device_id] = await worker(device_id)
+
+        await asyncio.gather(*(_run(device) for device in device_ids))
+
+        devices = {device: results[device] for device in device_ids}
+        statuses = [result["status"] for result in devices.values()]
+        response = {
+            "updated": statuses.count("updated"),
+            "failed": statuses.count("failed"),
+            "skipped": statuses.count("skipped"),
+            "devices": devices,
+        }
+        self.logger.debug("Rollout response: %s", response)
+        return response
+
+    async def _update_device_firmware(self, device_id: str) -> dict[str, Any]:
+        """Update a single charger and health-check it after the reboot."""
+        try:
+            target = self._devices.async_get(device_id)
+            config_id = target.config_id
+            coordinator = self.hass.data[DOMAIN][config_id][COORDINATOR]
+            fw_coordinator = self.hass.data[DOMAIN][config_id][FW_COORDINATOR]
+        except (ValueError, KeyError) as err:
+            self._get_logger(device_id).error("Error locating configuration: %s", err)
+            return {"status": "failed", "error": str(err)}
+        manager = target.manager
+        logger = target.logger
+
+        fw_data = fw_coordinator.data or {}
+        latest = fw_data.get("latest_version")
+        result: dict[str, Any] = {
+            "from_version": manager.wifi_firmware,
+            "to_version": latest,
+        }
+
+        if not update_available(manager.wifi_firmware, latest):
+            logger.debug("Firmware is up to date, skipping.")
+            return {**result, "status": "skipped", "error": None}
+
+        if CAPABILITY_FIRMWARE_UPDATE not in target.capabilities:
+            return {
+                **result,
+                "status": "failed",
+                "error": "Firmware update not supported by this charger",
+            }
+
+        firmware_url = fw_data.get("browser_download_url")
+        if not firmware_url:
+            return {
+                **result,
+                "status": "failed",
+                "error": "No firmware download URL available to install",
+            }
+
+        config_entry = self.hass.config_entries.async_get_entry(config_id)
+        if config_entry is not None:
+            firmware_url = await async_get_firmware_url(
+                self.hass, config_entry, firmware_url, logger
+            )
+
+        uptime = getattr(manager, "uptime", None)
+        logger.info("Updating firmware from %s to %s", manager.wifi_firmware, latest)
+        try:
+            await manager.update_firmware(firmware_url=firmware_url)
+        except UnsupportedFeature:
+            return {
+                **result,
+                "status": "failed",
+                "error": "Firmware update not supported by this charger",
+            }
+        except Exception as err:
+            logger.error("Failed to install firmware update: %s", err)
+            return {**result, "status": "failed", "error": str(err)}
+
+        await async_track_update_progress(manager, coordinator, logger)
+
+        if not await async_wait_until_healthy(
+            manager, coordinator, FLEET_HEALTH_CHECK_TIMEOUT, logger, uptime
+        ):
+            return {
+                **result,
+                "status": "failed",
+                "error": "Charger did not come back after the update",
+            }
+
+        if update_available(manager.wifi_firmware, latest):
+            return {
+                **result,
+                "status": "failed",
+                "error": f"Charger reports version {manager.wifi_firmware} "
+                "after the update",
+            }
+
+        logger.info("Firmware update to %s complete", latest)
+        return {**result, "status": "updated", "error": None}
+
+    async def _upload_device_firmware(
+        self, device_id: str, path: str
+    ) -> dict[str, Any]:
+        """Upload a firmware file to a single charger and wait for the reboot."""
+        try:
+            target = self._devices.async_get(device_id)
+            coordinator = self.hass.data[DOMAIN][target.config_id][COORDINATOR]
+        except (ValueError, KeyError) as err:
+            self._get_logger(device_id).error("Error locating configuration: %s", err)
+            return {"status": "failed", "error": str(err)}
+        manager = target.manager
+        logger = target.logger
+
+        result: dict[str, Any] = {"from_version": manager.wifi_firmware}
+        if manager.ota_update or coordinator.upload_progress is not None:
+            return {
+                **result,
+                "to_version": None,
+                "status": "failed",
+                "error": "Update installation already in progress",
+            }
+
+        @callback
+        def _async_progress(sent: int, total: int) -> None:
+            percentage = sent * 100 // total
+            if percentage != coordinator.upload_progress:
+                coordinator.upload_progress = percentage
+                coordinator.async_update_listeners()
+
+        uptime = getattr(manager, "uptime", None)
+        logger.info("Uploading firmware file %s", path)
+        coordinator.upload_progress = 0
+        coordinator.async_update_listeners()
+        try:
+            await async_upload_firmware_file(
+                self.hass, manager, path, _async_progress, logger
+            )
+        except Exception as err:
+            logger.error("Failed to upload firmware file: %s", err)
+            return {**result, "to_version": None, "status": "failed", "error": str(err)}
+        finally:
+            coordinator.upload_progress = None
+            coordinator.async_update_listeners()
+
+        if not await async_wait_until_healthy(
+            manager, coordinator, FLEET_HEALTH_CHECK_TIMEOUT, logger, uptime
+        ):
+            return {
+                **result,
+                "to_version": None,
+                "status": "failed",
+                "error": "Charger did not come back after the update",
+            }
+
+        logger.info("Firmware upload complete, now running %s", manager.wifi_firmware)
+        return {
+            **result,
+            "to_version": manager.wifi_firmware,
+            "status": "updated",
+            "error": None,
+        }
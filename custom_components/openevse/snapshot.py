@@ -0,0 +1,94 @@
+"""Last known charger state kept across restarts."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+STORAGE_VERSION = 1
+
+
+def _encode(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the snapshot as JSON, listing the keys holding datetimes."""
+    return {
+        "values": data,
+        "datetimes": [
+            key for key, value in data.items() if isinstance(value, datetime)
+        ],
+    }
+
+
+def _decode(stored: dict[str, Any]) -> dict[str, Any]:
+    """Return the snapshot with its datetimes parsed back."""
+    data = dict(stored.get("values", {}))
+    for key in stored.get("datetimes", []):
+        if isinstance(data.get(key), str):
+            data[key] = dt_util.parse_datetime(data[key])
+    return data
+
+
+class OpenEVSESnapshotStore:
+    """Last good coordinator snapshot and device identity of a charger.
+
+    Setup starts from it instead of waiting for the charger, which is then
+    refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        coordinator: DataUpdateCoordinator,
+    ) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+        self._coordinator = coordinator
+        self._save_scheduled = False
+        # Model, firmware version and serial shown in the device registry
+        self.device: dict[str, str] = {}
+        # Whether the firmware met each minimum version checked so far, for
+        # version gated entities and services until the charger answers
+        self.capabilities: dict[str, bool] = {}
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the snapshot, None if none was saved yet."""
+        stored = await self._store.async_load()
+        if not stored or not stored.get("data"):
+            return None
+        self.device = dict(stored.get("device", {}))
+        self.capabilities = dict(stored.get("capabilities", {}))
+        return _decode(stored["data"])
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the latest snapshot, at most once per save delay."""
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        self._save_scheduled = False
+        return {
+            "data": _encode(self._coordinator.data or {}),
+            "device": self.device,
+            "capabilities": self.capabilities,
+        }
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored snapshot of a charger."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}").async_remove()
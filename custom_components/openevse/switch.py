@@ -101,8 +101,9 @@ class OpenEVSESwitch(CoordinatorEntity, OpenEVSEEntity, SwitchEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        manager = self.hass.data[DOMAIN][self._unique_id][MANAGER]
-        return not (self._min_version and not manager.version_check(self._min_version))
+        return not (
+            self._min_version and not self.coordinator.version_check(self._min_version)
+        )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
@@ -0,0 +1,148 @@
+"""High rate charger telemetry kept outside of the recorder."""
+
+from __future__ import annotations
+
+import math
+import mmap
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+# magic, version, number of fields, capacity, samples appended
+_HEADER = struct.Struct("<4sHHIQ")
+_MAGIC = b"OETL"
+_VERSION = 1
+
+
+class TelemetryBuffer:
+    """Fixed size ring buffer of timestamped snapshot fields.
+
+    Every sample takes ``8 * (len(fields) + 1)`` bytes, so the memory used
+    is bounded by the capacity. With a path the buffer is memory-mapped to
+    that file and survives restarts.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        fields: Sequence[str],
+        path: Path | None = None,
+    ) -> None:
+        """Initialize, opening or creating the backing file if given.
+
+        Does blocking I/O when a path is given.
+        """
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.path = path
+        self._record = struct.Struct(f"<{len(self.fields) + 1}d")
+        size = _HEADER.size + self._record.size * capacity
+        self._file = None
+        if path is None:
+            self._buffer: bytearray | mmap.mmap = bytearray(size)
+            self._count = 0
+        else:
+            self._buffer, self._count = self._open_file(path, size)
+        self._write_header()
+
+    def _open_file(self, path: Path, size: int) -> tuple[mmap.mmap, int]:
+        """Map the file, keeping its samples if it has the same layout."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a+b")  # noqa: SIM115
+        count = 0
+        self._file.seek(0)
+        header = self._file.read(_HEADER.size)
+        if len(header) == _HEADER.size:
+            magic, version, fields, capacity, count = _HEADER.unpack(header)
+            if (magic, version, fields, capacity) != (
+                _MAGIC,
+                _VERSION,
+                len(self.fields),
+                self.capacity,
+            ):
+                count = 0
+        self._file.truncate(size)
+        return mmap.mmap(self._file.fileno(), size), count
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self._count, self.capacity)
+
+    def append(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Append the fields of a snapshot."""
+        values = []
+        for field in self.fields:
+            try:
+                values.append(float(data[field]))
+            except (KeyError, TypeError, ValueError):
+                values.append(math.nan)
+        self._record.pack_into(
+            self._buffer,
+            self._offset(self._count % self.capacity),
+            timestamp,
+            *values,
+        )
+        self._count += 1
+        self._write_header()
+
+    def samples(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[list[float | None]]:
+        """Return the samples with a timestamp between start and end."""
+        first = 0 if start is None else self._bisect(start)
+        last = len(self) if end is None else self._bisect(end, right=True)
+        return [
+            [None if math.isnan(value) else value for value in self._get(index)]
+            for index in range(first, last)
+        ]
+
+    def close(self) -> None:
+        """Flush and close the backing file.
+
+        Does blocking I/O when the buffer is memory-mapped.
+        """
+        if self._file is None:
+            return
+        self._buffer.flush()
+        self._buffer.close()
+        self._file.close()
+        self._file = None
+
+    def _write_header(self) -> None:
+        """Write the layout and number of samples appended."""
+        _HEADER.pack_into(
+            self._buffer,
+            0,
+            _MAGIC,
+            _VERSION,
+            len(self.fields),
+            self.capacity,
+            self._count,
+        )
+
+    def _offset(self, slot: int) -> int:
+        """Return the byte offset of a slot."""
+        return _HEADER.size + slot * self._record.size
+
+    def _get(self, index: int) -> tuple[float, ...]:
+        """Return a sample by age, 0 being the oldest held."""
+        slot = (self._count - len(self) + index) % self.capacity
+        return self._record.unpack_from(self._buffer, self._offset(slot))
+
+    def _timestamp(self, index: int) -> float:
+        """Return the timestamp of a sample by age."""
+        slot = (self._count - len(self) + index) % self.capacity
+        return struct.unpack_from("<d", self._buffer, self._offset(slot))[0]
+
+    def _bisect(self, timestamp: float, right: bool = False) -> int:
+        """Return the index of the first sample after the timestamp."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            value = self._timestamp(middle)
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
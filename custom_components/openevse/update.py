@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import time
 from asyncio import sleep as async_sleep
 from typing import Any
 
@@ -12,7 +15,7 @@ from homeassistant.components.update import (
     UpdateEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
@@ -20,8 +23,19 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 from openevsehttp.__main__ import OpenEVSE
+from openevsehttp.websocket import STATE_CONNECTED
 
-from .const import CONF_NAME, COORDINATOR, DOMAIN, FW_COORDINATOR, MANAGER
+from .const import (
+    CONF_NAME,
+    COORDINATOR,
+    DOMAIN,
+    FW_COORDINATOR,
+    MANAGER,
+    OTA_FALLBACK_POLL_INTERVAL,
+    OTA_PROGRESS_TIMEOUT,
+)
+from .firmware import async_get_firmware_url
+from .scheduler import async_get_scheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +78,7 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
         self._base_unique_id = config.entry_id
         self._attr_unique_id = f"{self._base_unique_id}.update"
         self._manager = manager
+        self._progress_task: asyncio.Task | None = None
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
@@ -72,6 +87,12 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
             self.coordinator.async_add_listener(self.async_write_ha_state)
         )
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop tracking update progress."""
+        if self._progress_task is not None and not self._progress_task.done():
+            self._progress_task.cancel()
+        await super().async_will_remove_from_hass()
+
     @property
     def device_info(self) -> dict:
         """Return a port description for device registry."""
@@ -95,11 +116,7 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
         """Latest version available for install."""
         if self.fw_coordinator.data is not None:
             new_version = self.fw_coordinator.data.get("latest_version")
-            if (
-                new_version is not None
-                and self.installed_version is not None
-                and not new_version.startswith(self.installed_version)
-            ):
+            if update_available(self.installed_version, new_version):
                 return new_version
         return self.installed_version
 
@@ -117,11 +134,13 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
     @property
     def in_progress(self) -> bool:
         """Update installation progress."""
-        return self._manager.ota_update
+        return self.coordinator.upload_progress is not None or self._manager.ota_update
 
     @property
     def update_percentage(self) -> int | None:
         """Update installation progress percentage."""
+        if self.coordinator.upload_progress is not None:
+            return self.coordinator.upload_progress
         return self._manager.ota_progress
 
     async def async_install(
@@ -136,6 +155,9 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
         if not firmware_url:
             raise HomeAssistantError("No firmware download URL available to install")
 
+        firmware_url = await async_get_firmware_url(
+            self.hass, self.config, firmware_url
+        )
         try:
             await self._manager.update_firmware(firmware_url=firmware_url)
         except Exception as err:
@@ -143,24 +165,153 @@ class OpenEVSEUpdateEntity(CoordinatorEntity, UpdateEntity):
                 f"Failed to install firmware update: {err}"
             ) from err
 
-        self.hass.async_create_background_task(
-            self._async_poll_update_progress(),
-            "openevse_update_progress_polling",
+        self._async_start_progress_tracking()
+
+    @callback
+    def _async_start_progress_tracking(self) -> None:
+        """Start tracking update progress unless already tracking."""
+        if self._progress_task is not None and not self._progress_task.done():
+            return
+        self._progress_task = self.hass.async_create_background_task(
+            self._async_track_update_progress(),
+            "openevse_update_progress_tracking",
         )
 
-    async def _async_poll_update_progress(self) -> None:
-        """Poll the status endpoint to track update progress."""
-        _LOGGER.debug("Starting update progress polling")
-        for _ in range(150):
-            await async_sleep(2)
+    async def _async_track_update_progress(self) -> None:
+        """Track update progress and refresh the entity when done."""
+        await async_track_update_progress(self._manager, self.coordinator)
+        self.async_write_ha_state()
+
+
+def update_available(installed: str | None, latest: str | None) -> bool:
+    """Return True if the latest version differs from the installed one."""
+    return (
+        latest is not None
+        and installed is not None
+        and not latest.startswith(installed)
+    )
+
+
+async def async_track_update_progress(
+    manager: OpenEVSE,
+    coordinator: DataUpdateCoordinator,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+) -> bool:
+    """Track update progress from websocket pushes.
+
+    The charger pushes ``ota_update``/``ota_progress`` over the websocket,
+    so the status endpoint is only polled, through the integration
+    scheduler, while the socket is down.
+    Tracking ends once the update finishes or the device has rebooted. The
+    flag is still clear right after the update was requested, so it only
+    counts as finished once it was seen set.
+
+    Returns False if the update was still running when tracking timed out.
+    """
+    logger.debug("Starting update progress tracking")
+    finished = asyncio.Event()
+    start_uptime = getattr(manager, "uptime", None)
+    started = bool(manager.ota_update)
+    rebooted = False
+
+    @callback
+    def _async_check_progress() -> None:
+        """Check the latest snapshot for the end of the update."""
+        nonlocal rebooted, started
+        if manager.ota_update:
+            started = True
+        elif started:
+            finished.set()
+            return
+        uptime = getattr(manager, "uptime", None)
+        if start_uptime is not None and uptime is not None and uptime < start_uptime:
+            rebooted = True
+            finished.set()
+
+    scheduler = async_get_scheduler(coordinator.hass)
+    unsub_poll: CALLBACK_TYPE | None = None
+    tracking = True
+
+    async def _async_poll() -> None:
+        """Read the status while the websocket is down."""
+        nonlocal unsub_poll
+        unsub_poll = None
+        if finished.is_set() or not tracking:
+            return
+        if manager.ws_state != STATE_CONNECTED:
             try:
-                await self._manager.update(force_status=True)
-                await self.coordinator.websocket_update()
-                if not self._manager.ota_update:
-                    _LOGGER.debug("Update complete, stopping progress polling")
-                    break
+                await manager.update(force_status=True)
+                await coordinator.async_process_status()
             except Exception as err:
-                _LOGGER.debug(
+                logger.debug(
                     "Error polling update progress (expected during reboot): %s",
                     err,
                 )
+        if tracking and not finished.is_set():
+            _async_schedule_poll()
+
+    @callback
+    def _async_schedule_poll() -> None:
+        """Queue the next status read on the integration scheduler."""
+        nonlocal unsub_poll
+        unsub_poll = scheduler.async_schedule(
+            OTA_FALLBACK_POLL_INTERVAL,
+            _async_poll,
+            f"{coordinator.name} - update progress",
+            coordinator.config_entry,
+        )
+
+    remove_listener = coordinator.async_add_listener(_async_check_progress)
+    _async_schedule_poll()
+    try:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(finished.wait(), OTA_PROGRESS_TIMEOUT)
+
+        if rebooted:
+            # The OTA flag is not re-sent after a reboot, refresh it once
+            logger.debug("Device rebooted, refreshing update status")
+            try:
+                await manager.update(force_status=True)
+                await coordinator.async_process_status()
+            except Exception as err:
+                logger.debug("Error refreshing status after reboot: %s", err)
+    finally:
+        tracking = False
+        remove_listener()
+        if unsub_poll is not None:
+            unsub_poll()
+
+    if not finished.is_set():
+        logger.debug("Timed out waiting for update to complete")
+        return False
+
+    logger.debug("Update complete, stopping progress tracking")
+    return True
+
+
+async def async_wait_until_healthy(
+    manager: OpenEVSE,
+    coordinator: DataUpdateCoordinator,
+    timeout: float,
+    logger: logging.Logger | logging.LoggerAdapter = _LOGGER,
+    uptime: int | None = None,
+) -> bool:
+    """Wait for the charger to answer status requests after an update.
+
+    If ``uptime`` is given the charger must also have rebooted since then.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await manager.update(force_status=True)
+            await coordinator.async_process_status()
+        except Exception as err:
+            logger.debug("Health check failed (device may be rebooting): %s", err)
+        else:
+            current = getattr(manager, "uptime", None)
+            rebooted = uptime is None or current is None or current < uptime
+            if not manager.ota_update and rebooted:
+                return True
+        if time.monotonic() >= deadline:
+            return False
+        await async_sleep(OTA_FALLBACK_POLL_INTERVAL)
@@ -94,6 +94,9 @@ DIAG_DEVICE_RESULTS = {
     "charge_time_elapsed": 246,
     "charging_current": 32200,
     "charging_power": 7728000,
+    "charging_session_start": datetime.datetime(
+        2026, 1, 9, 11, 55, 54, tzinfo=datetime.UTC
+    ),
     "charging_voltage": 240,
     "current_capacity": 40,
     "current_power": 0,
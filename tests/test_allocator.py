@@ -0,0 +1,116 @@
+"""Test OpenEVSE site current allocation."""
+
+from unittest.mock import AsyncMock, call
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.openevse.allocator import SiteCharger, allocate_current
+from custom_components.openevse.const import COORDINATOR, DOMAIN, MANAGER
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+GRID_ENTITY = "sensor.site_meter"
+
+
+async def test_allocate_current():
+    """Test the available current is shared between connected chargers."""
+    chargers = [
+        SiteCharger("idle", True, 0, 6, 32),
+        SiteCharger("charging", True, 10, 6, 16),
+        SiteCharger("unplugged", False, 0, 6, 32),
+    ]
+
+    assert allocate_current(chargers, 8) == {"idle": 0, "charging": 8, "unplugged": 0}
+    assert allocate_current(chargers, 20) == {
+        "idle": 10,
+        "charging": 10,
+        "unplugged": 0,
+    }
+    assert allocate_current(chargers, 60) == {
+        "idle": 32,
+        "charging": 16,
+        "unplugged": 0,
+    }
+    assert allocate_current(chargers, -5) == {"idle": 0, "charging": 0, "unplugged": 0}
+
+    # The charger reports milliamps
+    charger = SiteCharger.from_data(
+        "charging", {"vehicle": 1, "charging_current": 9500}
+    )
+    assert charger.current == 9.5
+
+
+async def test_site_allocation(hass, test_charger, mock_ws_start):
+    """Test chargers on one grid meter get their current set together."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={**CONFIG_DATA, "name": name},
+            options={"grid": GRID_ENTITY, "site_allocation": True},
+            version=2,
+        )
+        for name in ("garage", "driveway")
+    ]
+    hass.states.async_set(GRID_ENTITY, "0", attributes={"unit_of_measurement": "W"})
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    managers = []
+    coordinators = []
+    for entry in entries:
+        manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+        manager.make_claim = AsyncMock()
+        manager.release_claim = AsyncMock()
+        manager.self_production = AsyncMock()
+        managers.append(manager)
+        coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+        coordinator.data.update(
+            vehicle=True,
+            charging_current=0,
+            charging_voltage=240,
+            min_amps=6,
+            max_amps=32,
+        )
+        coordinators.append(coordinator)
+
+    async def grid_reading(watts):
+        hass.states.async_set(
+            GRID_ENTITY, str(watts), attributes={"unit_of_measurement": "W"}
+        )
+        await hass.async_block_till_done()
+
+    # 12 A of export is shared by both cars
+    await grid_reading(-2880)
+    for manager in managers:
+        manager.make_claim.assert_awaited_once_with(state="active", charge_current=6)
+
+    # Nothing changed, so no claims are sent
+    await grid_reading(-2881)
+    for manager in managers:
+        assert manager.make_claim.await_count == 1
+        manager.self_production.assert_not_awaited()
+
+    for coordinator in coordinators:
+        coordinator.data["charging_current"] = 6000
+    await grid_reading(-1440)
+    for manager in managers:
+        assert manager.make_claim.await_args == call(state="active", charge_current=9)
+
+    # Importing 12 A leaves room for one car
+    for coordinator in coordinators:
+        coordinator.data["charging_current"] = 9000
+    await grid_reading(2880)
+    assert managers[0].make_claim.await_args == call(state="active", charge_current=6)
+    assert managers[1].make_claim.await_args == call(state="disabled")
+
+    # The claim is released when the charger leaves the site
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    managers[0].release_claim.assert_awaited_once()
+    managers[1].release_claim.assert_not_awaited()
@@ -1,5 +1,6 @@
 """Test config flow."""
 
+import asyncio
 from ipaddress import ip_address
 from unittest.mock import ANY, AsyncMock, patch
 
@@ -11,6 +12,7 @@ from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 from openevsehttp.exceptions import AuthenticationError
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.openevse.config_flow import OpenEVSE, async_probe_charger
 from custom_components.openevse.const import DOMAIN
 from tests.const import CONFIG_DATA
 
@@ -29,7 +31,7 @@ pytestmark = pytest.mark.asyncio
                 "username": "",
                 "password": "",
             },
-            "user",
+            "manual",
             "OpenEVSE Charger",
             {
                 "name": "OpenEVSE Charger",
@@ -49,7 +51,7 @@ pytestmark = pytest.mark.asyncio
                 "ssl": True,
                 "verify_ssl": False,
             },
-            "user",
+            "manual",
             "OpenEVSE Charger SSL",
             {
                 "name": "OpenEVSE Charger SSL",
@@ -76,6 +78,10 @@ async def test_form_user(
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["type"] == FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == step_id
 
@@ -109,7 +115,7 @@ async def test_form_user(
                 "username": "",
                 "password": "",
             },
-            "user",
+            "manual",
             "openevse",
             {
                 "name": "openevse",
@@ -132,6 +138,10 @@ async def test_form_user_connection_error(
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["type"] == FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == step_id
 
@@ -301,8 +311,10 @@ async def test_zeroconf_discovery(hass, mock_ws_start, mock_aioclient):
             "custom_components.openevse.async_setup_entry",
             return_value=True,
         ),
-        patch("custom_components.openevse.OpenEVSE.update", return_value=True),
-        patch("custom_components.openevse.OpenEVSE.ws_disconnect", return_value=True),
+        patch(
+            "custom_components.openevse.OpenEVSE.process_request",
+            return_value={"wifi_serial": "1234", "version": "v5.1.2"},
+        ),
     ):
         # Trigger the zeroconf step
         result = await hass.config_entries.flow.async_init(
@@ -361,13 +373,10 @@ async def test_zeroconf_connection_error(hass):
         type="_openevse._tcp.local.",
     )
 
-    # Mock update to raise an exception (simulating connection failure)
-    with (
-        patch(
-            "custom_components.openevse.OpenEVSE.update",
-            side_effect=Exception("Connection failed"),
-        ),
-        patch("custom_components.openevse.OpenEVSE.ws_disconnect", return_value=True),
+    # Mock the probe to raise an exception (simulating connection failure)
+    with patch(
+        "custom_components.openevse.OpenEVSE.process_request",
+        side_effect=Exception("Connection failed"),
     ):
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -431,10 +440,7 @@ async def test_zeroconf_already_configured_unique_id(hass):
         type="_openevse._tcp.local.",
     )
 
-    with (
-        patch("custom_components.openevse.OpenEVSE.update", return_value=True),
-        patch("custom_components.openevse.OpenEVSE.ws_disconnect", return_value=True),
-    ):
+    with patch("custom_components.openevse.OpenEVSE.process_request") as mock_request:
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
             context={"source": config_entries.SOURCE_ZEROCONF},
@@ -444,11 +450,171 @@ async def test_zeroconf_already_configured_unique_id(hass):
         # Should abort because unique_id matches, but it updates the config entry
         assert result["type"] == FlowResultType.ABORT
         assert result["reason"] == "already_configured"
+        # Configured chargers are not probed again
+        mock_request.assert_not_called()
 
         # Verify the entry IP was updated to the new discovery IP
         assert entry.data["host"] == "192.168.1.123"
 
 
+async def test_form_bulk(hass, tmp_path):
+    """Test several chargers are validated and added in one pass."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "chargers.txt").write_text("192.168.1.13\n# spare\n192.168.1.10\n")
+    MockConfigEntry(
+        domain=DOMAIN, data={**CONFIG_DATA, "host": "192.168.1.11"}, version=2
+    ).add_to_hass(hass)
+    probed = []
+
+    async def mock_update(charger, force_status=False):
+        probed.append(charger.url)
+        if "192.168.1.12" in charger.url:
+            raise TimeoutError
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "bulk"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "bulk"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"hosts": "", "hosts_file": "../chargers.txt"}
+    )
+    assert result["errors"] == {"hosts_file": "invalid_hosts_file"}
+
+    with (
+        patch(
+            "custom_components.openevse.async_setup_entry",
+            return_value=True,
+        ),
+        patch.object(OpenEVSE, "update", autospec=True, side_effect=mock_update),
+        patch("custom_components.openevse.OpenEVSE.ws_disconnect", return_value=True),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "hosts": "192.168.1.10 Garage\n192.168.1.11, 192.168.1.12",
+                "hosts_file": "chargers.txt",
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "bulk_import_complete"
+    assert result["description_placeholders"] == {
+        "created": "2",
+        "failed": "- 192.168.1.11: already configured\n"
+        "- 192.168.1.12: unable to connect",
+    }
+    assert len(probed) == 3
+    entries = {
+        entry.data["host"]: entry.title
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    assert entries["192.168.1.10"] == "Garage"
+    assert entries["192.168.1.13"] == "OpenEVSE 192.168.1.13"
+
+
+async def test_form_bulk_no_chargers(hass):
+    """Test the bulk step reports when no charger could be added."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "bulk"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"hosts": ""}
+    )
+    assert result["errors"] == {"hosts": "no_hosts"}
+
+    with patch(
+        "custom_components.openevse.OpenEVSE.update",
+        side_effect=AuthenticationError,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"hosts": "192.168.1.20"}
+        )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "bulk_no_chargers"}
+    assert result["description_placeholders"] == {
+        "failed": "- 192.168.1.20: invalid credentials"
+    }
+
+
+async def test_form_bulk_invalid_hosts(hass):
+    """Test malformed hosts are reported before any charger is probed."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "bulk"}
+    )
+
+    with patch("custom_components.openevse.OpenEVSE.update") as update:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "hosts": "192.168.1.20\nopenevse.local:8080 Garage\n"
+                "http://192.168.1.21, -bad-.local\n192.168.1.22:99999",
+            },
+        )
+
+    update.assert_not_called()
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"hosts": "invalid_hosts"}
+    assert result["description_placeholders"]["invalid"] == (
+        "http://192.168.1.21, -bad-.local, 192.168.1.22:99999"
+    )
+
+
+async def test_zeroconf_probe_cache(hass):
+    """Test probes are shared per host and failures are not cached."""
+    release = asyncio.Event()
+
+    async def mock_process_request(url, method=""):
+        await release.wait()
+        return {"wifi_serial": "1234", "version": "v5.1.2"}
+
+    with patch(
+        "custom_components.openevse.OpenEVSE.process_request",
+        side_effect=mock_process_request,
+    ) as mock_request:
+        probes = [
+            hass.async_create_task(async_probe_charger(hass, "192.168.1.123"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*probes)
+        assert results == [{"serial": "1234", "firmware": "v5.1.2"}] * 3
+        assert mock_request.call_count == 1
+
+        # A later announcement reuses the result until it expires
+        await async_probe_charger(hass, "192.168.1.123")
+        assert mock_request.call_count == 1
+        with patch(
+            "custom_components.openevse.config_flow.time.monotonic",
+            return_value=asyncio.get_running_loop().time() + 10**6,
+        ):
+            await async_probe_charger(hass, "192.168.1.123")
+        assert mock_request.call_count == 2
+
+    with patch(
+        "custom_components.openevse.OpenEVSE.process_request",
+        side_effect=Exception("Connection failed"),
+    ) as mock_request:
+        for _ in range(2):
+            with pytest.raises(Exception, match="Connection failed"):
+                await async_probe_charger(hass, "192.168.1.50")
+            await hass.async_block_till_done()
+        assert mock_request.call_count == 2
+
+
 async def test_options_flow(hass, test_charger, mock_ws_start):
     """Test options flow for sensor configuration."""
     entry = MockConfigEntry(
@@ -487,6 +653,18 @@ async def test_options_flow(hass, test_charger, mock_ws_start):
         "home_battery_soc": "",
         "home_battery_power": "",
         "invert_grid": False,
+        "local_firmware": False,
+        "grid_deadband": 0,
+        "grid_deadband_percent": 0,
+        "solar_deadband": 0,
+        "solar_deadband_percent": 0,
+        "shaper_deadband": 0,
+        "shaper_deadband_percent": 0,
+        "max_push_interval": 60,
+        "telemetry_samples": 0,
+        "telemetry_file": False,
+        "site_allocation": False,
+        "site_max_import": 0,
     }
 
     await hass.async_block_till_done()
@@ -582,6 +760,18 @@ async def test_options_flow_all_empty_entities(hass, test_charger, mock_ws_start
         "home_battery_soc": "",
         "home_battery_power": "",
         "invert_grid": False,
+        "local_firmware": False,
+        "grid_deadband": 0,
+        "grid_deadband_percent": 0,
+        "solar_deadband": 0,
+        "solar_deadband_percent": 0,
+        "shaper_deadband": 0,
+        "shaper_deadband_percent": 0,
+        "max_push_interval": 60,
+        "telemetry_samples": 0,
+        "telemetry_file": False,
+        "site_allocation": False,
+        "site_max_import": 0,
     }
 
     await hass.async_block_till_done()
@@ -641,8 +831,12 @@ async def test_form_user_invalid_auth(hass):
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["type"] == FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
     assert result["type"] == FlowResultType.FORM
-    assert result["step_id"] == "user"
+    assert result["step_id"] == "manual"
 
     with patch(
         "custom_components.openevse.OpenEVSE.update",
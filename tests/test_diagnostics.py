@@ -28,6 +28,7 @@ async def test_config_entry_diagnostics(hass, test_charger, mock_ws_start):
     assert result["config"]["data"][CONF_HOST] == "openevse.test.tld"
     assert result["config"]["data"][CONF_PASSWORD] == "**REDACTED**"
     assert result["config"]["data"][CONF_USERNAME] == "testuser"
+    assert result["scheduler"]["max_concurrent"] == 8
 
 
 @pytest.mark.asyncio
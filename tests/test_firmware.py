@@ -0,0 +1,253 @@
+"""Test OpenEVSE local firmware mirror."""
+
+import asyncio
+import hashlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.components.update import DOMAIN as UPDATE_DOMAIN
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.openevse.const import (
+    ATTR_DEVICE_ID,
+    ATTR_PATH,
+    DOMAIN,
+    FIRMWARE_CACHE,
+    MANAGER,
+    SERVICE_INSTALL_FIRMWARE_FILE,
+)
+from custom_components.openevse.firmware import (
+    OpenEVSEFirmwareCache,
+    async_setup_firmware_cache,
+)
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+CHARGER_NAME = "openevse"
+FIRMWARE_URL = "https://github.com/OpenEVSE/ESP32_WiFi_V4.x/releases/download/4.1.7/openevse_wifi_v1.bin"
+FIRMWARE_IMAGE = b"\xe9" + b"\x00" * 4096
+INTERNAL_URL = "http://192.168.1.10:8123"
+
+
+async def _setup_entry(hass, tmp_path, options=None):
+    """Set up an entry with its firmware cache in a temporary directory."""
+    hass.config.config_dir = str(tmp_path)
+    hass.config.internal_url = INTERNAL_URL
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+        options=options or {},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_install_from_local_mirror(
+    hass, test_charger, mock_ws_start, mock_aioclient, hass_client_no_auth, tmp_path
+):
+    """Test firmware is downloaded once and served to the charger locally."""
+    mock_aioclient.get(FIRMWARE_URL, content=FIRMWARE_IMAGE)
+    entry = await _setup_entry(hass, tmp_path, {"local_firmware": True})
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.update_firmware = AsyncMock()
+
+    digest = hashlib.sha256(FIRMWARE_IMAGE).hexdigest()
+    local_url = f"{INTERNAL_URL}/api/openevse/firmware/{digest}.bin"
+
+    for _ in range(2):
+        await hass.services.async_call(
+            UPDATE_DOMAIN,
+            "install",
+            {"entity_id": "update.openevse_update"},
+            blocking=True,
+        )
+        manager.update_firmware.assert_called_with(firmware_url=local_url)
+
+    downloads = [
+        call for call in mock_aioclient.mock_calls if str(call[1]) == FIRMWARE_URL
+    ]
+    assert len(downloads) == 1
+
+    client = await hass_client_no_auth()
+    resp = await client.get(f"/api/openevse/firmware/{digest}.bin")
+    assert resp.status == 200
+    assert await resp.read() == FIRMWARE_IMAGE
+
+    resp = await client.get(f"/api/openevse/firmware/{'0' * 64}.bin")
+    assert resp.status == 404
+
+    # A second entry serving firmware locally shares the mirror
+    cache = hass.data[DOMAIN][FIRMWARE_CACHE]
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        title="other",
+        data=CONFIG_DATA,
+        options={"local_firmware": True},
+        version=2,
+    )
+    other.add_to_hass(hass)
+    async_setup_firmware_cache(hass, other)
+    assert hass.data[DOMAIN][FIRMWARE_CACHE] is cache
+
+
+async def test_install_invalid_image_falls_back(
+    hass, test_charger, mock_ws_start, mock_aioclient, tmp_path
+):
+    """Test an invalid image is not cached and the GitHub URL is used."""
+    mock_aioclient.get(FIRMWARE_URL, content=b"<html>not firmware</html>")
+    entry = await _setup_entry(hass, tmp_path, {"local_firmware": True})
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.update_firmware = AsyncMock()
+
+    await hass.services.async_call(
+        UPDATE_DOMAIN,
+        "install",
+        {"entity_id": "update.openevse_update"},
+        blocking=True,
+    )
+
+    manager.update_firmware.assert_called_once_with(firmware_url=FIRMWARE_URL)
+    assert not list((tmp_path / ".storage" / "openevse_firmware").iterdir())
+
+
+async def test_cache_eviction(
+    hass, test_charger, mock_ws_start, mock_aioclient, tmp_path
+):
+    """Test the oldest images are evicted above the size cap."""
+    await _setup_entry(hass, tmp_path)
+    other_url = FIRMWARE_URL.replace("4.1.7", "4.1.8")
+    other_image = FIRMWARE_IMAGE + b"\x01"
+    mock_aioclient.get(FIRMWARE_URL, content=FIRMWARE_IMAGE)
+    mock_aioclient.get(other_url, content=other_image)
+
+    cache = OpenEVSEFirmwareCache(hass, max_size=len(other_image))
+    first = await cache.async_get_digest(FIRMWARE_URL)
+    second = await cache.async_get_digest(other_url)
+
+    assert cache.path_for(first) is None
+    assert cache.path_for(second).read_bytes() == other_image
+    assert not (cache.path / f"{first}.bin").exists()
+    # The mirror is only set up once an entry serves firmware locally
+    assert FIRMWARE_CACHE not in hass.data[DOMAIN]
+
+
+async def test_cache_concurrent_download(
+    hass, test_charger, mock_ws_start, mock_aioclient, tmp_path
+):
+    """Test concurrent requests for an image download it once."""
+    await _setup_entry(hass, tmp_path)
+    mock_aioclient.get(FIRMWARE_URL, content=FIRMWARE_IMAGE)
+
+    cache = OpenEVSEFirmwareCache(hass)
+    first, second = await asyncio.gather(
+        cache.async_get_digest(FIRMWARE_URL), cache.async_get_digest(FIRMWARE_URL)
+    )
+
+    assert first == second == hashlib.sha256(FIRMWARE_IMAGE).hexdigest()
+    # The lock of a URL is dropped once nobody waits for it
+    assert not cache._url_locks
+
+
+class MockStreamWriter:
+    """Collect bytes written by a request payload."""
+
+    def __init__(self, hass):
+        """Initialize."""
+        self.hass = hass
+        self.data = b""
+        self.progress = []
+
+    async def write(self, chunk):
+        """Record a chunk and the update entity progress at that point."""
+        self.data += bytes(chunk)
+        state = self.hass.states.get("update.openevse_update")
+        self.progress.append(state.attributes["update_percentage"])
+
+
+async def test_install_firmware_file(
+    hass, test_charger, mock_ws_start, tmp_path, entity_registry: er.EntityRegistry
+):
+    """Test a local firmware file is streamed to the charger."""
+    image = b"\xe9" + bytes(range(256)) * 1024
+    firmware = tmp_path / "openevse_wifi_v1.bin"
+    firmware.write_bytes(image)
+    entry = await _setup_entry(hass, tmp_path)
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+
+    device_id = entity_registry.async_get("update.openevse_update").device_id
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager._status["uptime"] = 500
+    original_process_request = manager.process_request
+    writer = MockStreamWriter(hass)
+
+    async def mock_process_request(url, method="", data=None, rapi=None):
+        if url.endswith("/update"):
+            await rapi.write(writer)
+            return {"msg": "done"}
+        if "status" in url and method == "get":
+            return {"ota_update": 0, "uptime": 5}
+        return await original_process_request(url, method, data, rapi)
+
+    manager.process_request = mock_process_request
+
+    with patch("custom_components.openevse.update.async_sleep"):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INSTALL_FIRMWARE_FILE,
+            {ATTR_DEVICE_ID: device_id, ATTR_PATH: str(firmware)},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response["updated"] == 1
+    assert response["devices"][device_id]["status"] == "updated"
+    assert image in writer.data
+    assert 'name="file"; filename="openevse_wifi_v1.bin"' in writer.data.decode(
+        errors="replace"
+    )
+    assert writer.progress == sorted(writer.progress)
+    assert writer.progress[-1] == 100
+    state = hass.states.get("update.openevse_update")
+    assert state.attributes["in_progress"] is False
+
+
+async def test_install_firmware_file_invalid(
+    hass, test_charger, mock_ws_start, tmp_path, entity_registry: er.EntityRegistry
+):
+    """Test files outside the allowlist or that are not images are rejected."""
+    firmware = tmp_path / "notes.txt"
+    firmware.write_bytes(b"not firmware")
+    await _setup_entry(hass, tmp_path)
+    device_id = entity_registry.async_get("update.openevse_update").device_id
+
+    with pytest.raises(HomeAssistantError, match="not allowed"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INSTALL_FIRMWARE_FILE,
+            {ATTR_DEVICE_ID: device_id, ATTR_PATH: str(firmware)},
+            blocking=True,
+            return_response=True,
+        )
+
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INSTALL_FIRMWARE_FILE,
+        {ATTR_DEVICE_ID: device_id, ATTR_PATH: str(firmware)},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["devices"][device_id] == {
+        "from_version": "v5.1.2",
+        "to_version": None,
+        "status": "failed",
+        "error": f"{firmware} is not an ESP firmware image",
+    }
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import time
 from unittest import mock
 from unittest.mock import AsyncMock, patch
 
@@ -13,7 +14,8 @@ from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import CoreState
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from openevsehttp.exceptions import (
     AuthenticationError,
@@ -27,6 +29,9 @@ from custom_components.openevse import (
     InvalidValueError,
     OpenEVSE,
     OpenEVSEFirmwareCheck,
+    OpenEVSEUpdateCoordinator,
+    async_assign_poll_slots,
+    build_state_handlers,
     get_firmware,
     send_command,
 )
@@ -35,6 +40,7 @@ from custom_components.openevse.entity import (
     OpenEVSENumberEntityDescription,
     OpenEVSESensorEntityDescription,
 )
+from custom_components.openevse.reconnect import async_get_reconnect_limiter
 
 from .const import (
     CONFIG_DATA,
@@ -64,7 +70,7 @@ async def test_setup_entry(hass, test_charger, mock_ws_start):
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -85,7 +91,7 @@ async def test_setup_entry_bad_serial(hass, test_charger_bad_serial, mock_ws_sta
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -108,7 +114,7 @@ async def test_setup_and_unload_entry(
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
@@ -137,7 +143,7 @@ async def test_setup_entry_state_change(hass, test_charger, mock_ws_start, caplo
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 25
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -181,6 +187,82 @@ async def test_setup_entry_state_change_unit_conversion(
     assert "Sending sensor data to OpenEVSE: (grid: -200)" in caplog.text
 
 
+async def test_setup_entry_state_change_unit_cache(
+    hass, test_charger, mock_ws_start, caplog
+):
+    """Test unit factors are cached and bad units are reported once."""
+    grid_entity = "sensor.grid_usage"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA_GRID,
+        options=OPTIONS_DATA_GRID,
+        version=2,
+    )
+    hass.states.async_set(grid_entity, "0", attributes={"unit_of_measurement": "A"})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    message = "Unit A of sensor.grid_usage can not be converted to W"
+    assert caplog.text.count(message) == 1
+
+    hass.states.async_set(grid_entity, "5", attributes={"unit_of_measurement": "A"})
+    await hass.async_block_till_done()
+    assert caplog.text.count(message) == 1
+    assert "Sending sensor data to OpenEVSE: (grid: 5)" in caplog.text
+
+    with patch(
+        "custom_components.openevse.linked_sensors.PowerConverter.convert",
+        return_value=1000.0,
+    ) as convert:
+        for value in ("1.5", "2"):
+            hass.states.async_set(
+                grid_entity, value, attributes={"unit_of_measurement": "kW"}
+            )
+            await hass.async_block_till_done()
+
+    convert.assert_called_once()
+    assert "Sending sensor data to OpenEVSE: (grid: 2000)" in caplog.text
+
+
+async def test_setup_entry_state_change_deadband(hass, test_charger, mock_ws_start):
+    """Test grid changes within the deadband are only sent once stale."""
+    grid_entity = "sensor.grid_usage"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA_GRID,
+        options={
+            **OPTIONS_DATA_GRID,
+            "grid_deadband": 50,
+            "grid_deadband_percent": 10,
+            "max_push_interval": 60,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.self_production = AsyncMock()
+
+    now = 1000.0
+    with patch(
+        "custom_components.openevse.linked_sensors.time.monotonic",
+        side_effect=lambda: now,
+    ):
+        for value in ("1000", "1030", "1090", "1200", "1210", "unknown", "40"):
+            hass.states.async_set(grid_entity, value)
+            await hass.async_block_till_done()
+        now += 60
+        hass.states.async_set(grid_entity, "45")
+        await hass.async_block_till_done()
+
+    sent = [call.kwargs["grid"] for call in manager.self_production.call_args_list]
+    assert sent == [1000, 1200, None, 40, 45]
+
+
 async def test_setup_entry_state_change_timeout(
     hass, test_charger_bad_post, mock_ws_start, caplog
 ):
@@ -200,7 +282,7 @@ async def test_setup_entry_state_change_timeout(
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 25
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -232,7 +314,7 @@ async def test_setup_entry_state_change_2(hass, test_charger, mock_ws_start, cap
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 25
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 26
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -269,7 +351,7 @@ async def test_setup_entry_state_change_2_bad_post(
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 25
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 26
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
@@ -335,15 +417,15 @@ async def test_setup_entry_v2(hass, test_charger_v2, mock_ws_start):
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 4
-    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
     assert len(hass.states.async_entity_ids(SWITCH_DOMAIN)) == 4
     assert len(hass.states.async_entity_ids(SELECT_DOMAIN)) == 2
     entries = hass.config_entries.async_entries(DOMAIN)
     assert len(entries) == 1
 
 
-async def test_setup_entry_old_firmware(hass, test_charger, mock_ws_start, caplog):
-    """Test setup with older firmware where services are not registered."""
+async def test_setup_entry_old_firmware(hass, test_charger, mock_ws_start):
+    """Test services reject chargers with older firmware."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         title=CHARGER_NAME,
@@ -353,21 +435,45 @@ async def test_setup_entry_old_firmware(hass, test_charger, mock_ws_start, caplo
 
     # Patch version_check to return False (simulating firmware < 4.1.0)
     # The integration uses the 'manager' object which is an instance of OpenEVSE
-    with (
-        patch("custom_components.openevse.OpenEVSE.version_check", return_value=False),
-        caplog.at_level(logging.DEBUG),
-    ):
+    with patch("custom_components.openevse.OpenEVSE.version_check", return_value=False):
         entry.add_to_hass(hass)
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
 
-        # Verify that a service specific to > 4.1.0 is NOT registered
-        # 'set_override' is one of the services registered in services.py
-        assert not hass.services.has_service(DOMAIN, "set_override")
-        assert (
-            "Skipping service registration: firmware version does not meet "
-            "minimum requirement (4.1.0)" in caplog.text
+        # Services are registered for the domain, gating happens per device
+        assert hass.services.has_service(DOMAIN, "set_override")
+        device_id = (
+            er.async_get(hass).async_get("sensor.openevse_station_status").device_id
         )
+        with pytest.raises(HomeAssistantError, match=r"version 4\.1\.0 or newer"):
+            await hass.services.async_call(
+                DOMAIN,
+                "set_override",
+                {"device_id": device_id, "state": "active"},
+                blocking=True,
+            )
+
+
+async def test_services_registered_once(hass, test_charger, mock_ws_start):
+    """Test services are registered once and survive unloading an entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    service = hass.services.async_services_for_domain(DOMAIN)["set_override"]
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.services.async_services_for_domain(DOMAIN)["set_override"] is service
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.services.has_service(DOMAIN, "set_override")
 
 
 async def test_setup_entry_state_change_unavailable(
@@ -423,7 +529,11 @@ async def test_coordinator_websocket_reconnect(hass, test_charger, mock_ws_start
         await hass.async_block_till_done()
         assert not mock_ws_connect.called
 
-        # 2. _ws_listening is False -> SHOULD reconnect
+        # 2. _ws_listening is False -> SHOULD reconnect, once the websocket
+        # was seen connected since the attempt made at setup
+        coordinator._manager.websocket.state = "connected"
+        await coordinator.async_refresh()
+        coordinator._manager.websocket.state = "disconnected"
         coordinator._manager._ws_listening = False
         await coordinator.async_refresh()
         await hass.async_block_till_done()
@@ -496,12 +606,21 @@ async def test_coordinator_websocket_connect_errors(hass, test_charger, mock_ws_
         mock_ws.state = "disconnected"
 
         # 1. RuntimeError during ws_start() should be swallowed
+        reconnects = async_get_reconnect_limiter(hass)
+        reconnects.async_reset(entry.entry_id)
         with patch.object(
             coordinator._manager, "ws_start", side_effect=RuntimeError("Ignored")
-        ):
+        ) as ws_start:
+            await coordinator._async_update_data()
+        ws_start.assert_called_once()
+
+        # A failed attempt is not retried on the next poll
+        with patch.object(coordinator._manager, "ws_start") as ws_start:
             await coordinator._async_update_data()
+        ws_start.assert_not_called()
 
         # 2. Generic Exception during ws_start() should raise UpdateFailed
+        reconnects.async_reset(entry.entry_id)
         with (
             patch.object(
                 coordinator._manager, "ws_start", side_effect=Exception("Critical")
@@ -637,6 +756,8 @@ async def test_coordinator_parse_errors(hass, test_charger, mock_ws_start, caplo
 
     caplog.clear()
     # 4. Test exceptions in parse_sensors for binary sensors, numbers, etc.
+    # The OTA update entity is disabled by default, read it as if enabled
+    coordinator.async_add_consumer("ota_update")
     with (
         patch(
             "custom_components.openevse.OpenEVSE.ota_update",
@@ -699,7 +820,7 @@ async def test_setup_entry_when_ha_running(hass, test_charger, mock_ws_start):
     )
 
     with patch(
-        "custom_components.openevse.async_track_state_change_event"
+        "custom_components.openevse.linked_sensors.async_track_state_change_event"
     ) as mock_track:
         entry.add_to_hass(hass)
         await hass.config_entries.async_setup(entry.entry_id)
@@ -838,7 +959,7 @@ async def test_setup_entry_ha_not_running(hass, test_charger, mock_ws_start):
     )
 
     with patch(
-        "custom_components.openevse.async_track_state_change_event"
+        "custom_components.openevse.linked_sensors.async_track_state_change_event"
     ) as mock_track:
         entry.add_to_hass(hass)
         await hass.config_entries.async_setup(entry.entry_id)
@@ -1371,3 +1492,166 @@ async def test_async_update_cooldown(hass, test_charger, mock_ws_start):
     finally:
         manager._status = orig_status
         manager._config = orig_config
+
+
+async def test_build_state_handlers():
+    """Test linked sensor options are resolved into a dispatch table."""
+    handlers = build_state_handlers(
+        {
+            "grid": "sensor.grid",
+            "solar": "sensor.grid",
+            "invert_grid": True,
+            "voltage": "sensor.voltage",
+            "vehicle_soc": "sensor.vehicle",
+            "vehicle_range": "sensor.vehicle",
+            "shaper": "",
+        }
+    )
+
+    assert list(handlers) == ["sensor.grid", "sensor.voltage", "sensor.vehicle"]
+    (grid,) = handlers["sensor.grid"]
+    assert grid.method == "self_production"
+    assert grid.kwargs == {"solar": None, "invert": True}
+    assert [linked.argument for linked in handlers["sensor.vehicle"]] == [
+        "battery_level",
+        "battery_range",
+    ]
+    assert build_state_handlers({}) == {}
+
+
+async def test_fetch_plan_skips_disabled_entities(
+    hass, test_charger, mock_ws_start, entity_registry: er.EntityRegistry
+):
+    """Test keys only read by disabled entities are no longer fetched."""
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    # The first refresh reads everything, the entities were not known yet
+    assert "rtc_temperature" in coordinator.data
+
+    await coordinator.async_refresh()
+    assert "rtc_temperature" not in coordinator.data
+    assert "ambient_temperature" in coordinator.data
+    # Fields the integration reads itself are kept without an entity
+    assert "vehicle" in coordinator.data
+
+    # Disabling an entity drops its key
+    entity_registry.async_update_entity(
+        "sensor.openevse_ambient_temperature",
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert "ambient_temperature" not in coordinator.data
+
+    # An entity reading the key brings it back
+    release = coordinator.async_add_consumer("rtc_temperature")
+    await coordinator.async_refresh()
+    assert "rtc_temperature" in coordinator.data
+    release()
+    await coordinator.async_refresh()
+    assert "rtc_temperature" not in coordinator.data
+
+
+async def test_poll_schedule_staggered(hass):
+    """Test chargers poll in evenly spread slots of the interval."""
+    entries = [
+        MockConfigEntry(domain=DOMAIN, entry_id=entry_id, data=CONFIG_DATA)
+        for entry_id in ("c", "a", "b")
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+    coordinators = {
+        entry.entry_id: OpenEVSEUpdateCoordinator(hass, 60, entry, mock.MagicMock())
+        for entry in entries
+    }
+    for entry_id, coordinator in coordinators.items():
+        hass.data.setdefault(DOMAIN, {})[entry_id] = {COORDINATOR: coordinator}
+    async_assign_poll_slots(hass)
+
+    with patch("custom_components.openevse.random.uniform", return_value=0):
+        # Slots at 0, 20 and 40 seconds of each minute, in entry order
+        assert coordinators["a"]._poll_delay(1000.0) == 80
+        assert coordinators["b"]._poll_delay(1000.0) == 40
+        assert coordinators["c"]._poll_delay(1000.0) == 60
+        # The slot is kept whenever the refresh is scheduled
+        assert coordinators["b"]._poll_delay(1040.5) == 59.5
+        assert coordinators["b"]._poll_delay(1069.0) == 31
+        assert coordinators["b"]._poll_delay(1071.0) == 89
+
+    with patch("custom_components.openevse.random.uniform", return_value=3):
+        assert coordinators["b"]._poll_delay(1000.0) == 43
+
+    # Slots are handed out again when a charger unloads
+    hass.data[DOMAIN].pop("a")
+    async_assign_poll_slots(hass)
+    assert coordinators["b"].poll_slot == (0, 2)
+    assert coordinators["c"].poll_slot == (1, 2)
+
+
+async def test_websocket_watchdog(hass, test_charger, mock_ws_start):
+    """Test a silent websocket is reconnected and the status read again."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    assert coordinator.ws_frame_age is None
+
+    # The first check starts the grace period of a new connection
+    await coordinator._async_watchdog()
+    assert coordinator.ws_frame_age is not None
+    assert not coordinator.ws_stale
+
+    # The grace period is no gap between frames
+    coordinator._ws_connected_at = time.monotonic() - 14
+    await coordinator.websocket_update()
+    assert coordinator.ws_frame_age < 1
+    assert not coordinator._frame_gaps
+
+    # Status read over HTTP is no websocket frame
+    coordinator._last_frame = time.monotonic() - 50
+    await coordinator.async_process_status()
+    assert coordinator.ws_frame_age >= 50
+
+    # The check is only armed once a few frames were seen, and then follows
+    # their rate
+    coordinator._last_frame = time.monotonic() - 1000
+    assert not coordinator.ws_stale
+    for gap in (100, 100, 100):
+        coordinator._last_frame = time.monotonic() - gap
+        await coordinator.websocket_update()
+    assert coordinator.ws_stale_after == pytest.approx(300, abs=1)
+    coordinator._last_frame = time.monotonic() - 200
+    assert not coordinator.ws_stale
+    # Only the diagnostics show it, entity states are not rewritten for it
+    state = hass.states.get("sensor.openevse_station_status")
+    assert "ws_frame_age" not in state.attributes
+
+    async def _disconnect():
+        manager.websocket = None
+
+    mock_ws_start.reset_mock()
+    coordinator._last_frame = time.monotonic() - 1000
+    assert coordinator.ws_stale
+    with (
+        patch.object(manager, "ws_disconnect", side_effect=_disconnect) as disconnect,
+        patch.object(manager, "update", wraps=manager.update) as update,
+    ):
+        await coordinator._async_watchdog()
+
+    disconnect.assert_awaited_once()
+    update.assert_awaited_once()
+    mock_ws_start.assert_called_once()
+    # The new connection gets its grace period on the next check
+    assert coordinator.ws_frame_age is None
+    assert not coordinator.ws_stale
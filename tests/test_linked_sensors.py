@@ -0,0 +1,75 @@
+"""Test OpenEVSE linked sensors."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.helpers.event import async_track_state_change_event
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.openevse.const import DOMAIN, MANAGER
+from custom_components.openevse.linked_sensors import LinkedSensorRegistry
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+GRID_ENTITY = "sensor.site_meter"
+
+
+async def test_shared_linked_sensor(hass, test_charger, mock_ws_start):
+    """Test chargers sharing a site meter subscribe and parse it once."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={**CONFIG_DATA, "name": name},
+            options={"grid": GRID_ENTITY, "voltage": GRID_ENTITY},
+            version=2,
+        )
+        for name in ("garage", "driveway")
+    ]
+    hass.states.async_set(GRID_ENTITY, "0", attributes={"unit_of_measurement": "W"})
+
+    with patch(
+        "custom_components.openevse.linked_sensors.async_track_state_change_event",
+        wraps=async_track_state_change_event,
+    ) as mock_track:
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+    assert mock_track.call_count == 1
+
+    managers = [hass.data[DOMAIN][entry.entry_id][MANAGER] for entry in entries]
+    for manager in managers:
+        manager.self_production = AsyncMock()
+        manager.grid_voltage = AsyncMock()
+
+    with patch.object(
+        LinkedSensorRegistry,
+        "parse",
+        autospec=True,
+        side_effect=LinkedSensorRegistry.parse,
+    ) as mock_parse:
+        hass.states.async_set(
+            GRID_ENTITY, "1.5", attributes={"unit_of_measurement": "kW"}
+        )
+        await hass.async_block_till_done()
+
+    mock_parse.assert_called_once()
+    for manager in managers:
+        manager.self_production.assert_awaited_once_with(
+            grid=1500, solar=None, invert=None
+        )
+        manager.grid_voltage.assert_awaited_once_with(voltage=2)
+
+    # The meter stays tracked until the last charger is unloaded
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    hass.states.async_set(GRID_ENTITY, "2", attributes={"unit_of_measurement": "kW"})
+    await hass.async_block_till_done()
+    assert managers[0].self_production.await_count == 1
+    assert managers[1].self_production.await_count == 2
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert not hass.bus.async_listeners().get("state_changed")
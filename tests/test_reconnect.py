@@ -0,0 +1,57 @@
+"""Test the OpenEVSE websocket reconnect limiter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.openevse.const import DOMAIN, RECONNECT_LIMITER
+from custom_components.openevse.reconnect import (
+    ReconnectLimiter,
+    async_get_reconnect_limiter,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_fleet_reconnects_ramp(hass):
+    """Test reconnects beyond the burst wait for the bucket to refill."""
+    now = hass.loop.time()
+    with patch.object(hass.loop, "time", return_value=now):
+        limiter = ReconnectLimiter(hass, rate=1, burst=2)
+        assert limiter.async_try_acquire("a")
+        assert limiter.async_try_acquire("b")
+        assert not limiter.async_try_acquire("c")
+
+    with patch.object(hass.loop, "time", return_value=now + 1):
+        assert limiter.async_try_acquire("c")
+        assert not limiter.async_try_acquire("d")
+
+
+async def test_charger_backoff(hass):
+    """Test a charger waits longer after each attempt until connected."""
+    now = hass.loop.time()
+    limiter = ReconnectLimiter(hass, rate=100, burst=100)
+
+    def _acquire(at):
+        with patch.object(hass.loop, "time", return_value=now + at):
+            return limiter.async_try_acquire("charger")
+
+    with patch("custom_components.openevse.reconnect.random.uniform") as uniform:
+        uniform.side_effect = lambda low, high: high
+        assert _acquire(0)
+        assert not _acquire(29)
+        assert _acquire(30)
+        # Doubled after the second attempt
+        assert not _acquire(89)
+        assert _acquire(90)
+        assert uniform.call_args.args == (60, 120)
+
+    limiter.async_reset("charger")
+    assert _acquire(91)
+
+
+async def test_limiter_shared(hass):
+    """Test all chargers share one limiter."""
+    limiter = async_get_reconnect_limiter(hass)
+    assert async_get_reconnect_limiter(hass) is limiter
+    assert hass.data[DOMAIN][RECONNECT_LIMITER] is limiter
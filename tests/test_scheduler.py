@@ -0,0 +1,153 @@
+"""Test the OpenEVSE scheduler."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.openevse.const import DOMAIN, SCHEDULER
+from custom_components.openevse.scheduler import (
+    OpenEVSEScheduler,
+    async_get_scheduler,
+)
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _advance(hass, seconds):
+    """Move the clock forward and let the due jobs run."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_jobs_run_in_due_order(hass):
+    """Test jobs run once each, earliest first, and can be cancelled."""
+    scheduler = OpenEVSEScheduler(hass)
+    ran = []
+
+    def _job(name):
+        async def _action():
+            ran.append(name)
+
+        return _action
+
+    scheduler.async_schedule(20, _job("late"), "late")
+    scheduler.async_schedule(10, _job("early"), "early")
+    cancel = scheduler.async_schedule(15, _job("cancelled"), "cancelled")
+    cancel()
+    assert scheduler.metrics["scheduled"] == 2
+
+    await _advance(hass, 11)
+    assert ran == ["early"]
+    await _advance(hass, 21)
+    assert ran == ["early", "late"]
+
+    metrics = scheduler.metrics
+    assert metrics["scheduled"] == 0
+    assert metrics["runs"] == 2
+    assert metrics["lateness_max"] >= 0
+    scheduler.async_shutdown()
+
+
+async def test_concurrency_limited(hass):
+    """Test due jobs wait for a free slot."""
+    scheduler = OpenEVSEScheduler(hass, max_concurrent=2)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def _action():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    for index in range(5):
+        scheduler.async_schedule(1, _action, f"job {index}")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    metrics = scheduler.metrics
+    assert metrics["running"] == 2
+    assert metrics["waiting"] == 3
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert peak == 2
+    assert scheduler.metrics["runs"] == 5
+    assert scheduler.metrics["waiting"] == 0
+    scheduler.async_shutdown()
+
+
+async def test_failing_job_logged(hass, caplog):
+    """Test a failing job does not stop the others."""
+    scheduler = OpenEVSEScheduler(hass)
+    ran = []
+
+    async def _fail():
+        raise RuntimeError("boom")
+
+    async def _action():
+        ran.append(True)
+
+    scheduler.async_schedule(1, _fail, "failing job")
+    scheduler.async_schedule(1, _action, "good job")
+    await _advance(hass, 2)
+
+    assert ran == [True]
+    assert "Error running failing job" in caplog.text
+    assert scheduler.metrics["running"] == 0
+    scheduler.async_shutdown()
+
+
+async def test_scheduler_shared(hass):
+    """Test all chargers share one scheduler."""
+    scheduler = async_get_scheduler(hass)
+    assert async_get_scheduler(hass) is scheduler
+    assert hass.data[DOMAIN][SCHEDULER] is scheduler
+
+
+async def test_cancelled_jobs_compacted(hass):
+    """Test rescheduled jobs do not pile up in the heap."""
+    scheduler = OpenEVSEScheduler(hass)
+    ran = []
+
+    async def _action():
+        ran.append(True)
+
+    cancel = scheduler.async_schedule(30, _action, "poll")
+    for _ in range(100):
+        cancel()
+        cancel = scheduler.async_schedule(30, _action, "poll")
+    assert len(scheduler._heap) <= 2
+    assert scheduler.metrics["scheduled"] == 1
+
+    await _advance(hass, 31)
+    assert ran == [True]
+    assert scheduler.metrics["scheduled"] == 0
+    scheduler.async_shutdown()
+
+
+async def test_scheduler_stopped_with_last_charger(hass, test_charger, mock_ws_start):
+    """Test the scheduler is stopped once the last charger unloads."""
+    entry = MockConfigEntry(domain=DOMAIN, title="openevse", data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    scheduler = hass.data[DOMAIN][SCHEDULER]
+    assert scheduler.metrics["scheduled"] > 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert SCHEDULER not in hass.data[DOMAIN]
+    assert scheduler.metrics["scheduled"] == 0
+    assert scheduler._timer is None
@@ -554,3 +554,29 @@ async def test_select_clear_override_other_runtime_error(
         await hass.services.async_call(
             SELECT_DOMAIN, SERVICE_SELECT_OPTION, servicedata, blocking=True
         )
+
+
+async def test_select_options_cached(hass, test_charger, mock_ws_start):
+    """Test charge rate options are only rebuilt when the amps range changes."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    select_desc = OpenEVSESelectEntityDescription(
+        key="max_current_soft",
+        name="Charge Rate",
+    )
+    entity = OpenEVSESelect(hass, entry, coordinator, select_desc, test_charger)
+
+    coordinator.data = {"min_amps": 6, "max_amps": 32}
+    options = entity.options
+    assert options == [str(amps) for amps in range(6, 33)]
+    assert entity.options is options
+    coordinator.data = {"min_amps": 6.0, "max_amps": "32"}
+    assert entity.options is options
+
+    coordinator.data = {"min_amps": 6, "max_amps": 16}
+    assert entity.options[-1] == "16"
+    assert entity.options is not options
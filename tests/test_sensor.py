@@ -2,7 +2,7 @@
 
 import contextlib
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
@@ -11,7 +11,10 @@ from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import UnitOfLength
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import dt as dt_util
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.openevse.const import DOMAIN
 from custom_components.openevse.sensor import OpenEVSESensor
@@ -43,7 +46,7 @@ async def test_sensors(
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
 
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -122,7 +125,7 @@ async def test_sensors_v2(
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
 
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -173,7 +176,7 @@ async def test_sensors_new(
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
 
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 23
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 24
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -482,3 +485,115 @@ async def test_sensor_coverage_gaps(hass, test_charger, mock_ws_start):
     entity = OpenEVSESensor(description_no_val_fn, "test_unique_id", coordinator, entry)
     coordinator.data = {"test_sensor_key": "some_value"}
     assert entity.native_value == "some_value"
+
+
+async def test_sensor_publish_throttle(hass, test_charger, mock_ws_start):
+    """Test small changes of high churn sensors are held back for an interval."""
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    entity_id = "sensor.openevse_charging_current"
+    now = dt_util.utcnow()
+
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1000):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 32000}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "32.0"
+
+    # A small change is held back, the coordinator keeps the new value
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1002):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 32300}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "32.0"
+    assert coordinator.data["charging_current"] == 32300
+    # Sensors that are not throttled are written at once
+    coordinator.async_set_updated_data({**coordinator.data, "usage_total": 64583})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.openevse_total_usage").state == "64583"
+
+    # A change above the threshold is written at once
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1004):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 16000}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "16.0"
+
+    # The last held back change is written once the interval is over
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1005):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 16200}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "16.0"
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1014):
+        async_fire_time_changed(hass, now + timedelta(seconds=10))
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "16.2"
+
+    # The publish settings can be changed per entity
+    er.async_get(hass).async_update_entity_options(
+        entity_id, DOMAIN, {"min_publish_interval": 60, "publish_threshold": 5000}
+    )
+    await hass.async_block_till_done()
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1050):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 20000}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "16.2"
+    er.async_get(hass).async_update_entity_options(
+        entity_id, DOMAIN, {"min_publish_interval": 0}
+    )
+    await hass.async_block_till_done()
+    with patch("custom_components.openevse.sensor.time.monotonic", return_value=1051):
+        coordinator.async_set_updated_data(
+            {**coordinator.data, "charging_current": 20100}
+        )
+        await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "20.1"
+
+
+async def test_charging_session_start(hass, test_charger, mock_ws_start, freezer):
+    """Test the session start is worked out once per charging session."""
+    freezer.move_to("2026-01-09 12:00:00+00:00")
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    entity_id = "sensor.openevse_charging_session_started"
+    assert hass.states.get(entity_id).state == "2026-01-09T11:55:54+00:00"
+
+    # The elapsed time stops while paused, the start does not move
+    freezer.tick(600)
+    assert coordinator._charging_session_start(300) == datetime(
+        2026, 1, 9, 11, 55, 54, tzinfo=dt_util.UTC
+    )
+    # A new session starts when the elapsed time goes back
+    assert coordinator._charging_session_start(10) == datetime(
+        2026, 1, 9, 12, 9, 50, tzinfo=dt_util.UTC
+    )
+    assert coordinator._charging_session_start(0) is None
+
+
+async def test_sensor_static_attributes_cached(hass, test_charger, mock_ws_start):
+    """Test the device info and manager of a sensor are resolved once."""
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity = hass.data["entity_components"]["sensor"].get_entity(
+        "sensor.openevse_charging_current"
+    )
+    assert entity.device_info is entity.device_info
+    assert entity._manager is hass.data[DOMAIN][entry.entry_id]["manager"]
@@ -3,7 +3,8 @@
 import asyncio
 import json
 import logging
-from unittest.mock import MagicMock, patch
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
 from homeassistant.exceptions import HomeAssistantError
@@ -14,17 +15,21 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.openevse.const import (
     ATTR_AUTO_RELEASE,
     ATTR_CHARGE_CURRENT,
+    ATTR_CONCURRENCY,
     ATTR_DEVICE_ID,
     ATTR_ENERGY_LIMIT,
     ATTR_MAX_CURRENT,
+    ATTR_MAX_FAILURES,
     ATTR_STATE,
     ATTR_TIME_LIMIT,
     ATTR_TYPE,
     ATTR_VALUE,
+    COORDINATOR,
     DOMAIN,
     MANAGER,
     SERVICE_CLEAR_LIMIT,
     SERVICE_CLEAR_OVERRIDE,
+    SERVICE_FLEET_UPDATE,
     SERVICE_GET_LIMIT,
     SERVICE_LIST_CLAIMS,
     SERVICE_LIST_OVERRIDES,
@@ -33,6 +38,7 @@ from custom_components.openevse.const import (
     SERVICE_SET_LIMIT,
     SERVICE_SET_OVERRIDE,
 )
+from custom_components.openevse.services import async_get_device_index
 
 from .const import CONFIG_DATA
 
@@ -965,3 +971,253 @@ async def test_services_connection_errors(
             assert "Error connecting to device" in caplog.text
             if return_response:
                 assert result == {}
+
+
+async def test_fleet_update(
+    hass,
+    test_charger,
+    mock_ws_start,
+    entity_registry: er.EntityRegistry,
+):
+    """Test the fleet update service updates and health-checks a charger."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entry_entity = entity_registry.async_get("sensor.openevse_station_status")
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    original_process_request = manager.process_request
+    manager._status["uptime"] = 5000
+    # The charger only reports the update a few status reads later, then reboots
+    statuses = [
+        {"ota_update": 0, "uptime": 5002},
+        {"ota_update": 0, "uptime": 5003},
+        {"ota_update": 1, "uptime": 5010},
+        {"ota_update": 0, "uptime": 5},
+    ]
+    rebooted = False
+
+    async def mock_process_request(url, method="", data=None, rapi=None):
+        nonlocal rebooted
+        if "status" in url and method == "get":
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            rebooted = status["uptime"] < 5000
+            return status
+        response = await original_process_request(url, method, data, rapi)
+        if "config" in url and rebooted:
+            response = {**response, "version": "4.1.7"}
+        return response
+
+    manager.update_firmware = AsyncMock()
+    manager.process_request = mock_process_request
+
+    with (
+        patch("custom_components.openevse.update.OTA_FALLBACK_POLL_INTERVAL", 0),
+        patch("custom_components.openevse.update.async_sleep"),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FLEET_UPDATE,
+            {ATTR_DEVICE_ID: entry_entity.device_id},
+            blocking=True,
+            return_response=True,
+        )
+
+    manager.update_firmware.assert_called_once_with(
+        firmware_url="https://github.com/OpenEVSE/ESP32_WiFi_V4.x/releases/download/4.1.7/openevse_wifi_v1.bin"
+    )
+    assert response == {
+        "updated": 1,
+        "failed": 0,
+        "skipped": 0,
+        "devices": {
+            entry_entity.device_id: {
+                "from_version": "v5.1.2",
+                "to_version": "4.1.7",
+                "status": "updated",
+                "error": None,
+            }
+        },
+    }
+
+
+async def test_fleet_update_max_failures(
+    hass,
+    test_charger,
+    mock_ws_start,
+    entity_registry: er.EntityRegistry,
+):
+    """Test the fleet update service halts after too many failures."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entry_entity = entity_registry.async_get("sensor.openevse_station_status")
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.update_firmware = AsyncMock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FLEET_UPDATE,
+        {
+            ATTR_DEVICE_ID: [
+                "fake_device_id",
+                entry_entity.device_id,
+                "fake_device_id",
+            ],
+            ATTR_CONCURRENCY: 1,
+            ATTR_MAX_FAILURES: 1,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert not manager.update_firmware.called
+    assert response["failed"] == 1
+    assert response["skipped"] == 1
+    assert len(response["devices"]) == 2
+    assert response["devices"]["fake_device_id"]["status"] == "failed"
+    assert response["devices"][entry_entity.device_id] == {
+        "status": "skipped",
+        "error": "Rollout halted after too many failures",
+    }
+
+
+async def test_service_device_index(
+    hass,
+    test_charger,
+    mock_ws_start,
+    entity_registry: er.EntityRegistry,
+    caplog,
+):
+    """Test device lookups are cached and refreshed on registry changes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = entity_registry.async_get("sensor.openevse_station_status").device_id
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.clear_limit = AsyncMock()
+    dev_reg = dr.async_get(hass)
+
+    async def _clear_limit():
+        await hass.services.async_call(
+            DOMAIN, SERVICE_CLEAR_LIMIT, {ATTR_DEVICE_ID: device_id}, blocking=True
+        )
+
+    with patch.object(
+        dr.DeviceRegistry,
+        "async_get",
+        autospec=True,
+        side_effect=dr.DeviceRegistry.async_get,
+    ) as mock_get:
+        await _clear_limit()
+        await _clear_limit()
+        assert mock_get.call_count == 1
+        assert manager.clear_limit.call_count == 2
+
+        # Renaming the device rebuilds its entry with the new logger name
+        dev_reg.async_update_device(device_id, name_by_user="Garage")
+        await hass.async_block_till_done()
+        mock_get.reset_mock()
+        await _clear_limit()
+        await _clear_limit()
+        assert mock_get.call_count == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    caplog.clear()
+    await _clear_limit()
+    assert "Error locating configuration" in caplog.text
+    assert manager.clear_limit.call_count == 4
+
+
+async def test_service_device_index_unknown_firmware(
+    hass,
+    test_charger,
+    mock_ws_start,
+    entity_registry: er.EntityRegistry,
+):
+    """Test capabilities are not cached before the firmware is known."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = entity_registry.async_get("sensor.openevse_station_status").device_id
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    index = async_get_device_index(hass)
+
+    with patch.object(
+        type(manager), "wifi_firmware", new_callable=PropertyMock, return_value=None
+    ):
+        index.async_get(device_id)
+    assert device_id not in index._targets
+
+    index.async_get(device_id)
+    assert device_id in index._targets
+
+    # A firmware change drops the cached capabilities
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    coordinator.snapshots.device["wifi_firmware"] = "4.0.0"
+    with patch.object(type(coordinator), "_async_update_identity", AsyncMock()):
+        coordinator._async_check_identity()
+        assert device_id not in index._targets
+        await hass.async_block_till_done()
+
+
+async def test_service_unsupported_firmware(
+    hass,
+    test_charger,
+    mock_ws_start,
+    entity_registry: er.EntityRegistry,
+):
+    """Test no charger is acted on when one of the targets is unsupported."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = entity_registry.async_get("sensor.openevse_station_status").device_id
+    index = async_get_device_index(hass)
+    supported = index.async_get(device_id)
+    supported.manager.clear_limit = AsyncMock()
+    targets = {
+        device_id: supported,
+        "old_device": replace(supported, capabilities=frozenset()),
+    }
+
+    with (
+        patch.object(index, "async_get", side_effect=targets.__getitem__),
+        pytest.raises(HomeAssistantError, match="old_device does not support"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CLEAR_LIMIT,
+            {ATTR_DEVICE_ID: [device_id, "old_device"]},
+            blocking=True,
+        )
+    supported.manager.clear_limit.assert_not_called()
@@ -0,0 +1,209 @@
+"""Test OpenEVSE last known state."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from openevsehttp.exceptions import AuthenticationError
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.openevse.const import COORDINATOR, DOMAIN
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+CHARGER_NAME = "openevse"
+SESSION_START = "2026-01-09T11:55:54+00:00"
+
+
+def _store_snapshot(hass_storage, entry, wifi_firmware):
+    """Store the last known state of a charger."""
+    hass_storage[f"{DOMAIN}.snapshot.{entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.snapshot.{entry.entry_id}",
+        "data": {
+            "data": {
+                "values": {
+                    "state": "Charging",
+                    "charging_current": 16000,
+                    "charging_session_start": SESSION_START,
+                },
+                "datetimes": ["charging_session_start"],
+            },
+            "device": {
+                "model": "openevse_wifi_v1",
+                "sw_version": wifi_firmware,
+                "serial": "9C9C1FE57B2C",
+                "wifi_firmware": wifi_firmware,
+                "openevse_firmware": "7.1.3",
+            },
+            "capabilities": {"4.1.0": True, "9.0.0": False},
+        },
+    }
+
+
+async def test_snapshot_saved(hass, test_charger, mock_ws_start, hass_storage):
+    """Test the last known state of a charger is saved."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=301))
+    await hass.async_block_till_done()
+
+    stored = hass_storage[f"{DOMAIN}.snapshot.{entry.entry_id}"]["data"]
+    assert stored["device"] == {
+        "model": "openevse_wifi_v1",
+        "sw_version": "v5.1.2",
+        "serial": "9C9C1FE57B2C",
+        "wifi_firmware": "v5.1.2",
+        "openevse_firmware": "7.1.3",
+    }
+    assert stored["data"]["values"]["status"] == "sleeping"
+    assert stored["capabilities"]["4.1.0"] is True
+    assert "charging_session_start" in stored["data"]["datetimes"]
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.snapshot.{entry.entry_id}" not in hass_storage
+
+
+async def test_setup_from_snapshot(
+    hass,
+    test_charger,
+    mock_ws_start,
+    hass_storage,
+    device_registry: dr.DeviceRegistry,
+):
+    """Test an offline charger is set up from its last known state."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    _store_snapshot(hass_storage, entry, "v5.1.2")
+    with patch(
+        "custom_components.openevse.OpenEVSE.update",
+        side_effect=TimeoutError,
+    ):
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+        assert coordinator.stale
+        assert coordinator.data["charging_session_start"] == datetime(
+            2026, 1, 9, 11, 55, 54, tzinfo=dt_util.UTC
+        )
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, "9C9C1FE57B2C")}
+        )
+        assert device.model == "openevse_wifi_v1"
+        assert device.sw_version == "v5.1.2"
+
+        # The failed background refresh keeps the restored state available
+        assert coordinator.last_update_success
+        state = hass.states.get("sensor.openevse_charging_current")
+        assert state.state == "16.0"
+        assert state.attributes["stale"] is True
+        assert coordinator.version_check("4.1.0")
+        assert not coordinator.version_check("9.0.0")
+        await coordinator.async_refresh()
+        assert coordinator.stale
+        assert coordinator.last_update_success
+
+    # The charger answers on the next refresh, its identity is not read again
+    with patch(
+        "custom_components.openevse.OpenEVSE.test_and_get",
+        wraps=coordinator._manager.test_and_get,
+    ) as mock_test_and_get:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert not coordinator.stale
+    assert coordinator.last_update_success
+    mock_test_and_get.assert_not_called()
+    assert "stale" not in hass.states.get("sensor.openevse_charging_current").attributes
+
+    # Failures after the first answer make the entities unavailable again
+    with patch(
+        "custom_components.openevse.OpenEVSE.update",
+        side_effect=TimeoutError,
+    ):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def test_identity_read_after_firmware_change(
+    hass,
+    test_charger,
+    mock_ws_start,
+    hass_storage,
+    device_registry: dr.DeviceRegistry,
+):
+    """Test the identity is read again when the charger reports new firmware."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    _store_snapshot(hass_storage, entry, "v5.0.1")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "9C9C1FE57B2C")})
+    assert device.sw_version == "v5.1.2"
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.snapshots.device["wifi_firmware"] == "v5.1.2"
+
+
+@pytest.mark.parametrize(
+    "side_effect",
+    [AuthenticationError, KeyError("serial"), TypeError("not a mapping")],
+)
+async def test_identity_kept_when_unreadable(
+    hass, test_charger, mock_ws_start, hass_storage, side_effect
+):
+    """Test the stored identity is kept when the charger identity is unreadable."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    _store_snapshot(hass_storage, entry, "v5.0.1")
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.openevse.get_device_identity", side_effect=side_effect
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.snapshots.device["sw_version"] == "v5.0.1"
+    assert coordinator.snapshots.device["serial"] == "9C9C1FE57B2C"
+
+
+async def test_identity_merged_with_previous(
+    hass, test_charger, mock_ws_start, hass_storage
+):
+    """Test values the charger did not report keep their stored value."""
+    entry = MockConfigEntry(domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA)
+    _store_snapshot(hass_storage, entry, "v5.0.1")
+    entry.add_to_hass(hass)
+    identity = {
+        "model": "",
+        "sw_version": "v5.1.2",
+        "serial": entry.entry_id,
+        "wifi_firmware": "v5.1.2",
+        "openevse_firmware": None,
+    }
+    with patch("custom_components.openevse.get_device_identity", return_value=identity):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.snapshots.device == {
+        "model": "openevse_wifi_v1",
+        "sw_version": "v5.1.2",
+        "serial": "9C9C1FE57B2C",
+        "wifi_firmware": "v5.1.2",
+        "openevse_firmware": "7.1.3",
+    }
@@ -0,0 +1,155 @@
+"""Test OpenEVSE telemetry buffer."""
+
+from datetime import datetime
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.openevse.const import (
+    ATTR_DEVICE_ID,
+    ATTR_END,
+    ATTR_START,
+    COORDINATOR,
+    DOMAIN,
+    SERVICE_GET_TELEMETRY,
+)
+from custom_components.openevse.telemetry import TelemetryBuffer
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+CHARGER_NAME = "openevse"
+FIELDS = ("charging_power", "charging_current")
+
+
+async def test_ring_buffer(tmp_path):
+    """Test the buffer keeps the newest samples and selects time ranges."""
+    path = tmp_path / "telemetry" / "charger.bin"
+    buffer = TelemetryBuffer(4, FIELDS, path)
+    for second in range(6):
+        buffer.append(second, {"charging_power": second * 100, "charging_current": 1})
+    buffer.append(6, {"charging_power": "n/a"})
+
+    assert len(buffer) == 4
+    assert buffer.samples() == [
+        [3.0, 300.0, 1.0],
+        [4.0, 400.0, 1.0],
+        [5.0, 500.0, 1.0],
+        [6.0, None, None],
+    ]
+    assert buffer.samples(4, 5) == [[4.0, 400.0, 1.0], [5.0, 500.0, 1.0]]
+    assert buffer.samples(4.5) == [[5.0, 500.0, 1.0], [6.0, None, None]]
+    assert buffer.samples(end=2) == []
+    buffer.close()
+    assert path.stat().st_size == 20 + 4 * 24
+
+    # The samples survive a restart, unless the layout changed
+    buffer = TelemetryBuffer(4, FIELDS, path)
+    assert buffer.samples(5) == [[5.0, 500.0, 1.0], [6.0, None, None]]
+    buffer.close()
+    buffer = TelemetryBuffer(8, FIELDS, path)
+    assert buffer.samples() == []
+    buffer.close()
+
+
+async def test_get_telemetry(
+    hass, test_charger, mock_ws_start, entity_registry: er.EntityRegistry
+):
+    """Test the telemetry of a charger is returned for a time range."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+        options={"telemetry_samples": 100},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = entity_registry.async_get("sensor.openevse_station_status").device_id
+    telemetry = hass.data[DOMAIN][entry.entry_id][COORDINATOR].telemetry
+    start = dt_util.as_timestamp(datetime(2025, 6, 1, 8, tzinfo=dt_util.UTC))
+    for second in range(10):
+        telemetry.append(
+            start + second,
+            {"charging_power": 7200, "charging_current": 30, "charging_voltage": 240},
+        )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_TELEMETRY,
+        {
+            ATTR_DEVICE_ID: device_id,
+            ATTR_START: "2025-06-01T08:00:02+00:00",
+            ATTR_END: "2025-06-01T08:00:04+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response[device_id] == {
+        "fields": [
+            "timestamp",
+            "charging_power",
+            "charging_current",
+            "charging_voltage",
+        ],
+        "samples": [[start + second, 7200.0, 30.0, 240.0] for second in range(2, 5)],
+    }
+
+    # Times without an offset are in the Home Assistant time zone
+    await hass.config.async_set_time_zone("Europe/Berlin")
+    naive = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_TELEMETRY,
+        {
+            ATTR_DEVICE_ID: device_id,
+            ATTR_START: "2025-06-01T10:00:02",
+            ATTR_END: "2025-06-01T10:00:04",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert naive == response
+
+    # The coordinator records its snapshots
+    await hass.data[DOMAIN][entry.entry_id][COORDINATOR].websocket_update()
+    assert len(telemetry) == 11
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_get_telemetry_disabled(
+    hass, test_charger, mock_ws_start, entity_registry: er.EntityRegistry
+):
+    """Test asking for telemetry of a charger without a buffer or device fails."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, title=CHARGER_NAME, data=CONFIG_DATA, version=2
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device_id = entity_registry.async_get("sensor.openevse_station_status").device_id
+
+    with pytest.raises(HomeAssistantError, match="Telemetry is not enabled"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_TELEMETRY,
+            {ATTR_DEVICE_ID: device_id},
+            blocking=True,
+            return_response=True,
+        )
+
+    with pytest.raises(HomeAssistantError, match="Device fake_device_id is not"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_TELEMETRY,
+            {ATTR_DEVICE_ID: "fake_device_id"},
+            blocking=True,
+            return_response=True,
+        )
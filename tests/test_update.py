@@ -21,6 +21,7 @@ from custom_components.openevse.const import (
     FW_COORDINATOR,
     MANAGER,
 )
+from custom_components.openevse.scheduler import async_get_scheduler
 from custom_components.openevse.update import OpenEVSEUpdateEntity
 from tests.typing import WebSocketGenerator
 
@@ -101,17 +102,38 @@ async def test_update_install(hass, test_charger, mock_ws_start):
     manager.update_firmware = AsyncMock()
 
     entity_id = "update.openevse_update"
-    with patch("custom_components.openevse.update.async_sleep"):
-        await hass.services.async_call(
-            UPDATE_DOMAIN, "install", {"entity_id": entity_id}, blocking=True
-        )
-        await hass.async_block_till_done()
+    await hass.services.async_call(
+        UPDATE_DOMAIN, "install", {"entity_id": entity_id}, blocking=True
+    )
+    await hass.async_block_till_done()
 
     assert manager.update_firmware.called
     manager.update_firmware.assert_called_once_with(
         firmware_url="https://github.com/OpenEVSE/ESP32_WiFi_V4.x/releases/download/4.1.7/openevse_wifi_v1.bin"
     )
 
+    # Tracking only ends once the charger reported the update and cleared it
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    entity = hass.data["entity_components"][UPDATE_DOMAIN].get_entity(entity_id)
+    coordinator.async_update_listeners()
+    await asyncio.sleep(0)
+    assert not entity._progress_task.done()
+    manager._status["ota_update"] = 1
+    coordinator.async_update_listeners()
+    # The status is polled through the integration scheduler meanwhile
+    scheduler = async_get_scheduler(hass)
+    assert [job.name for job in scheduler._heap if not job.cancelled].count(
+        f"{coordinator.name} - update progress"
+    ) == 1
+    manager._status["ota_update"] = 0
+    coordinator.async_update_listeners()
+    await asyncio.wait_for(entity._progress_task, 1)
+    assert not any(
+        job.name.endswith("update progress")
+        for job in scheduler._heap
+        if not job.cancelled
+    )
+
 
 async def test_update_install_no_url(hass, test_charger, mock_ws_start):
     """Test update install service with no URL."""
@@ -240,12 +262,7 @@ async def test_update_polling(hass, test_charger, mock_ws_start):
 
     manager.process_request = mock_process_request
 
-    async def mock_sleep_func(*args, **kwargs):
-        await asyncio.sleep(0)
-
-    mock_sleep = AsyncMock(side_effect=mock_sleep_func)
-
-    with patch("custom_components.openevse.update.async_sleep", new=mock_sleep):
+    with patch("custom_components.openevse.update.OTA_FALLBACK_POLL_INTERVAL", 0):
         await hass.services.async_call(
             UPDATE_DOMAIN, "install", {"entity_id": entity_id}, blocking=True
         )
@@ -255,7 +272,7 @@ async def test_update_polling(hass, test_charger, mock_ws_start):
         bg_tasks = [
             t
             for t in asyncio.all_tasks()
-            if t.get_name() == "openevse_update_progress_polling"
+            if t.get_name() == "openevse_update_progress_tracking"
         ]
         if bg_tasks:
             await asyncio.gather(*bg_tasks)
@@ -265,3 +282,125 @@ async def test_update_polling(hass, test_charger, mock_ws_start):
         assert state is not None
         assert state.attributes[ATTR_IN_PROGRESS] is False
         assert state.attributes.get(ATTR_UPDATE_PERCENTAGE) is None
+
+
+async def test_update_progress_websocket(hass, test_charger, mock_ws_start):
+    """Test update progress is driven by websocket frames without polling."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager.update_firmware = AsyncMock()
+
+    entity_id = "update.openevse_update"
+
+    poll_count = 0
+    original_process_request = manager.process_request
+
+    async def mock_process_request(url, method="", data=None, rapi=None):
+        nonlocal poll_count
+        if "status" in url and method == "get":
+            poll_count += 1
+        return await original_process_request(url, method, data, rapi)
+
+    manager.process_request = mock_process_request
+
+    with patch(
+        "openevsehttp.__main__.OpenEVSE.ws_state",
+        new_callable=PropertyMock,
+        return_value="connected",
+    ):
+        await hass.services.async_call(
+            UPDATE_DOMAIN, "install", {"entity_id": entity_id}, blocking=True
+        )
+        await hass.async_block_till_done()
+
+        await manager._update_status(
+            "data", {"ota": "started", "ota_progress": 40}, None
+        )
+        await hass.async_block_till_done()
+
+        state = hass.states.get(entity_id)
+        assert state.attributes[ATTR_IN_PROGRESS] is True
+        assert state.attributes[ATTR_UPDATE_PERCENTAGE] == 40
+
+        await manager._update_status("data", {"ota": "completed"}, None)
+
+        bg_tasks = [
+            t
+            for t in asyncio.all_tasks()
+            if t.get_name() == "openevse_update_progress_tracking"
+        ]
+        if bg_tasks:
+            await asyncio.gather(*bg_tasks)
+
+    assert poll_count == 0
+    state = hass.states.get(entity_id)
+    assert state.attributes[ATTR_IN_PROGRESS] is False
+
+
+async def test_update_progress_reboot(hass, test_charger, mock_ws_start):
+    """Test update tracking ends as soon as the device reboots."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CHARGER_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    manager._status["uptime"] = 500
+
+    async def mock_update_firmware(**kwargs):
+        manager._status["ota_update"] = 1
+
+    manager.update_firmware = mock_update_firmware
+
+    entity_id = "update.openevse_update"
+
+    poll_count = 0
+    original_process_request = manager.process_request
+
+    async def mock_process_request(url, method="", data=None, rapi=None):
+        nonlocal poll_count
+        if "status" in url and method == "get":
+            poll_count += 1
+            return {"ota_update": 0, "uptime": 12}
+        return await original_process_request(url, method, data, rapi)
+
+    manager.process_request = mock_process_request
+
+    with patch(
+        "openevsehttp.__main__.OpenEVSE.ws_state",
+        new_callable=PropertyMock,
+        return_value="connected",
+    ):
+        await hass.services.async_call(
+            UPDATE_DOMAIN, "install", {"entity_id": entity_id}, blocking=True
+        )
+        await hass.async_block_till_done()
+
+        # First frame after the reboot carries a fresh uptime
+        await manager._update_status("data", {"uptime": 5}, None)
+
+        bg_tasks = [
+            t
+            for t in asyncio.all_tasks()
+            if t.get_name() == "openevse_update_progress_tracking"
+        ]
+        if bg_tasks:
+            await asyncio.gather(*bg_tasks)
+
+    assert poll_count == 1
+    state = hass.states.get(entity_id)
+    assert state.attributes[ATTR_IN_PROGRESS] is False